@@ -0,0 +1,191 @@
+"""
+Benchmark do comparator
+=======================
+
+Mede velocidade e acurácia da cura de seletores em páginas sintéticas (`benchmarks.gerador`) de
+tamanhos crescentes, com seletores id, name, classe e XPath `contains()` quebrados de forma controlada.
+
+Principais funcionalidades:
+- Tempo de `gerar_diferencas` (execução completa, com validação prévia no HTML) e das suas etapas
+- Tempo médio por seletor de `fuzzy_matching_selector` (varredura serial) e de `heal_xpath`
+  (contexto já interpretado), e por chamada de `score_class`
+- Acurácia: fração dos seletores quebrados curados para o elemento esperado, por tipo e por mutação
+- Gravação dos resultados como baseline (`--salvar`) e comparação com uma baseline anterior
+  (`--comparar`), com código de saída 1 quando há regressão além da tolerância
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_comparator [tamanho ...] [--seletores N] [--semente S]
+        [--salvar baseline.json] [--comparar baseline.json] [--tolerancia 0.2]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.gerador import MUTACOES, TIPOS, gerar_cenario
+from dom_heal.compilador import avaliar_css, avaliar_xpath
+from dom_heal.comparator import (
+    ContextoHealing, fuzzy_matching_selector, gerar_diferencas, heal_xpath, score_class
+)
+from dom_heal.indice import IndiceDom
+from dom_heal.metricas import coletar
+
+TAMANHOS_PADRAO = (10_000, 50_000, 200_000)
+SELETORES = 200
+AMOSTRA_SERIAL = 40
+CHAMADAS_SCORE_CLASS = 20_000
+TEMPOS = ('gerar_diferencas_s', 'fuzzy_ms', 'heal_xpath_ms', 'score_class_us')
+
+def resolver(selector: str, contexto: ContextoHealing):
+    """
+    Retorna o `data-bench` do primeiro elemento encontrado pelo seletor (None se nenhum).
+    """
+    try:
+        if selector.startswith('/'):
+            encontrados = avaliar_xpath(selector, contexto.dom)
+        else:
+            encontrados = avaliar_css(selector, contexto.dom)
+    except Exception:
+        return None
+    return encontrados[0].get('data-bench') if encontrados else None
+
+def _acuracia(casos: list, curados: dict, contexto: ContextoHealing) -> dict:
+    acertos = {}
+    for caso in casos:
+        if caso['mutacao'] is None:
+            continue
+        acertou = resolver(curados.get(caso['selector'], caso['selector']), contexto) == caso['alvo']
+        for grupo in (caso['tipo'], caso['mutacao'], 'total'):
+            total, certos = acertos.get(grupo, (0, 0))
+            acertos[grupo] = (total + 1, certos + acertou)
+    return {grupo: certos / total for grupo, (total, certos) in acertos.items()}
+
+def _por_chamada(funcao, argumentos: list) -> float:
+    inicio = time.perf_counter()
+    for args in argumentos:
+        funcao(*args)
+    return (time.perf_counter() - inicio) / max(1, len(argumentos))
+
+def medir(tamanho: int, seletores: int = SELETORES, semente: int = 1) -> dict:
+    """
+    Gera o cenário e mede tempos e acurácia do comparator.
+
+    Args:
+        tamanho (int): Quantidade de elementos da página.
+        seletores (int): Quantidade de seletores (80% quebrados).
+        semente (int): Semente do gerador.
+
+    Returns:
+        dict: Tempos (ver `TEMPOS`), 'etapas' de `gerar_diferencas`, 'resumo' e 'acuracia'.
+    """
+    fonte, dom, casos = gerar_cenario(tamanho, seletores, semente)
+    antes = [{'nome': caso['nome'], 'selector': caso['selector']} for caso in casos]
+
+    with coletar() as metricas:
+        inicio = time.perf_counter()
+        diferencas = gerar_diferencas(antes, dom, html_puro=fonte)
+        total = time.perf_counter() - inicio
+    curados = {item['selector_antigo']: item['novo_seletor'] for item in diferencas.get('alterados', [])}
+
+    contexto = ContextoHealing(fonte)
+    contexto.valores  # valores calculados fora da medição (mesmo custo do primeiro heal_xpath)
+    quebrados = [caso for caso in casos if caso['mutacao']]
+    xpaths = [(caso['selector'], contexto) for caso in quebrados if caso['tipo'] == 'xpath']
+    indice = IndiceDom(dom)
+    serial = [(caso['selector'], indice) for caso in quebrados if caso['tipo'] != 'xpath'][:AMOSTRA_SERIAL]
+
+    rnd = random.Random(semente)
+    conjuntos = [set(elem['class'].split()) for elem in rnd.sample(dom, min(len(dom), 1000))]
+    pares = [(rnd.choice(conjuntos), rnd.choice(conjuntos)) for _ in range(CHAMADAS_SCORE_CLASS)]
+
+    return {
+        'elementos': len(dom),
+        'seletores': len(casos),
+        'gerar_diferencas_s': total,
+        'fuzzy_ms': _por_chamada(fuzzy_matching_selector, serial) * 1000,
+        'heal_xpath_ms': _por_chamada(heal_xpath, xpaths) * 1000,
+        'score_class_us': _por_chamada(score_class, pares) * 1_000_000,
+        'etapas': {nome: tempo['segundos'] for nome, tempo in metricas.para_dict()['tempos'].items()},
+        'resumo': diferencas.get('resumo', {}),
+        'acuracia': _acuracia(casos, curados, contexto),
+    }
+
+def comparar(atual: dict, baseline: dict, tolerancia: float) -> list:
+    """
+    Compara os resultados com uma baseline de mesmo tamanho.
+
+    Args:
+        atual (dict): Resultados por tamanho (`medir`).
+        baseline (dict): Resultados gravados anteriormente.
+        tolerancia (float): Aumento relativo de tempo aceito (ex: 0.2 = 20%); acurácia não pode cair.
+
+    Returns:
+        list: Descrições das regressões encontradas.
+    """
+    regressoes = []
+    for tamanho, resultado in atual.items():
+        anterior = baseline.get(tamanho)
+        if anterior is None:
+            continue
+        for chave in TEMPOS:
+            if anterior.get(chave) and resultado[chave] > anterior[chave] * (1 + tolerancia):
+                regressoes.append(
+                    f"{tamanho}: {chave} {anterior[chave]:.3f} → {resultado[chave]:.3f} "
+                    f"({resultado[chave] / anterior[chave] - 1:+.0%})"
+                )
+        for grupo, valor in resultado['acuracia'].items():
+            antes = anterior.get('acuracia', {}).get(grupo)
+            if antes is not None and valor < antes - 1e-9:
+                regressoes.append(f"{tamanho}: acurácia {grupo} {antes:.1%} → {valor:.1%}")
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de velocidade e acurácia do comparator.")
+    parser.add_argument('tamanhos', nargs='*', type=int, default=list(TAMANHOS_PADRAO))
+    parser.add_argument('--seletores', type=int, default=SELETORES)
+    parser.add_argument('--semente', type=int, default=1)
+    parser.add_argument('--salvar', help="Grava os resultados neste arquivo JSON (baseline).")
+    parser.add_argument('--comparar', help="Compara com a baseline gravada neste arquivo JSON.")
+    parser.add_argument('--tolerancia', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'elementos':>10} {'total s':>8} {'fuzzy ms':>9} {'xpath ms':>9} {'class µs':>9} "
+        + ' '.join(f"{tipo:>6}" for tipo in TIPOS) + f" {'acurácia':>9}"
+    )
+    resultados = {}
+    for tamanho in args.tamanhos:
+        resultado = medir(tamanho, args.seletores, args.semente)
+        resultados[str(tamanho)] = resultado
+        acuracia = resultado['acuracia']
+        print(
+            f"{resultado['elementos']:>10} {resultado['gerar_diferencas_s']:>8.2f} {resultado['fuzzy_ms']:>9.2f} "
+            f"{resultado['heal_xpath_ms']:>9.2f} {resultado['score_class_us']:>9.2f} "
+            + ' '.join(f"{acuracia.get(tipo, 0):>6.0%}" for tipo in TIPOS)
+            + f" {acuracia.get('total', 0):>9.1%}"
+        )
+    ultimo = resultados[str(args.tamanhos[-1])]['acuracia'] if args.tamanhos else {}
+    print("acurácia por mutação (maior página): " + ', '.join(
+        f"{mutacao} {ultimo[mutacao]:.0%}" for mutacao in MUTACOES if mutacao in ultimo
+    ))
+
+    if args.salvar:
+        dados = {'semente': args.semente, 'seletores': args.seletores, 'resultados': resultados}
+        Path(args.salvar).write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"baseline gravada em {args.salvar}")
+    if args.comparar:
+        baseline = json.loads(Path(args.comparar).read_text(encoding='utf-8'))
+        if (baseline.get('semente'), baseline.get('seletores')) != (args.semente, args.seletores):
+            print("aviso: baseline gerada com outra semente ou quantidade de seletores")
+        regressoes = comparar(resultados, baseline.get('resultados', {}), args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}")
+        if regressoes:
+            sys.exit(1)
+        print(f"sem regressões em relação a {args.comparar}")
+
+if __name__ == '__main__':
+    main()
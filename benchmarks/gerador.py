@@ -0,0 +1,230 @@
+"""
+Gerador de cenários sintéticos
+==============================
+
+Gera páginas HTML sintéticas reprodutíveis (semente fixa) e seletores quebrados de forma controlada,
+usados pelos benchmarks do comparator.
+
+Principais funcionalidades:
+- Árvores profundas (containers aninhados por passeio aleatório) com marcação carregada de classes
+  utilitárias, no estilo Tailwind
+- Elementos interativos (botões, links e campos) com id, classe semântica e, nos campos, name únicos
+- Mutações controladas dos valores (estilo, remoção, sufixo e transposição) para seletores id, name,
+  classe e XPath `contains()`, distribuídas igualmente entre os tipos
+- Registro do elemento esperado de cada seletor (atributo `data-bench`), para medir a acurácia da cura
+
+Uso: ver `benchmarks.bench_comparator`.
+"""
+
+import random
+import re
+from typing import List, Tuple
+
+from lxml import etree
+
+from dom_heal.extractor import montar_elementos_html
+
+UTILITARIAS = [
+    'flex', 'grid', 'block', 'inline-flex', 'hidden', 'items-center', 'justify-between', 'justify-end',
+    'gap-1', 'gap-2', 'gap-4', 'p-2', 'p-4', 'px-3', 'px-4', 'py-1', 'py-2', 'm-0', 'mt-2', 'mb-4',
+    'mx-auto', 'text-sm', 'text-lg', 'text-gray-700', 'font-bold', 'font-medium', 'rounded', 'rounded-lg',
+    'shadow', 'shadow-md', 'border', 'border-gray-200', 'bg-white', 'bg-gray-100', 'w-full', 'h-8',
+    'max-w-xl', 'col-span-2', 'truncate', 'sm:flex', 'md:grid-cols-3', 'lg:px-8', 'hover:bg-gray-200',
+    'focus:outline-none',
+]
+CONTAINERS = ['div', 'div', 'div', 'section', 'ul', 'li', 'nav', 'form']
+INTERATIVOS = ['button', 'a', 'input', 'select', 'textarea']
+CAMPOS = ('input', 'select', 'textarea')
+PROFUNDIDADE_MAXIMA = 24
+SILABAS = ['ba', 'ce', 'di', 'fo', 'gu', 'la', 'me', 'ni', 'po', 'ru', 'sa', 'te', 'vi', 'xo', 'zu', 'qua']
+ACOES = ['btn', 'campo', 'lista', 'item', 'modal', 'link', 'icone', 'titulo']
+ELEMENTOS_POR_COMPONENTE = 50
+
+TIPOS = ('id', 'name', 'class', 'xpath')
+MUTACOES = ('estilo', 'remocao', 'sufixo', 'transposicao')
+
+def _unico(gerar, usados: set) -> str:
+    valor = gerar()
+    while valor in usados:
+        valor = gerar()
+    usados.add(valor)
+    return valor
+
+def gerar_componentes(quantidade: int, rnd: random.Random) -> list:
+    # Páginas maiores têm mais componentes distintos (o vocabulário cresce com o DOM)
+    return [''.join(rnd.choice(SILABAS) for _ in range(rnd.randint(3, 5))) for _ in range(quantidade)]
+
+def gerar_id(componentes: list, rnd: random.Random) -> str:
+    partes = [rnd.choice(componentes), rnd.choice(ACOES), str(rnd.randint(0, 99))]
+    if rnd.random() < 0.5:
+        return '-'.join(partes)
+    return partes[0] + ''.join(p.capitalize() for p in partes[1:])
+
+def classe_semantica(elemento) -> str:
+    """
+    Retorna a classe semântica (a única que não é utilitária) de um elemento interativo.
+    """
+    return next(classe for classe in elemento.get('class').split() if classe not in UTILITARIAS)
+
+def gerar_pagina(total: int, rnd: random.Random) -> Tuple[etree._Element, list]:
+    """
+    Gera a árvore de uma página sintética com `total` elementos em <body>.
+
+    Args:
+        total (int): Quantidade de elementos.
+        rnd (random.Random): Gerador de números aleatórios (define a página).
+
+    Returns:
+        Tuple[etree._Element, list]: Raiz <html> e elementos interativos, em ordem de criação.
+    """
+    componentes = gerar_componentes(max(1, total // ELEMENTOS_POR_COMPONENTE), rnd)
+    raiz = etree.Element('html')
+    abertos = [etree.SubElement(raiz, 'body')]
+    usados, interativos = set(), []
+    for posicao in range(total):
+        # Passeio aleatório na profundidade: fecha de 1 a 3 containers ou desce mais um nível
+        if len(abertos) > PROFUNDIDADE_MAXIMA or (len(abertos) > 1 and rnd.random() < 0.3):
+            del abertos[-rnd.randint(1, min(3, len(abertos) - 1)):]
+        pai = abertos[-1]
+        classes = rnd.sample(UTILITARIAS, rnd.randint(2, 7))
+        sorteio = rnd.random()
+        if sorteio < 0.6:
+            elemento = etree.SubElement(pai, rnd.choice(CONTAINERS))
+            abertos.append(elemento)
+        elif sorteio < 0.8:
+            elemento = etree.SubElement(pai, 'span')
+            elemento.text = rnd.choice(ACOES)
+        else:
+            elemento = etree.SubElement(pai, rnd.choice(INTERATIVOS))
+            elemento.set('id', _unico(lambda: gerar_id(componentes, rnd), usados))
+            classes.insert(rnd.randint(0, len(classes)), _unico(
+                lambda: f"{rnd.choice(componentes)}-{rnd.choice(ACOES)}-{rnd.randint(0, 99)}", usados
+            ))
+            if elemento.tag in CAMPOS:
+                elemento.set('name', _unico(
+                    lambda: f"{rnd.choice(componentes)}_{rnd.choice(ACOES)}_{rnd.randint(0, 99)}", usados
+                ))
+            else:
+                elemento.text = rnd.choice(ACOES).capitalize()
+            interativos.append(elemento)
+        elemento.set('class', ' '.join(classes))
+        elemento.set('data-bench', str(posicao))
+    return raiz, interativos
+
+def mutar(valor: str, mutacao: str, rnd: random.Random) -> str:
+    """
+    Aplica uma mutação controlada a um valor de id, name ou classe.
+
+    Args:
+        valor (str): Valor original.
+        mutacao (str): 'estilo' (kebab/snake_case ↔ camelCase), 'remocao' (um caractere a menos),
+            'sufixo' (versão nova, ex: '-v2') ou 'transposicao' (dois caracteres vizinhos trocados).
+        rnd (random.Random): Gerador de números aleatórios.
+
+    Returns:
+        str: Valor mutado.
+    """
+    if mutacao == 'estilo':
+        partes = re.split(r'[-_]', valor)
+        if len(partes) > 1:
+            return partes[0] + ''.join(p.capitalize() for p in partes[1:])
+        return re.sub(r'(?<=[a-z0-9])([A-Z])', lambda m: '-' + m.group(1).lower(), valor)
+    if mutacao == 'remocao':
+        pos = rnd.randrange(len(valor))
+        return valor[:pos] + valor[pos + 1:]
+    if mutacao == 'sufixo':
+        separador = '_' if '_' in valor else '-' if '-' in valor else ''
+        return f"{valor}{separador}v2" if separador else f"{valor}V2"
+    if mutacao == 'transposicao':
+        pos = rnd.randrange(len(valor) - 1)
+        return valor[:pos] + valor[pos + 1] + valor[pos] + valor[pos + 2:]
+    raise ValueError(f"Mutação desconhecida: {mutacao}")
+
+def _formatar(tipo: str, atributo: str, valor: str, tag: str) -> str:
+    if tipo == 'xpath':
+        return f"//{tag}[contains(@{atributo},'{valor}')]"
+    if tipo == 'id':
+        return f"#{valor}"
+    if tipo == 'name':
+        return f'[name="{valor}"]'
+    return f".{valor}"
+
+def gerar_seletores(
+    interativos: list, quantidade: int, rnd: random.Random, fracao_quebrados: float = 0.8
+) -> List[dict]:
+    """
+    Escolhe elementos-alvo distintos, gera seus seletores e aplica as mutações na própria árvore.
+
+    Tipos de seletor e mutações são distribuídos igualmente (em rodízio); cada seletor é quebrado
+    com probabilidade `fracao_quebrados` e os demais continuam saudáveis.
+
+    Args:
+        interativos (list): Elementos interativos da página (`gerar_pagina`).
+        quantidade (int): Quantidade de seletores.
+        rnd (random.Random): Gerador de números aleatórios.
+        fracao_quebrados (float): Fração esperada de seletores quebrados (default=0.8).
+
+    Returns:
+        List[dict]: Seletores com 'nome', 'selector', 'tipo', 'mutacao' (None se saudável) e
+            'alvo' (`data-bench` do elemento esperado).
+    """
+    usados = set()
+    for elemento in interativos:
+        usados.update(elemento.get(atributo) for atributo in ('id', 'name') if elemento.get(atributo))
+        usados.add(classe_semantica(elemento))
+    campos = [elemento for elemento in interativos if elemento.get('name')]
+    if quantidade > len(campos) * len(TIPOS):
+        raise ValueError(f"Página pequena demais para {quantidade} seletores distintos.")
+
+    alvos, seletores = set(), []
+    for i in range(quantidade):
+        tipo = TIPOS[i % len(TIPOS)]
+        opcoes = campos if tipo == 'name' else interativos
+        elemento = rnd.choice(opcoes)
+        while elemento.get('data-bench') in alvos:
+            elemento = rnd.choice(opcoes)
+        alvos.add(elemento.get('data-bench'))
+
+        atributo = tipo
+        if tipo == 'xpath':
+            atributo = rnd.choice(('id', 'class', 'name') if elemento.get('name') else ('id', 'class'))
+        valor = classe_semantica(elemento) if atributo == 'class' else elemento.get(atributo)
+        selector = _formatar(tipo, atributo, valor, elemento.tag)
+
+        mutacao = MUTACOES[(i // len(TIPOS)) % len(MUTACOES)] if rnd.random() < fracao_quebrados else None
+        if mutacao:
+            novo = mutar(valor, mutacao, rnd)
+            while novo in usados:
+                novo = mutar(valor, 'remocao', rnd)
+            usados.add(novo)
+            if atributo == 'class':
+                elemento.set('class', ' '.join(novo if c == valor else c for c in elemento.get('class').split()))
+            else:
+                elemento.set(atributo, novo)
+        seletores.append({
+            'nome': f"{tipo}_{i}", 'selector': selector, 'tipo': tipo, 'mutacao': mutacao,
+            'alvo': elemento.get('data-bench'),
+        })
+    return seletores
+
+def gerar_cenario(
+    total: int, seletores: int, semente: int = 1, fracao_quebrados: float = 0.8
+) -> Tuple[str, list, List[dict]]:
+    """
+    Gera um cenário completo de benchmark: página nova, seus elementos extraídos e os seletores antigos.
+
+    Args:
+        total (int): Quantidade de elementos da página.
+        seletores (int): Quantidade de seletores.
+        semente (int): Semente do gerador (mesma semente, mesmo cenário).
+        fracao_quebrados (float): Fração esperada de seletores quebrados (default=0.8).
+
+    Returns:
+        Tuple[str, list, List[dict]]: HTML da página já mutada, elementos extraídos (mesmo formato do
+            backend 'lxml') e seletores (ver `gerar_seletores`).
+    """
+    rnd = random.Random(semente)
+    raiz, interativos = gerar_pagina(total, rnd)
+    casos = gerar_seletores(interativos, seletores, rnd, fracao_quebrados)
+    fonte = etree.tostring(raiz, encoding='unicode', method='html')
+    return fonte, montar_elementos_html(fonte), casos
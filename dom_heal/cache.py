@@ -0,0 +1,236 @@
+"""
+Cache
+=====
+
+Módulo responsável por persistir em disco os snapshots de DOM de execuções anteriores,
+permitindo que o engine reaproveite a extração (ou pule todo o processo) quando a página não mudou,
+e a memória das curas já encontradas pelo comparator.
+
+Principais funcionalidades:
+- Armazenamento compactado (gzip + JSON) de um snapshot por URL
+- Identificação de conteúdo por hash do HTML renderizado e do arquivo de seletores
+- Expiração por tempo (TTL) e remoção dos snapshots menos usados quando o tamanho máximo é excedido
+- Memória de curas (`MemoCuras`) compartilhada entre execuções e arquivos de seletores, com remoção LRU
+
+Ideal para execuções repetidas do `dom-heal rodar` sobre as mesmas páginas.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from dom_heal.utils import diretorio_cache
+
+TTL_PADRAO = 7 * 24 * 3600
+TAMANHO_MAX_PADRAO = 256 * 1024 * 1024
+MAX_ENTRADAS_MEMO = 50000
+
+def hash_conteudo(conteudo: Union[str, bytes]) -> str:
+    """
+    Calcula o hash SHA-256 (hexadecimal) de um conteúdo textual ou binário.
+
+    Args:
+        conteudo (str | bytes): Conteúdo a ser identificado.
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode('utf-8')
+    return hashlib.sha256(conteudo).hexdigest()
+
+def _remover_arquivo(caminho: Path) -> None:
+    try:
+        caminho.unlink()
+    except OSError:
+        pass
+
+class CacheSnapshots:
+    """
+    Armazena em disco, por URL, o último snapshot extraído de cada página.
+
+    Cada registro é um dicionário serializável em JSON (ex: hash do HTML, hash dos seletores,
+    elementos extraídos e HTML). A validade conta a partir da gravação ('criado_em', guardado no
+    registro), então leituras não a prolongam. O acesso atualiza apenas a data de acesso do arquivo,
+    usada como critério de LRU na remoção por tamanho; a data de modificação continua sendo a da gravação.
+
+    Args:
+        diretorio (str | Path, optional): Pasta dos snapshots (default: `<cache da DOM-Heal>/snapshots`).
+        ttl (float): Validade de um snapshot em segundos (default=7 dias).
+        tamanho_max (int): Tamanho máximo total em bytes (default=256 MB).
+    """
+
+    def __init__(
+        self, diretorio: Union[str, Path, None] = None, ttl: float = TTL_PADRAO, tamanho_max: int = TAMANHO_MAX_PADRAO
+    ):
+        self.diretorio = Path(diretorio) if diretorio is not None else diretorio_cache() / 'snapshots'
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.tamanho_max = tamanho_max
+
+    def _caminho(self, url: str) -> Path:
+        return self.diretorio / f"{hash_conteudo(url)}.json.gz"
+
+    def obter(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o snapshot gravado para a URL, se existir e não estiver expirado.
+
+        Args:
+            url (str): URL da página.
+
+        Returns:
+            Optional[Dict[str, Any]]: Registro gravado ou None.
+        """
+        caminho = self._caminho(url)
+        agora = time.time()
+        try:
+            info = caminho.stat()
+            if agora - info.st_mtime > self.ttl:
+                _remover_arquivo(caminho)
+                return None
+            with gzip.open(caminho, 'rt', encoding='utf-8') as arquivo:
+                registro = json.load(arquivo)
+            if agora - registro.get('criado_em', info.st_mtime) > self.ttl:
+                _remover_arquivo(caminho)
+                return None
+            # Só a data de acesso (LRU): a de modificação marca a gravação e não prolonga a validade
+            os.utime(caminho, (agora, info.st_mtime))
+        except (OSError, ValueError, EOFError):
+            return None
+        return registro if registro.get('url') == url else None
+
+    def gravar(self, url: str, registro: Dict[str, Any]) -> None:
+        """
+        Grava (ou substitui) o snapshot da URL e aplica as regras de expiração e tamanho.
+
+        Args:
+            url (str): URL da página.
+            registro (Dict[str, Any]): Dados serializáveis em JSON.
+        """
+        caminho = self._caminho(url)
+        temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(temporario, 'wt', encoding='utf-8') as arquivo:
+            json.dump(dict(registro, url=url, criado_em=time.time()), arquivo, ensure_ascii=False)
+        os.replace(temporario, caminho)
+        self.limpar()
+
+    def remover(self, url: str) -> None:
+        """
+        Remove o snapshot da URL, se existir.
+        """
+        _remover_arquivo(self._caminho(url))
+
+    def limpar(self) -> None:
+        """
+        Remove snapshots expirados e, se o total ainda exceder `tamanho_max`, os menos usados recentemente.
+
+        A expiração usa a data de modificação (a da gravação, que as leituras não alteram), sem abrir os
+        arquivos; a ordem de uso, a data de acesso.
+        """
+        agora = time.time()
+        arquivos = []
+        for caminho in self.diretorio.glob('*.json.gz'):
+            try:
+                info = caminho.stat()
+            except OSError:
+                continue
+            if agora - info.st_mtime > self.ttl:
+                _remover_arquivo(caminho)
+            else:
+                arquivos.append((info.st_atime, info.st_size, caminho))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos, key=lambda item: item[0]):
+            if total <= self.tamanho_max:
+                break
+            _remover_arquivo(caminho)
+            total -= tamanho
+
+class MemoCuras:
+    """
+    Memória persistente das curas encontradas pelo comparator, consultada antes do matching fuzzy.
+
+    Cada entrada é identificada por uma chave (o comparator usa o seletor antigo e a impressão digital
+    dos valores do campo no novo DOM) e guarda um registro serializável em JSON. Todas as entradas ficam
+    em um único arquivo compactado, carregado na primeira consulta e regravado por `salvar` apenas
+    quando alguma entrada foi gravada ou descartada. Ao exceder `max_entradas`, as entradas usadas há
+    mais tempo são descartadas. Consultas só atualizam a ordem de uso em memória (persistida junto com
+    a próxima gravação), então uma execução inteiramente atendida pelo memo não regrava o arquivo.
+
+    Args:
+        caminho (str | Path, optional): Arquivo do memo (default: `<cache da DOM-Heal>/curas.json.gz`).
+        max_entradas (int): Quantidade máxima de entradas (default=50000).
+    """
+
+    def __init__(self, caminho: Union[str, Path, None] = None, max_entradas: int = MAX_ENTRADAS_MEMO):
+        self.caminho = Path(caminho) if caminho is not None else diretorio_cache() / 'curas.json.gz'
+        self.max_entradas = max_entradas
+        self._entradas: Optional[OrderedDict] = None
+        self._alterado = False
+        self._trava = threading.Lock()
+
+    def _carregar(self) -> OrderedDict:
+        if self._entradas is None:
+            try:
+                with gzip.open(self.caminho, 'rt', encoding='utf-8') as arquivo:
+                    self._entradas = OrderedDict(json.load(arquivo))
+            except (OSError, ValueError, EOFError, TypeError):
+                self._entradas = OrderedDict()
+        return self._entradas
+
+    def obter(self, chave: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o registro da chave (marcando-o como usado recentemente), se existir.
+
+        Args:
+            chave (str): Chave da entrada.
+
+        Returns:
+            Optional[Dict[str, Any]]: Registro gravado ou None.
+        """
+        with self._trava:
+            entradas = self._carregar()
+            registro = entradas.get(chave)
+            if registro is not None:
+                # Sem marcar alteração: a nova ordem de uso vai para o disco na próxima gravação
+                entradas.move_to_end(chave)
+            return registro
+
+    def gravar(self, chave: str, registro: Dict[str, Any]) -> None:
+        """
+        Grava (ou substitui) o registro da chave, descartando as entradas menos usadas se necessário.
+
+        Args:
+            chave (str): Chave da entrada.
+            registro (Dict[str, Any]): Dados serializáveis em JSON.
+        """
+        with self._trava:
+            entradas = self._carregar()
+            entradas[chave] = registro
+            entradas.move_to_end(chave)
+            while len(entradas) > self.max_entradas:
+                entradas.popitem(last=False)
+            self._alterado = True
+
+    def salvar(self) -> None:
+        """
+        Persiste o memo em disco (de forma atômica), se houve alguma alteração desde o carregamento.
+        """
+        with self._trava:
+            if not self._alterado:
+                return
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            temporario = self.caminho.with_name(f"{self.caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with gzip.open(temporario, 'wt', encoding='utf-8') as arquivo:
+                json.dump(list(self._entradas.items()), arquivo, ensure_ascii=False)
+            os.replace(temporario, self.caminho)
+            self._alterado = False
+
+    def __len__(self) -> int:
+        with self._trava:
+            return len(self._carregar())
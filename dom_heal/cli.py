@@ -5,15 +5,21 @@ CLI
 Interface de linha de comando (CLI) para execução do mecanismo de self-healing da biblioteca DOM-Heal.
 
 Após instalar via pip, basta rodar:
-    dom-heal rodar --json <CAMINHO> --url <URL>
+    dom-heal rodar --json <CAMINHO> --url <URL> [--backend selenium|lxml] [--filtro seletores|relevantes|nenhum] [--cache] [--processos N] [--metricas <ARQUIVO>]
+    dom-heal lote --manifesto <CAMINHO> [--paralelismo N] [mesmas opções do rodar]
 
 Funcionalidades:
 - Executa o self-healing a partir de um JSON de seletores e URL informada
+- Executa o self-healing de várias páginas em paralelo a partir de um manifesto
 - Exibe logs detalhados e informações sobre o projeto
 """
 
+from typing import Optional
+
 import typer
-from dom_heal.engine import self_heal
+from dom_heal.cache import CacheSnapshots, MemoCuras
+from dom_heal.engine import carregar_manifesto, self_heal, self_heal_lote
+from dom_heal.metricas import Metricas
 
 app = typer.Typer(help="Executa o self-healing externo da biblioteca dom-heal.")
 
@@ -21,6 +27,26 @@ app = typer.Typer(help="Executa o self-healing externo da biblioteca dom-heal.")
 def rodar(
     json: str = typer.Option(..., "--json", "-j", help="Caminho para o arquivo JSON de seletores."),
     url: str = typer.Option(..., "--url", "-u", help="URL da página a ser analisada."),
+    backend: str = typer.Option(
+        "selenium", "--backend", "-b",
+        help="Backend de extração do DOM: 'selenium' (navegador headless) ou 'lxml' (HTML estático, sem navegador)."
+    ),
+    filtro: str = typer.Option(
+        "seletores", "--filtro", "-f",
+        help="Elementos extraídos: 'seletores' (apenas atributos usados no JSON), 'relevantes' (id/name/class/data-*) ou 'nenhum'."
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Usa o cache em disco: pula a execução se a página e os seletores não mudaram e reaproveita curas já encontradas."
+    ),
+    processos: int = typer.Option(
+        1, "--processos", "-p", min=1,
+        help="Processos usados para curar os seletores quebrados (útil em arquivos de seletores grandes)."
+    ),
+    metricas: Optional[str] = typer.Option(
+        None, "--metricas",
+        help="Grava o tempo de cada etapa e os contadores da execução neste arquivo (.prom: formato Prometheus; demais: JSON)."
+    ),
 ):
     """
     Executa o mecanismo de self-healing, atualizando o JSON de seletores
@@ -29,18 +55,115 @@ def rodar(
     Args:
         json (str): Caminho para o arquivo de seletores (.json).
         url (str): URL da página alvo.
+        backend (str): Backend de extração do DOM ('selenium' ou 'lxml').
+        filtro (str): Modo de pré-filtragem dos elementos ('seletores', 'relevantes' ou 'nenhum').
+        cache (bool): Ativa o cache de snapshots e a memória de curas em disco.
+        processos (int): Quantidade de processos do comparator.
+        metricas (str, optional): Arquivo de exportação das métricas da execução.
 
     Example:
         dom-heal rodar --json ./meus_seletores.json --url https://site.com/pagina
+        dom-heal rodar --json ./meus_seletores.json --url https://site.com/pagina --backend lxml
+        dom-heal rodar --json ./meus_seletores.json --url https://site.com/pagina --metricas ./dom_heal.prom
     """
     try:
-        resultado = self_heal(json, url)
+        coletor = Metricas() if metricas else None
+        resultado = self_heal(
+            json, url, backend=backend, filtro=filtro, cache=CacheSnapshots() if cache else None,
+            processos=processos, memo=MemoCuras() if cache else None, metricas=coletor
+        )
         typer.secho("✅ Self-healing executado com sucesso!", fg=typer.colors.GREEN)
+        if resultado.get('cache'):
+            typer.echo("♻️ Página e seletores sem alterações desde a última execução (cache).")
+        resumo = resultado.get('resumo')
+        if resumo:
+            typer.echo(
+                f"🔎 Seletores: {resumo['saudaveis']} saudáveis, {resumo['curados']} curados, "
+                f"{resumo.get('mantidos', 0)} mantidos, {resumo['nao_resolvidos']} não resolvidos."
+            )
         typer.echo(f"📄 Log de alterações: {resultado['log_detalhado']}")
         typer.echo(f"🗃️ JSON atualizado: {resultado['json_atualizado']}")
+        if coletor is not None:
+            coletor.exportar(metricas)
+            typer.echo(f"⏱️ Métricas: {metricas}")
     except Exception as e:
         typer.secho(f"❌ Erro ao executar self-healing: {e}", fg=typer.colors.RED)
 
+@app.command()
+def lote(
+    manifesto: str = typer.Option(
+        ..., "--manifesto", "-m",
+        help="Arquivo JSON com a lista de páginas: [{\"json\": \"seletores.json\", \"url\": \"https://...\"}, ...]."
+    ),
+    paralelismo: int = typer.Option(
+        2, "--paralelismo", "-n", min=1,
+        help="Páginas processadas ao mesmo tempo (e navegadores abertos no pool)."
+    ),
+    backend: str = typer.Option(
+        "selenium", "--backend", "-b",
+        help="Backend de extração do DOM: 'selenium' (navegador headless) ou 'lxml' (HTML estático, sem navegador)."
+    ),
+    filtro: str = typer.Option(
+        "seletores", "--filtro", "-f",
+        help="Elementos extraídos: 'seletores' (apenas atributos usados no JSON), 'relevantes' (id/name/class/data-*) ou 'nenhum'."
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Usa o cache em disco: pula a execução se a página e os seletores não mudaram e reaproveita curas já encontradas."
+    ),
+    processos: int = typer.Option(
+        1, "--processos", "-p", min=1,
+        help="Processos usados para curar os seletores quebrados de cada página."
+    ),
+    metricas: Optional[str] = typer.Option(
+        None, "--metricas",
+        help="Grava o tempo de cada etapa e os contadores somados de todas as páginas neste arquivo (.prom: formato Prometheus; demais: JSON)."
+    ),
+):
+    """
+    Executa o self-healing de várias páginas em paralelo, a partir de um manifesto de pares (JSON de seletores, URL).
+
+    Cada página gera seu próprio `ElementosAlterados.json`; ao final é exibido um resumo com o tempo
+    de cada página e as falhas. O comando termina com código de saída 1 se o manifesto for inválido
+    ou se alguma página falhar.
+
+    Args:
+        manifesto (str): Caminho do manifesto (.json); caminhos relativos são resolvidos a partir da sua pasta.
+        paralelismo (int): Quantidade de páginas processadas ao mesmo tempo.
+        backend (str): Backend de extração do DOM ('selenium' ou 'lxml').
+        filtro (str): Modo de pré-filtragem dos elementos ('seletores', 'relevantes' ou 'nenhum').
+        cache (bool): Ativa o cache de snapshots e a memória de curas em disco.
+        processos (int): Quantidade de processos do comparator em cada página.
+        metricas (str, optional): Arquivo de exportação das métricas somadas do lote.
+
+    Example:
+        dom-heal lote --manifesto ./paginas.json --paralelismo 4
+    """
+    coletor = Metricas() if metricas else None
+    try:
+        paginas = carregar_manifesto(manifesto)
+        resumo = self_heal_lote(
+            paginas, backend=backend, filtro=filtro, cache=CacheSnapshots() if cache else None,
+            memo=MemoCuras() if cache else None, paralelismo=paralelismo, processos=processos, metricas=coletor
+        )
+    except Exception as e:
+        typer.secho(f"❌ Erro ao executar self-healing em lote: {e}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    for pagina in resumo['paginas']:
+        if pagina['sucesso']:
+            typer.echo(f"✅ {pagina['url']} ({pagina['tempo']:.2f}s) → {pagina['json']}")
+        else:
+            typer.secho(f"❌ {pagina['url']} ({pagina['tempo']:.2f}s): {pagina['erro']}", fg=typer.colors.RED)
+    typer.echo(
+        f"📊 {len(resumo['paginas'])} páginas em {resumo['tempo_total']:.2f}s: "
+        f"{resumo['sucesso']} com sucesso, {resumo['falhas']} com falha."
+    )
+    if coletor is not None:
+        coletor.exportar(metricas)
+        typer.echo(f"⏱️ Métricas: {metricas}")
+    if resumo['falhas']:
+        raise typer.Exit(code=1)
+
 @app.command()
 def sobre():
     """
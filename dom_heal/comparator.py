@@ -7,15 +7,34 @@ Módulo responsável por comparar seletores antigos com o novo DOM para identifi
 Principais funcionalidades:
 - Matching fuzzy entre seletores antigos e novos elementos do DOM (id, name, class, xpath)
 - Mecanismo de self-healing para sugerir novos seletores, inclusive via ajuste inteligente de XPath
-- Suporte a múltiplos boosts (prefixo, sufixo, palavras, caractere) para maior precisão na recuperação de elementos
+  (com o HTML interpretado uma única vez por execução em `ContextoHealing`)
+- Suporte a múltiplos boosts (prefixo, sufixo, palavras, caractere) para maior precisão na recuperação de elementos,
+  calculados em uma única passada (`PontuadorSeletor`) com os valores do DOM normalizados uma só vez
+- Resolução direta (sem matching fuzzy) de seletores cujo valor continua presente no novo DOM
+- Validação prévia, na árvore do novo DOM, de todos os seletores: os que resolvem para um único elemento
+  são saudáveis e não passam pelo matcher
+- Pontuação em lote (matriz de similaridade via `rapidfuzz.process.cdist`) dos seletores id/name quebrados
+- Modo paralelo: seletores quebrados distribuídos entre processos, com o mesmo resultado do modo serial
+- Memória persistente das curas (`MemoCuras`), reaproveitada enquanto os valores do campo no DOM não mudam
 - Auxilia na manutenção e robustez de suites de testes automatizados
 
 Ideal para ser utilizado como núcleo de mecanismos de self-healing, integrando-se a frameworks de automação, adaptadores e engines customizadas.
 """
 
-from rapidfuzz import fuzz
-from lxml import html
+import heapq
+import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import Levenshtein
+from lxml import etree, html
 import re
+from dom_heal.cache import hash_conteudo
+from dom_heal.compilador import avaliar_css, avaliar_xpath
+from dom_heal.indice import indexar
+from dom_heal.metricas import contar, etapa
 
 ATRIBUTOS = ['id', 'name', 'class', 'xpath']
 LIMIARES_POR_CAMPO = {
@@ -24,6 +43,10 @@ LIMIARES_POR_CAMPO = {
     'class': 0.60,
     'xpath': 0.80
 }
+BOOST_MAXIMO = 0.20
+BOOST_UNITARIO = 0.1
+TIPOS_BOOST = ['prefixo', 'sufixo', 'um_char', 'palavras_iguais']
+PADRAO_PALAVRAS = re.compile(r'[a-zA-Z0-9]+')
 
 def formatar_selector(campo, valor, tag=None):
     """
@@ -69,6 +92,56 @@ def detectar_tipo_selector(selector: str) -> str:
     else:
         return 'xpath'
 
+def extrair_valor_selector(selector: str, tipo: str) -> str:
+    """
+    Extrai o valor comparável de um seletor id (`#valor`) ou name (`[name="valor"]`).
+
+    Args:
+        selector (str): Seletor no formato string.
+        tipo (str): Tipo detectado do seletor.
+
+    Returns:
+        str: Valor do seletor (o próprio seletor para os demais tipos).
+    """
+    if tipo == 'id':
+        return selector.lstrip('#')
+    if tipo == 'name':
+        match = re.match(r'\[name\s*=\s*[\'"]?(.+?)[\'"]?\]', selector)
+        return match.group(1) if match else selector
+    return selector
+
+def classes_do_selector(selector: str) -> set:
+    """
+    Retorna o conjunto de classes de um seletor de classe (`.a.b`).
+
+    Args:
+        selector (str): Seletor de classe.
+
+    Returns:
+        set: Classes do seletor (sem valores vazios).
+    """
+    classes = set(selector.strip('.').split('.'))
+    classes.discard('')
+    return classes
+
+def campos_dos_seletores(seletores: list) -> list:
+    """
+    Retorna os campos de elemento (id, name, class) necessários para curar os seletores informados.
+
+    Seletores XPath são curados a partir do HTML e não exigem campos de elemento.
+
+    Args:
+        seletores (list): Lista de seletores normalizados ({'nome', 'selector'}).
+
+    Returns:
+        list: Campos utilizados, na ordem de `ATRIBUTOS`.
+    """
+    tipos = {
+        detectar_tipo_selector(el['selector'])
+        for el in seletores if isinstance(el, dict) and el.get('selector')
+    }
+    return [campo for campo in ATRIBUTOS if campo in tipos and campo != 'xpath']
+
 def score_fuzzy(a: str, b: str) -> float:
     """
     Calcula a similaridade fuzzy entre duas strings usando RapidFuzz.
@@ -148,6 +221,110 @@ def boost_palavras_iguais(a: str, b: str) -> float:
     pb = set(re.findall(r'[a-zA-Z0-9]+', b.lower()))
     return 0.1 if pa == pb and pa else 0
 
+@lru_cache(maxsize=65536)
+def preparar_valor(valor: str):
+    """
+    Normaliza um valor para pontuação: versão em minúsculas e conjunto de palavras alfanuméricas.
+
+    O resultado fica em cache, então cada valor distinto do DOM é normalizado uma única vez.
+
+    Args:
+        valor (str): Valor original (id ou name).
+
+    Returns:
+        Tuple[str, frozenset]: Valor em minúsculas e suas palavras.
+    """
+    minusculo = valor.lower()
+    return minusculo, frozenset(PADRAO_PALAVRAS.findall(minusculo))
+
+class PontuadorSeletor:
+    """
+    Núcleo de pontuação de um valor de seletor id/name contra valores do novo DOM.
+
+    Calcula, em uma única passada, o score fuzzy base e os quatro boosts de `aplicar_boost`, com
+    resultados idênticos a `score_fuzzy`, `boost_prefixo`, `boost_sufixo`, `boost_um_char` e
+    `boost_palavras_iguais`. O valor do seletor é preparado uma vez no construtor; os valores do DOM,
+    via `preparar_valor`. O boost de um caractere usa uma distância de Levenshtein com corte em 1:
+    vale quando a distância é 1 e os valores têm o mesmo tamanho ou terminam com o mesmo caractere
+    (a varredura original não testa a remoção do último caractere).
+
+    Args:
+        valor (str): Valor do seletor antigo (sem `#`/`[name=]`).
+    """
+
+    __slots__ = ('valor', 'minusculo', 'palavras', 'prefixo', 'sufixo')
+
+    def __init__(self, valor: str):
+        self.valor = valor
+        self.minusculo, self.palavras = preparar_valor(valor)
+        corte = max(2, int(0.5 * len(valor)))
+        self.prefixo = self.minusculo[:corte]
+        self.sufixo = self.minusculo[-corte:]
+
+    def _um_char(self, minusculo: str) -> bool:
+        if Levenshtein.distance(self.minusculo, minusculo, score_cutoff=1) != 1:
+            return False
+        if len(minusculo) == len(self.minusculo):
+            return True
+        return bool(minusculo) and bool(self.minusculo) and minusculo[-1] == self.minusculo[-1]
+
+    def _boosts(self, minusculo: str, palavras: frozenset) -> list:
+        return [
+            BOOST_UNITARIO if minusculo.startswith(self.prefixo) else 0,
+            BOOST_UNITARIO if minusculo.endswith(self.sufixo) else 0,
+            BOOST_UNITARIO if self._um_char(minusculo) else 0,
+            BOOST_UNITARIO if palavras == self.palavras and self.palavras else 0,
+        ]
+
+    def bonus(self, valor_novo: str):
+        """
+        Calcula apenas os boosts de um valor do novo DOM.
+
+        Args:
+            valor_novo (str): Valor de comparação.
+
+        Returns:
+            Tuple[float, dict]: Bônus total (máx 0.2) e detalhes dos boosts aplicados.
+        """
+        boosts = self._boosts(*preparar_valor(valor_novo))
+        boost_details = {k: v for k, v in zip(TIPOS_BOOST, boosts) if v > 0}
+        boost_total = min(sum(boosts), BOOST_MAXIMO)
+        boost_details["boost_total"] = boost_total
+        return boost_total, boost_details
+
+    def pontuar(self, valor_novo: str, fuzzy_score: float = None):
+        """
+        Pontua um valor do novo DOM: score fuzzy base mais os boosts.
+
+        Args:
+            valor_novo (str): Valor de comparação.
+            fuzzy_score (float, optional): Score base já calculado (ex: por `process.cdist`).
+
+        Returns:
+            Tuple[float, float, dict]: Score total, bônus total (máx 0.2) e detalhes dos boosts.
+        """
+        if fuzzy_score is None:
+            fuzzy_score = fuzz.ratio(self.minusculo, preparar_valor(valor_novo)[0]) / 100.0
+        boost_total, boost_details = self.bonus(valor_novo)
+        return fuzzy_score + boost_total, boost_total, boost_details
+
+    def pontuar_total(self, valor_novo: str, fuzzy_score: float = None):
+        """
+        Igual a `pontuar`, sem montar os detalhes dos boosts (usado na seleção dos melhores candidatos).
+
+        Args:
+            valor_novo (str): Valor de comparação.
+            fuzzy_score (float, optional): Score base já calculado.
+
+        Returns:
+            Tuple[float, float]: Score total e bônus total.
+        """
+        minusculo, palavras = preparar_valor(valor_novo)
+        if fuzzy_score is None:
+            fuzzy_score = fuzz.ratio(self.minusculo, minusculo) / 100.0
+        boost_total = min(sum(self._boosts(minusculo, palavras)), BOOST_MAXIMO)
+        return fuzzy_score + boost_total, boost_total
+
 def aplicar_boost(campo: str, a: str, b: str, fuzzy_score: float):
     """
     Aplica todos os boosts possíveis para 'id' e 'name'.
@@ -161,18 +338,8 @@ def aplicar_boost(campo: str, a: str, b: str, fuzzy_score: float):
     Returns:
         Tuple[float, dict]: Bônus total (máx 0.2) e detalhes dos boosts aplicados.
     """
-    boost_details = {}
     if campo in ['id', 'name']:
-        bp = boost_prefixo(a, b)
-        bs = boost_sufixo(a, b)
-        bc = boost_um_char(a, b)
-        bw = boost_palavras_iguais(a, b)
-        boosts = [bp, bs, bc, bw]
-        detail_map = ['prefixo', 'sufixo', 'um_char', 'palavras_iguais']
-        boost_details = {k: v for k, v in zip(detail_map, boosts) if v > 0}
-        boost_total = min(sum(boosts), 0.20)
-        boost_details["boost_total"] = boost_total
-        return boost_total, boost_details
+        return PontuadorSeletor(a).bonus(b)
     return 0, {"boost_total": 0.0}
 
 def score_class(conj_antigo: set, conj_novo: set) -> float:
@@ -194,37 +361,227 @@ def score_class(conj_antigo: set, conj_novo: set) -> float:
                 melhor_score = score
     return melhor_score
 
+ATRIBUTOS_XPATH = ('class', 'id', 'name')
+
+class ContextoHealing:
+    """
+    Contexto de healing de XPath compartilhado por todos os seletores de uma execução.
+
+    Interpreta o HTML do novo DOM uma única vez e calcula (na primeira cura), para class (por token), id e name,
+    os valores distintos em ordem de documento, já normalizados para a comparação fuzzy.
+
+    Args:
+        dom_novo_html (str): HTML puro do novo DOM.
+        valores (Dict[str, List[str]], optional): Valores distintos já calculados para este mesmo HTML
+            (ex: gravados no cache de snapshots); evitam a varredura da árvore na primeira cura.
+
+    Attributes:
+        dom (lxml.html.HtmlElement): Árvore interpretada.
+        valores (Dict[str, List[str]]): Valores distintos por atributo, na ordem do documento.
+
+    Raises:
+        ValueError: Se o HTML está vazio.
+    """
+
+    def __init__(self, dom_novo_html: str, valores: Optional[Dict[str, List[str]]] = None):
+        if not dom_novo_html or dom_novo_html.strip() == '':
+            raise ValueError("HTML passado para heal_xpath está vazio!")
+        with etapa('interpretar_html'):
+            self.dom = html.fromstring(dom_novo_html)
+        self._valores = None
+        self._minusculos = None
+        if valores is not None:
+            self._definir_valores({atributo: list(valores.get(atributo, ())) for atributo in ATRIBUTOS_XPATH})
+
+    def _definir_valores(self, valores: Dict[str, List[str]]) -> None:
+        self._valores = valores
+        self._minusculos = {atributo: [v.lower() for v in vals] for atributo, vals in valores.items()}
+
+    @property
+    def valores(self):
+        # Calculados sob demanda: a validação dos seletores usa apenas a árvore
+        if self._valores is None:
+            valores = {atributo: {} for atributo in ATRIBUTOS_XPATH}
+            for elemento in self.dom.iter(etree.Element):
+                for atributo in ATRIBUTOS_XPATH:
+                    valor = elemento.get(atributo)
+                    if valor is None:
+                        continue
+                    distintos = valores[atributo]
+                    for item in (valor.split() if atributo == 'class' else (valor,)):
+                        distintos.setdefault(item, None)
+            self._definir_valores({atributo: list(distintos) for atributo, distintos in valores.items()})
+        return self._valores
+
+    def encontrar(self, selector: str) -> list:
+        """
+        Retorna os elementos da árvore encontrados pelo seletor (XPath nativo; CSS traduzido para XPath).
+
+        Args:
+            selector (str): Seletor CSS ou XPath.
+
+        Returns:
+            list: Elementos encontrados, em ordem de documento (vazia se o seletor é inválido).
+        """
+        try:
+            if selector.lstrip().startswith(('/', '(')):
+                encontrados = avaliar_xpath(selector, self.dom)
+            else:
+                encontrados = avaliar_css(selector, self.dom)
+        except (ValueError, etree.XPathError):
+            return []
+        if not isinstance(encontrados, list):
+            return []
+        return [item for item in encontrados if etree.iselement(item)]
+
+    def contar_elementos(self, selector: str) -> int:
+        """
+        Conta os elementos da árvore encontrados pelo seletor (ver `encontrar`).
+
+        Args:
+            selector (str): Seletor CSS ou XPath.
+
+        Returns:
+            int: Quantidade de elementos (0 se o seletor é inválido ou não retorna elementos).
+        """
+        return len(self.encontrar(selector))
+
+    def melhor_valor(self, atributo: str, valor_antigo: str):
+        """
+        Retorna o valor do atributo mais parecido com o valor antigo (o primeiro em ordem de documento, em empates).
+
+        Args:
+            atributo (str): 'class', 'id' ou 'name'.
+            valor_antigo (str): Valor procurado.
+
+        Returns:
+            Tuple[str or None, float]: Melhor valor (None se nenhum tiver score positivo) e seu score.
+        """
+        valores = self.valores[atributo]
+        minusculos = self._minusculos[atributo]
+        if not minusculos:
+            return None, 0
+        scores = process.cdist([valor_antigo.lower()], minusculos, scorer=fuzz.ratio, dtype=np.float64)[0]
+        melhor = int(np.argmax(scores))
+        melhor_score = float(scores[melhor]) / 100.0
+        if melhor_score <= 0:
+            return None, 0
+        return valores[melhor], melhor_score
+
+def contexto_healing(dom_novo_html) -> ContextoHealing:
+    """
+    Garante um `ContextoHealing` a partir do HTML puro ou de um contexto já construído.
+
+    Args:
+        dom_novo_html (str | ContextoHealing): HTML do novo DOM ou contexto.
+
+    Returns:
+        ContextoHealing: Contexto correspondente.
+    """
+    if isinstance(dom_novo_html, ContextoHealing):
+        return dom_novo_html
+    return ContextoHealing(dom_novo_html)
+
+def seletores_saudaveis(seletores: list, html_dom) -> set:
+    """
+    Valida em lote os seletores na árvore do novo DOM, interpretada uma única vez.
+
+    Seletores CSS (id, name, classe) são traduzidos para XPath e todas as expressões são compiladas com cache.
+
+    Args:
+        seletores (list): Seletores armazenados (CSS ou XPath).
+        html_dom (str | ContextoHealing): HTML do novo DOM ou contexto já interpretado.
+
+    Returns:
+        set: Seletores que resolvem para exatamente um elemento.
+    """
+    contexto = contexto_healing(html_dom)
+    distintos = set(seletores)
+    contar('seletores_verificados', len(distintos))
+    with etapa('validar_seletores'):
+        return {selector for selector in distintos if contexto.contar_elementos(selector) == 1}
+
+def _xpath_absoluto(elemento) -> str:
+    # Mesma convenção da extração (ex: '/html[1]/body[1]/div[2]'): posição entre irmãos com a mesma tag
+    partes = []
+    while elemento is not None:
+        posicao = 1 + sum(1 for irmao in elemento.itersiblings(preceding=True) if irmao.tag == elemento.tag)
+        partes.append(f"{elemento.tag}[{posicao}]")
+        elemento = elemento.getparent()
+    return '/' + '/'.join(reversed(partes))
+
+def elementos_dos_saudaveis(saudaveis, contexto: ContextoHealing, indice) -> set:
+    """
+    Localiza no índice do novo DOM os elementos resolvidos pelos seletores saudáveis.
+
+    Seletores id/name/class são resolvidos pelo índice de valores exatos; os demais (CSS composto e XPath)
+    são avaliados na árvore e associados ao elemento indexado com o mesmo XPath absoluto. Elementos sem
+    correspondência no índice (ex: sem id, name ou class) não precisam de reserva e são ignorados.
+
+    Args:
+        saudaveis (Iterable[str]): Seletores que resolvem para exatamente um elemento (`seletores_saudaveis`).
+        contexto (ContextoHealing): Árvore do novo DOM.
+        indice (IndiceDom): Índice do novo DOM.
+
+    Returns:
+        set: Posições dos elementos no índice.
+    """
+    posicoes, compostos = set(), []
+    for selector in saudaveis:
+        tipo = detectar_tipo_selector(selector)
+        if tipo == 'class':
+            idx = indice.buscar_exato(tipo, classes_do_selector(selector))
+        elif tipo in ('id', 'name'):
+            idx = indice.buscar_exato(tipo, (extrair_valor_selector(selector, tipo),))
+        else:
+            compostos.append(selector)
+            continue
+        if idx is not None:
+            posicoes.add(idx)
+    if compostos:
+        por_xpath = {elem.get('xpath'): idx for idx, elem in indice.elementos.items() if elem.get('xpath')}
+        for selector in compostos:
+            for elemento in contexto.encontrar(selector):
+                idx = por_xpath.get(_xpath_absoluto(elemento))
+                if idx is not None:
+                    posicoes.add(idx)
+    return posicoes
+
 def validar_xpath(xpath: str, html_dom) -> bool:
     """
-    Valida se o XPath existe no DOM fornecido.
+    Valida se o XPath existe no DOM fornecido (expressão compilada uma vez por processo).
 
     Args:
         xpath (str): XPath a ser validado.
-        html_dom (lxml.html.HtmlElement): DOM para busca.
+        html_dom (lxml.html.HtmlElement | ContextoHealing): DOM (ou contexto) para busca.
 
     Returns:
         bool: True se encontrar pelo menos um elemento, False caso contrário.
     """
+    if isinstance(html_dom, ContextoHealing):
+        html_dom = html_dom.dom
+    contar('xpaths_validados')
     try:
-        elementos = html_dom.xpath(xpath)
+        elementos = avaliar_xpath(xpath, html_dom)
         return len(elementos) > 0
     except Exception:
         return False
 
-def heal_xpath(selector_antigo: str, dom_novo_html: str):
+def heal_xpath(selector_antigo: str, dom_novo_html):
     """
     Realiza tentativa de 'cura' de um XPath quebrado, buscando substituir valores por similares encontrados no novo DOM.
 
     Args:
         selector_antigo (str): XPath antigo a ser curado.
-        dom_novo_html (str): Novo HTML para busca de valores substitutos.
+        dom_novo_html (str | ContextoHealing): Novo HTML para busca de valores substitutos, ou o
+            contexto já interpretado (recomendado ao curar vários seletores do mesmo DOM).
 
     Returns:
         Tuple[str or None, float or None, None]: XPath sugerido, score médio ou None caso não haja cura possível.
     Raises:
         ValueError: Se o HTML novo está vazio.
     """
-    if not dom_novo_html or dom_novo_html.strip() == '':
+    if not isinstance(dom_novo_html, ContextoHealing) and (not dom_novo_html or dom_novo_html.strip() == ''):
         raise ValueError("HTML passado para heal_xpath está vazio!")
     if selector_antigo.strip().startswith('//'):
         LIMIAR_XPATH = 0.6
@@ -237,30 +594,15 @@ def heal_xpath(selector_antigo: str, dom_novo_html: str):
         # Não encontrou pattern válido para curar.
         return None, None, None
 
-    html_dom = html.fromstring(dom_novo_html)
+    contexto = contexto_healing(dom_novo_html)
     xpath_sugerido = selector_antigo
     scores = []
 
     encontrou_alguma_substituicao = False
 
     for match_full, atributo, valor_antigo in matches:
-        melhor_score = 0
-        melhor_valor = None
-
-        for elemento in html_dom.xpath(f"//*[@{atributo}]"):
-            valor_novo = elemento.get(atributo)
-            # Ajuste: se for 'class', compara cada classe individualmente!
-            if atributo == "class":
-                for classe_indiv in valor_novo.split():
-                    score = score_fuzzy(valor_antigo, classe_indiv)
-                    if score > melhor_score:
-                        melhor_score = score
-                        melhor_valor = classe_indiv
-            else:
-                score = score_fuzzy(valor_antigo, valor_novo)
-                if score > melhor_score:
-                    melhor_score = score
-                    melhor_valor = valor_novo
+        # Para 'class', cada classe é comparada individualmente
+        melhor_valor, melhor_score = contexto.melhor_valor(atributo, valor_antigo)
 
         if melhor_score >= LIMIAR_XPATH:
             encontrou_alguma_substituicao = True
@@ -270,117 +612,416 @@ def heal_xpath(selector_antigo: str, dom_novo_html: str):
     # Validação final
     is_valid = False
     if encontrou_alguma_substituicao:
-        is_valid = validar_xpath(xpath_sugerido, html_dom)
+        is_valid = validar_xpath(xpath_sugerido, contexto)
 
     if encontrou_alguma_substituicao and is_valid:
         return xpath_sugerido, sum(scores)/len(scores), None
     return None, None, None
 
 def fuzzy_matching_selector(
-    selector_antigo: str, dom_novo: list, nome_logico=None, elementos_ja_usados=None, html_puro=None
+    selector_antigo: str, dom_novo: list, nome_logico=None, elementos_ja_usados=None, html_puro=None,
+    ranking=None
 ):
     """
     Busca no novo DOM o melhor elemento equivalente ao selector antigo usando matching fuzzy.
 
     Args:
         selector_antigo (str): Seletor antigo.
-        dom_novo (list): Lista de dicionários do novo DOM.
+        dom_novo (list | IndiceDom): Lista de dicionários do novo DOM ou índice já construído.
         nome_logico (str, optional): Nome lógico do elemento (usado para logs/contexto).
         elementos_ja_usados (set, optional): Índices já usados para evitar duplicidade.
-        html_puro (str, optional): HTML puro (necessário para healing de xpath).
+        html_puro (str | ContextoHealing, optional): HTML puro ou contexto (necessário para healing de xpath).
+        ranking (list, optional): Candidatos já pontuados e ordenados (`ranquear_em_lote` ou
+            `ranquear_classes`); quando informado, substitui a varredura fuzzy.
 
     Returns:
         Tuple[str or None, dict or None, float, str or None, int or None, dict]:
             Novo seletor, elemento novo, score, tipo, índice, detalhes de boost.
     """
-    import re
     tipo = detectar_tipo_selector(selector_antigo)
-    seletor_val = selector_antigo
-    tag_esperada = None
-    if tipo == 'id':
-        seletor_val = selector_antigo.lstrip('#')
-    elif tipo == 'name':
-        match = re.match(r'\[name\s*=\s*[\'"]?(.+?)[\'"]?\]', selector_antigo)
-        seletor_val = match.group(1) if match else selector_antigo
-    elif tipo == 'class':
-        classes_antigas = set(selector_antigo.strip('.').split('.'))
+    seletor_val = extrair_valor_selector(selector_antigo, tipo)
+    if tipo == 'class':
+        classes_antigas = classes_do_selector(selector_antigo)
     elif tipo == 'xpath':
-        novo_xpath, score, _ = heal_xpath(selector_antigo, html_puro)
+        with etapa('heal_xpath'):
+            novo_xpath, score, _ = heal_xpath(selector_antigo, html_puro)
         if novo_xpath and novo_xpath != selector_antigo:
             return novo_xpath, None, score, tipo, None, {}
         else:
             return None, None, 0, tipo, None, {}
 
-    candidatos_validos = []
+    indice = indexar(dom_novo)
+    pontuador = PontuadorSeletor(seletor_val) if tipo in ['id', 'name'] else None
+
+    # Seletor intacto: o valor ainda existe em um elemento livre, sem necessidade de matching fuzzy
+    if tipo == 'class':
+        idx = indice.buscar_exato(tipo, classes_antigas, elementos_ja_usados)
+        if idx is not None:
+            return selector_antigo, indice.elementos[idx], 1.0, tipo, idx, {}
+    else:
+        idx = indice.buscar_exato(tipo, (seletor_val,), elementos_ja_usados)
+        if idx is not None:
+            score_total, _, boost_details = pontuador.pontuar(seletor_val, 1.0)
+            return formatar_selector(tipo, seletor_val), indice.elementos[idx], score_total, tipo, idx, boost_details
+
+    if ranking is None and tipo == 'class':
+        limite = len(elementos_ja_usados or ()) + 1
+        ranking = ranquear_classes([selector_antigo], indice, limite)[selector_antigo]
 
-    for idx, elem in enumerate(dom_novo):
+    if ranking is not None:
+        for score_total, boost, idx, valor, boost_details in ranking:
+            if elementos_ja_usados and idx in elementos_ja_usados:
+                continue
+            elem = indice.elementos[idx]
+            return formatar_selector(tipo, valor, tag=elem.get('tag')), elem, score_total, tipo, idx, boost_details
+        return None, None, 0, None, None, {}
+
+    # Melhor candidato com corte crescente: quem não pode superar o atual nem chega a ser pontuado por completo
+    limiar = LIMIARES_POR_CAMPO[tipo]
+    melhor = None
+    contar('candidatos_pontuados', len(indice.candidatos[tipo]))
+    for idx, valor in indice.candidatos[tipo]:
         if elementos_ja_usados and idx in elementos_ja_usados:
             continue
-        valor = elem.get(tipo, '')
-        tag = elem.get('tag')
-        if not valor:
+        piso = limiar if melhor is None else melhor[0]
+        corte = max(0.0, (piso - BOOST_MAXIMO) * 100 - 1e-6)
+        fuzzy_score = fuzz.ratio(pontuador.minusculo, preparar_valor(valor)[0], score_cutoff=corte) / 100.0
+        if not fuzzy_score:
             continue
+        score_total, boost = pontuador.pontuar_total(valor, fuzzy_score)
+        # Empates mantêm o primeiro em ordem de documento (mesma regra da ordenação estável por score e boost)
+        if score_total >= limiar and (melhor is None or (score_total, boost) > melhor[:2]):
+            melhor = (score_total, boost, idx, valor)
 
-        if tipo == 'class':
-            classes_novas = set(valor.strip().split())
-            score_total = score_class(classes_antigas, classes_novas)
-        else:
-            fuzzy_score = score_fuzzy(seletor_val, valor)
-            boost, boost_details = aplicar_boost(tipo, seletor_val, valor, fuzzy_score)
-            score_total = fuzzy_score + boost
+    if melhor is not None:
+        score_total, _, idx, valor = melhor
+        elem = indice.elementos[idx]
+        _, boost_details = pontuador.bonus(valor)
+        return formatar_selector(tipo, valor, tag=elem.get('tag')), elem, score_total, tipo, idx, boost_details
 
-        if score_total >= LIMIARES_POR_CAMPO[tipo]:
-            entry = {'score': score_total, 'selector': formatar_selector(tipo, valor, tag=tag), 'elemento': elem, 'campo': tipo, 'idx': idx}
-            if tipo in ['id', 'name']:
-                entry['boost_details'] = boost_details
-            candidatos_validos.append(entry)
+    return None, None, 0, None, None, {}
 
-    if candidatos_validos:
-        candidatos_validos.sort(key=lambda x: (x['score'], x.get('boost_details', {}).get('boost_total', 0)), reverse=True)
-        melhor = candidatos_validos[0]
-        return melhor['selector'], melhor['elemento'], melhor['score'], tipo, melhor['idx'], melhor.get('boost_details', {})
+def _melhores(chaves, limite):
+    # Top-k por heap (chaves já em ordem crescente de preferência); sem limite, ordenação completa
+    return sorted(chaves) if limite is None else heapq.nsmallest(limite, chaves)
 
-    return None, None, 0, None, None, {}
+def _ranquear_linha(tipo: str, consulta: str, valores: list, scores, indice, limite=None) -> list:
+    limiar = LIMIARES_POR_CAMPO[tipo]
+    pontuador = PontuadorSeletor(consulta)
+    aprovados = []
+    for coluna in np.flatnonzero(scores):
+        valor_novo = valores[coluna]
+        score_total, boost = pontuador.pontuar_total(valor_novo, float(scores[coluna]) / 100.0)
+        if score_total >= limiar:
+            for idx in indice.exatos[tipo][valor_novo]:
+                aprovados.append((-score_total, -boost, idx, valor_novo))
+    # Detalhes dos boosts só para os candidatos mantidos
+    return [
+        (-score_negativo, -boost_negativo, idx, valor_novo, pontuador.bonus(valor_novo)[1])
+        for score_negativo, boost_negativo, idx, valor_novo in _melhores(aprovados, limite)
+    ]
+
+def ranquear_em_lote(tipo: str, valores: list, dom_novo, limite: int = None) -> dict:
+    """
+    Pontua de uma só vez vários valores de seletores id/name contra todos os valores distintos do novo DOM.
+
+    A similaridade base é calculada em uma única chamada vetorizada e multi-thread a
+    `rapidfuzz.process.cdist`, com `score_cutoff` igual ao limiar do campo menos o boost máximo
+    (nenhum candidato que passaria no limiar é descartado). Os boosts só são calculados para os pares
+    que passam nesse corte.
+
+    Args:
+        tipo (str): Campo dos seletores ('id' ou 'name').
+        valores (list): Valores dos seletores (sem `#`/`[name=]`).
+        dom_novo (list | IndiceDom): Elementos do novo DOM ou índice já construído.
+        limite (int, optional): Mantém apenas os `limite` melhores candidatos de cada valor (seleção por heap).
+
+    Returns:
+        dict: Para cada valor, lista de candidatos `(score, boost_total, idx, valor_novo, boost_details)`
+            com score acima do limiar, na mesma ordem de preferência de `fuzzy_matching_selector`
+            (score e boost decrescentes, depois ordem de documento).
+    """
+    indice = indexar(dom_novo)
+    consultas = list(dict.fromkeys(valores))
+    rankings = {valor: [] for valor in consultas}
+    distintos = list(indice.exatos[tipo])
+    if not consultas or not distintos:
+        return rankings
+
+    contar('candidatos_pontuados', len(consultas) * len(distintos))
+    matriz = process.cdist(
+        consultas, distintos, scorer=fuzz.ratio, processor=str.lower,
+        score_cutoff=max(0.0, LIMIARES_POR_CAMPO[tipo] - BOOST_MAXIMO) * 100, dtype=np.float64, workers=-1
+    )
+    for consulta, scores in zip(consultas, matriz):
+        rankings[consulta] = _ranquear_linha(tipo, consulta, distintos, scores, indice, limite)
+    return rankings
+
+def ranquear_classes(selectors: list, dom_novo, limite: int = None) -> dict:
+    """
+    Pontua seletores de classe contra os elementos com classe do novo DOM, via vocabulário de tokens.
+
+    Em vez de comparar cada classe antiga com cada classe de cada elemento (`score_class`), cada
+    classe antiga é comparada uma única vez com os tokens de classe distintos do DOM (uma chamada a
+    `rapidfuzz.process.cdist` para todos os seletores, com corte no limiar). O score de um elemento é
+    o maior score entre os seus tokens, obtido pelas listas invertidas de `IndiceDom.exatos['class']`;
+    o resultado é idêntico ao de `score_class`, e o custo passa a depender do tamanho do vocabulário.
+
+    Args:
+        selectors (list): Seletores de classe (`.a.b`).
+        dom_novo (list | IndiceDom): Elementos do novo DOM ou índice já construído.
+        limite (int, optional): Mantém apenas os `limite` melhores candidatos de cada seletor.
+
+    Returns:
+        dict: Para cada seletor, lista de candidatos `(score, 0.0, idx, valor_novo, {})` com score acima
+            do limiar, na mesma ordem de preferência de `fuzzy_matching_selector`.
+    """
+    indice = indexar(dom_novo)
+    limiar = LIMIARES_POR_CAMPO['class']
+    selectors = list(dict.fromkeys(selectors))
+    classes = {selector: classes_do_selector(selector) for selector in selectors}
+    consultas = list(dict.fromkeys(classe for conjunto in classes.values() for classe in conjunto))
+    vocabulario = list(indice.exatos['class'])
+    rankings = {selector: [] for selector in selectors}
+    if not consultas or not vocabulario:
+        return rankings
+
+    contar('candidatos_pontuados', len(consultas) * len(vocabulario))
+    matriz = process.cdist(
+        consultas, vocabulario, scorer=fuzz.ratio, score_cutoff=limiar * 100 - 1e-6, dtype=np.float64, workers=-1
+    )
+    linhas = {classe: linha for linha, classe in enumerate(consultas)}
+    for selector, conjunto in classes.items():
+        if not conjunto:
+            continue
+        melhores = matriz[[linhas[classe] for classe in conjunto]].max(axis=0)
+        scores_elementos = {}
+        for coluna in np.flatnonzero(melhores):
+            score = float(melhores[coluna]) / 100.0
+            if score < limiar:
+                continue
+            for idx in indice.exatos['class'][vocabulario[coluna]]:
+                if score > scores_elementos.get(idx, 0):
+                    scores_elementos[idx] = score
+        melhores = _melhores(((-score, idx) for idx, score in scores_elementos.items()), limite)
+        rankings[selector] = [
+            (-score_negativo, 0.0, idx, indice.elementos[idx].get('class'), {}) for score_negativo, idx in melhores
+        ]
+    return rankings
+
+_INDICE_PROCESSO = None
+
+def _iniciar_processo(indice) -> None:
+    # Executado uma vez por processo: o DOM indexado é recebido apenas na criação do worker
+    global _INDICE_PROCESSO
+    _INDICE_PROCESSO = indice
+
+def _ranquear_fatia(tarefa) -> tuple:
+    tipo, chaves, limite = tarefa
+    # Só os `limite` primeiros candidatos podem ser escolhidos pelo guloso (há no máximo limite - 1 já usados)
+    if tipo == 'class':
+        return tipo, ranquear_classes(chaves, _INDICE_PROCESSO, limite)
+    return tipo, ranquear_em_lote(tipo, chaves, _INDICE_PROCESSO, limite)
+
+def ranquear_em_paralelo(quebrados: dict, dom_novo, processos: int, limite: int) -> dict:
+    """
+    Distribui a pontuação dos seletores quebrados entre processos.
+
+    O índice do novo DOM é enviado a cada processo uma única vez (no inicializador do pool);
+    as tarefas carregam apenas as fatias de seletores e devolvem os rankings já ordenados.
+
+    Args:
+        quebrados (dict): Para cada tipo ('id', 'name', 'class'), chaves dos seletores quebrados
+            (valores para id/name, seletores completos para class).
+        dom_novo (list | IndiceDom): Elementos do novo DOM ou índice já construído.
+        processos (int): Quantidade de processos.
+        limite (int): Máximo de candidatos mantidos por seletor (quantidade de seletores do arquivo basta).
+
+    Returns:
+        dict: Rankings por tipo e chave, no formato de `ranquear_em_lote`/`ranquear_classes`.
+    """
+    indice = indexar(dom_novo)
+    tarefas = []
+    for tipo, chaves in quebrados.items():
+        chaves = list(dict.fromkeys(chaves))
+        tamanho = max(1, -(-len(chaves) // (processos * 4)))
+        for inicio in range(0, len(chaves), tamanho):
+            tarefas.append((tipo, chaves[inicio:inicio + tamanho], limite))
+    rankings = {tipo: {} for tipo in quebrados}
+    if not tarefas:
+        return rankings
+    with ProcessPoolExecutor(
+        max_workers=min(processos, len(tarefas)), initializer=_iniciar_processo, initargs=(indice,)
+    ) as executor:
+        for tipo, parcial in executor.map(_ranquear_fatia, tarefas):
+            rankings[tipo].update(parcial)
+    return rankings
+
+def _chave_memo(tipo: str, valor: str, indice) -> str:
+    return hash_conteudo(json.dumps([tipo, valor, indice.impressao(tipo)]))
+
+def _consultar_memo(memo, quebrados: dict, indice, limite: int) -> dict:
+    """
+    Recupera do memo os rankings dos seletores quebrados cujo campo tem a mesma impressão digital no novo DOM.
+
+    As posições dos candidatos são gravadas relativas a `indice.candidatos[tipo]`, que a impressão garante
+    ser idêntico. Um ranking gravado com limite menor que o atual (e que atingiu esse limite) é ignorado.
+
+    Returns:
+        dict: Para cada campo, rankings por valor (mesmo formato de `ranquear_em_lote`).
+    """
+    rankings = {}
+    for tipo, valores in quebrados.items():
+        for valor in valores:
+            registro = memo.obter(_chave_memo(tipo, valor, indice))
+            if registro is None:
+                continue
+            candidatos, limite_gravado = registro['candidatos'], registro['limite']
+            if limite_gravado is not None and len(candidatos) >= limite_gravado and (
+                limite is None or limite_gravado < limite
+            ):
+                continue
+            rankings.setdefault(tipo, {})[valor] = [
+                (score, boost, indice.candidatos[tipo][posicao][0], valor_novo, detalhes)
+                for score, boost, posicao, valor_novo, detalhes in candidatos
+            ]
+    return rankings
+
+def _registrar_memo(memo, rankings: dict, indice, limite: int) -> None:
+    for tipo, por_valor in rankings.items():
+        posicoes = {idx: posicao for posicao, (idx, _) in enumerate(indice.candidatos[tipo])}
+        for valor, ranking in por_valor.items():
+            memo.gravar(_chave_memo(tipo, valor, indice), {
+                'limite': limite,
+                'candidatos': [
+                    [score, boost, posicoes[idx], valor_novo, detalhes]
+                    for score, boost, idx, valor_novo, detalhes in ranking
+                ],
+            })
 
 def gerar_diferencas(
-    antes: list, depois: list, html_puro: str = None, atributos: list = None
+    antes: list, depois: list, html_puro: str = None, atributos: list = None, processos: int = 1, memo=None,
+    reservados=None
 ) -> dict:
     """
     Gera as diferenças entre dois DOMs, indicando quais seletores foram alterados após o self-healing.
 
     Args:
         antes (list): Lista de elementos do DOM antigo (dicts).
-        depois (list): Lista de elementos do DOM novo (dicts).
-        html_puro (str, optional): HTML puro do novo DOM (necessário para healing de xpath).
+        depois (list | IndiceDom | Iterable[list]): Elementos do DOM novo: lista de dicts, índice
+            já construído ou iterável de blocos (ex: `iterar_dom`), indexado à medida que chega.
+        html_puro (str | ContextoHealing, optional): HTML puro do novo DOM (necessário para healing de xpath);
+            interpretado uma única vez por execução.
         atributos (list, optional): Lista de atributos a considerar.
+        processos (int): Quantidade de processos para pontuar os seletores quebrados (default=1, serial).
+            O resultado é idêntico ao do modo serial.
+        memo (MemoCuras, optional): Memória persistente de curas; seletores quebrados já curados com os mesmos
+            valores do campo no DOM reaproveitam o ranking gravado, e os demais são gravados ao final.
+        reservados (Iterable[int], optional): Posições de elementos do novo DOM já resolvidos por seletores
+            que não foram passados em `antes` (ex: preservados no modo incremental); não recebem curas.
 
     Returns:
-        dict: Dicionário com elementos alterados e seus novos seletores.
+        dict: Dicionário com elementos alterados e seus novos seletores. Com o HTML disponível, inclui
+            também 'resumo': quantidade de seletores saudáveis (validados na árvore, sem passar pelo matcher),
+            curados, mantidos (o matcher os resolveu para eles mesmos, ex: seletores ambíguos) e não
+            resolvidos (nenhum candidato encontrado).
     """
-    antes = [el for el in antes if isinstance(el, dict)]
-    depois = [el for el in depois if isinstance(el, dict)]
+    antes = [el for el in antes if isinstance(el, dict) and el.get('selector')]
+    depois = indexar(depois)
     atributos = list(atributos or ATRIBUTOS)
 
     alterados = []
-    elementos_ja_usados = set()
+    elementos_ja_usados = set(reservados or ())
 
-    for elem_qa in antes:
-        nome_logico = elem_qa.get('nome')
-        selector_antigo = elem_qa.get('selector')
-        if not selector_antigo:
-            continue
+    # Validação prévia: o HTML é interpretado uma única vez, para validar e para curar os XPaths
+    validados = 0
+    if html_puro and antes:
+        html_puro = contexto_healing(html_puro)
+        saudaveis = seletores_saudaveis([el['selector'] for el in antes], html_puro)
+        validados = len(antes)
+        antes = [el for el in antes if el['selector'] not in saudaveis]
+        # Os elementos dos saudáveis continuam em uso e não podem receber a cura de um seletor quebrado
+        elementos_ja_usados.update(elementos_dos_saudaveis(saudaveis, html_puro, depois))
 
-        novo_selector, elem_novo, score, campo, idx, boost_details = fuzzy_matching_selector(
-            selector_antigo, depois, nome_logico, elementos_ja_usados, html_puro=html_puro
-        )
+    # Seletores cujo valor não existe mais no DOM: pontuados juntos, em uma matriz por campo
+    quebrados = {'id': [], 'name': [], 'class': []}
+    intactos = set()
+    for pos, elem_qa in enumerate(antes):
+        selector_antigo = elem_qa.get('selector')
+        tipo = detectar_tipo_selector(selector_antigo)
+        if tipo == 'class':
+            if depois.buscar_exato(tipo, classes_do_selector(selector_antigo)) is None:
+                quebrados[tipo].append(selector_antigo)
+            else:
+                intactos.add(pos)
+        elif tipo in quebrados:
+            valor = extrair_valor_selector(selector_antigo, tipo)
+            if valor not in depois.exatos[tipo]:
+                quebrados[tipo].append(valor)
+            else:
+                intactos.add(pos)
+    memorizados = {}
+    if memo is not None:
+        memorizados = _consultar_memo(memo, quebrados, depois, len(antes))
+        contar('curas_memorizadas', sum(len(por_valor) for por_valor in memorizados.values()))
+        quebrados = {
+            tipo: [valor for valor in valores if valor not in memorizados.get(tipo, {})]
+            for tipo, valores in quebrados.items()
+        }
+    with etapa('ranquear_candidatos'):
+        if processos > 1 and any(quebrados.values()):
+            rankings = ranquear_em_paralelo(quebrados, depois, processos, len(antes))
+        else:
+            rankings = {
+                tipo: (
+                    ranquear_classes(valores, depois, len(antes)) if tipo == 'class'
+                    else ranquear_em_lote(tipo, valores, depois, len(antes))
+                )
+                for tipo, valores in quebrados.items() if valores
+            }
+    if memo is not None:
+        _registrar_memo(memo, rankings, depois, len(antes))
+        for tipo, por_valor in memorizados.items():
+            rankings.setdefault(tipo, {}).update(por_valor)
+    # Intactos primeiro: o elemento de um seletor que ainda resolve é reservado antes que um seletor
+    # quebrado possa ser curado para ele, qualquer que seja a ordem no arquivo. Vários seletores intactos
+    # podem apontar para o mesmo elemento (ex: id e name), por isso a reserva não se aplica entre eles.
+    resultados = {}
+    for pos in sorted(range(len(antes)), key=lambda pos: pos not in intactos):
+        elem_qa = antes[pos]
+        selector_antigo = elem_qa.get('selector')
+        tipo = detectar_tipo_selector(selector_antigo)
+        ranking = rankings.get(tipo, {}).get(extrair_valor_selector(selector_antigo, tipo))
+        with etapa('fuzzy_matching_selector'):
+            resultados[pos] = fuzzy_matching_selector(
+                selector_antigo, depois, elem_qa.get('nome'),
+                None if pos in intactos else elementos_ja_usados, html_puro=html_puro, ranking=ranking
+            )
+        idx = resultados[pos][4]
+        if resultados[pos][0] and idx is not None:
+            elementos_ja_usados.add(idx)
 
+    situacoes = {'curados': 0, 'mantidos': 0, 'nao_resolvidos': 0}
+    for pos, elem_qa in enumerate(antes):
+        nome_logico = elem_qa.get('nome')
+        selector_antigo = elem_qa.get('selector')
+        novo_selector, elem_novo, score, campo, idx, boost_details = resultados[pos]
         if novo_selector and novo_selector != selector_antigo:
             entry = {'nome': nome_logico, 'selector_antigo': selector_antigo, 'novo_seletor': novo_selector, 'score': score}
             if campo in ['id', 'name']:
                 entry["motivo"] = campo
                 entry["boost"] = boost_details.get("boost_total", 0) > 0
             alterados.append(entry)
-            if idx is not None:
-                elementos_ja_usados.add(idx)
+            situacoes['curados'] += 1
+        elif novo_selector:
+            situacoes['mantidos'] += 1
+        else:
+            situacoes['nao_resolvidos'] += 1
+
+    if memo is not None:
+        memo.salvar()
 
-    return {'alterados': alterados} if alterados else {}
+    diferencas = {'alterados': alterados} if alterados else {}
+    if validados:
+        diferencas['resumo'] = {'saudaveis': validados - len(antes), **situacoes}
+    return diferencas
@@ -0,0 +1,169 @@
+"""
+Compilador
+==========
+
+Módulo responsável por compilar, uma única vez por processo, as expressões XPath e as traduções
+CSS → XPath usadas para avaliar seletores no DOM interpretado pelo lxml.
+
+Principais funcionalidades:
+- Cache LRU de objetos `etree.XPath` compilados, compartilhado por todas as páginas e seletores
+- Tradução própria dos seletores gerados pela DOM-Heal (`#id`, `[name="..."]`, `.classe`, `tag.classe`)
+- Tradução de seletores CSS arbitrários via `cssselect`, quando instalado (dependência opcional)
+- Contadores de acertos/falhas de cada cache para acompanhar execuções longas
+
+Ideal para o comparator e para qualquer etapa que precise avaliar seletores repetidamente.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+from lxml import etree
+
+try:
+    from cssselect import HTMLTranslator
+except ImportError:  # cssselect é opcional: apenas seletores simples são traduzidos
+    HTMLTranslator = None
+
+TAMANHO_CACHE_XPATH = 2048
+TAMANHO_CACHE_CSS = 2048
+
+PADRAO_ID = re.compile(r'^#([^\s#.\[\]]+)$')
+PADRAO_NAME = re.compile(r'^\[name\s*=\s*[\'"]?(.+?)[\'"]?\]$')
+PADRAO_CLASSE = re.compile(r'^([a-zA-Z][\w-]*)?((?:\.[^\s.#\[\]]+)+)$')
+
+def literal_xpath(valor: str) -> str:
+    """
+    Gera um literal de string XPath 1.0 seguro para qualquer valor (inclusive com aspas simples e duplas).
+
+    Args:
+        valor (str): Valor a ser usado na expressão.
+
+    Returns:
+        str: Literal XPath (ex: `'valor'` ou `concat('a', "'", 'b')`).
+    """
+    if "'" not in valor:
+        return f"'{valor}'"
+    if '"' not in valor:
+        return f'"{valor}"'
+    partes = valor.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{parte}'" for parte in partes) + ")"
+
+@lru_cache(maxsize=TAMANHO_CACHE_XPATH)
+def compilar_xpath(expressao: str) -> etree.XPath:
+    """
+    Compila (ou obtém do cache) uma expressão XPath.
+
+    Objetos `etree.XPath` possuem trava interna de avaliação, então podem ser compartilhados entre threads.
+
+    Args:
+        expressao (str): Expressão XPath.
+
+    Returns:
+        etree.XPath: Avaliador compilado.
+
+    Raises:
+        etree.XPathSyntaxError: Se a expressão é inválida.
+    """
+    return etree.XPath(expressao)
+
+@lru_cache(maxsize=TAMANHO_CACHE_CSS)
+def css_para_xpath(selector: str) -> str:
+    """
+    Traduz um seletor CSS para XPath.
+
+    Seletores de id, name e classe (com tag opcional) são traduzidos diretamente; os demais exigem `cssselect`.
+
+    Args:
+        selector (str): Seletor CSS.
+
+    Returns:
+        str: Expressão XPath equivalente.
+
+    Raises:
+        ValueError: Se o seletor não é suportado sem `cssselect` ou é inválido.
+    """
+    selector = selector.strip()
+    match = PADRAO_ID.match(selector)
+    if match:
+        return f"descendant-or-self::*[@id = {literal_xpath(match.group(1))}]"
+    match = PADRAO_NAME.match(selector)
+    if match:
+        return f"descendant-or-self::*[@name = {literal_xpath(match.group(1))}]"
+    match = PADRAO_CLASSE.match(selector)
+    if match:
+        tag = match.group(1) or '*'
+        condicoes = " and ".join(
+            f"contains(concat(' ', normalize-space(@class), ' '), {literal_xpath(' ' + classe + ' ')})"
+            for classe in match.group(2).strip('.').split('.')
+        )
+        return f"descendant-or-self::{tag}[{condicoes}]"
+    if HTMLTranslator is None:
+        raise ValueError(f"Seletor CSS não suportado sem o pacote 'cssselect': {selector}")
+    try:
+        return HTMLTranslator().css_to_xpath(selector)
+    except Exception as e:
+        raise ValueError(f"Seletor CSS inválido: {selector}") from e
+
+def compilar_css(selector: str) -> etree.XPath:
+    """
+    Compila (ou obtém do cache) um seletor CSS, via tradução para XPath.
+
+    Args:
+        selector (str): Seletor CSS.
+
+    Returns:
+        etree.XPath: Avaliador compilado.
+
+    Raises:
+        ValueError: Se o seletor não pode ser traduzido.
+    """
+    return compilar_xpath(css_para_xpath(selector))
+
+def avaliar_xpath(expressao: str, dom) -> List:
+    """
+    Avalia uma expressão XPath (compilada com cache) sobre o DOM.
+
+    Args:
+        expressao (str): Expressão XPath.
+        dom (lxml.html.HtmlElement): Árvore ou elemento de contexto.
+
+    Returns:
+        List: Resultado da avaliação.
+    """
+    return compilar_xpath(expressao)(dom)
+
+def avaliar_css(selector: str, dom) -> List:
+    """
+    Avalia um seletor CSS (traduzido e compilado com cache) sobre o DOM.
+
+    Args:
+        selector (str): Seletor CSS.
+        dom (lxml.html.HtmlElement): Árvore ou elemento de contexto.
+
+    Returns:
+        List: Elementos encontrados.
+    """
+    return compilar_css(selector)(dom)
+
+def estatisticas_cache() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna os contadores dos caches de compilação.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Para 'xpath' e 'css', acertos, falhas, tamanho atual e máximo.
+    """
+    estatisticas = {}
+    for nome, funcao in (('xpath', compilar_xpath), ('css', css_para_xpath)):
+        info = funcao.cache_info()
+        estatisticas[nome] = {
+            'acertos': info.hits, 'falhas': info.misses, 'tamanho': info.currsize, 'maximo': info.maxsize
+        }
+    return estatisticas
+
+def limpar_cache() -> None:
+    """
+    Esvazia os caches de compilação e zera os contadores.
+    """
+    compilar_xpath.cache_clear()
+    css_para_xpath.cache_clear()
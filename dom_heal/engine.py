@@ -8,19 +8,36 @@ Principais funcionalidades:
 - Executa o ciclo completo de self-healing a partir do JSON e URL informados
 - Integra os módulos de extração, comparação, normalização e atualização dos seletores
 - Gera logs detalhados dos elementos alterados para auditoria e rastreabilidade
+- Reaproveita snapshots em cache e pula a execução quando a página e os seletores não mudaram
+- Reaproveita curas já encontradas em execuções anteriores (memória persistente de curas)
+- Compara apenas os seletores afetados pelas mudanças da página desde o último snapshot (modo incremental)
+- Modo em lote: várias páginas (manifesto de pares JSON/URL) processadas em paralelo, com navegadores reutilizados
+- API assíncrona (`self_heal_async`): cada etapa bloqueante roda em um executor, sem travar o event loop
+- Métricas opcionais de tempo por etapa e volume de trabalho, devolvidas no resultado e registradas no log
 
 Ideal para uso como ponto central da automação self-healing.
 """
 
+import asyncio
+import contextvars
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 import json
-from typing import Any, Dict
-from dom_heal.extractor import extrair_dom
-from dom_heal.comparator import gerar_diferencas
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from dom_heal.cache import CacheSnapshots, MemoCuras, hash_conteudo
+from dom_heal.extractor import FILTRO_RELEVANTES, extrair_snapshot
+from dom_heal.comparator import ContextoHealing, campos_dos_seletores, gerar_diferencas
 from dom_heal.healing import atualizar_seletores
+from dom_heal.incremental import elementos_preservados, separar_seletores
+from dom_heal.indice import IndiceDom
+from dom_heal.metricas import Metricas, coletar, etapa
+from dom_heal.pool import PoolDrivers
 from dom_heal.utils import normalizar_elementos
 
-import requests
+logger = logging.getLogger(__name__)
 
 def gravar_json(caminho: Path, dados: Any) -> None:
     """
@@ -33,58 +50,469 @@ def gravar_json(caminho: Path, dados: Any) -> None:
     caminho.parent.mkdir(parents=True, exist_ok=True)
     caminho.write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding='utf-8')
 
+FILTROS = ('seletores', 'relevantes', 'nenhum')
+
+def resolver_filtro(filtro: str, seletores: list) -> Optional[List[str]]:
+    """
+    Converte o modo de filtragem de elementos na lista de atributos exigidos pelo extractor.
+
+    Args:
+        filtro (str): 'seletores' (apenas os campos usados no arquivo de seletores),
+            'relevantes' (id/name/class/data-*) ou 'nenhum' (todos os elementos).
+        seletores (list): Seletores normalizados do arquivo JSON.
+
+    Returns:
+        Optional[List[str]]: Atributos exigidos, ou None para extrair todos os elementos.
+
+    Raises:
+        ValueError: Se o modo de filtragem for desconhecido.
+    """
+    if filtro == 'seletores':
+        return campos_dos_seletores(seletores)
+    if filtro == 'relevantes':
+        return list(FILTRO_RELEVANTES)
+    if filtro == 'nenhum':
+        return None
+    raise ValueError(f"Filtro de elementos inválido: {filtro}. Use um de {FILTROS}.")
+
+def _filtro_compativel(filtro_cache: Optional[List[str]], filtro_atual: Optional[List[str]]) -> bool:
+    """
+    Indica se os elementos extraídos com `filtro_cache` contêm todos os exigidos por `filtro_atual`.
+    """
+    if filtro_cache is None:
+        return True
+    if filtro_atual is None:
+        return False
+    return set(filtro_atual) <= set(filtro_cache)
+
+def _capturar_snapshot(url: str, backend: str, pool: Optional[PoolDrivers], **opcoes):
+    """
+    Extrai o snapshot da página, emprestando o navegador do pool quando houver um.
+    """
+    if pool is not None and backend == 'selenium':
+        with pool.emprestar() as driver:
+            return extrair_snapshot(url, driver=driver, backend=backend, **opcoes)
+    return extrair_snapshot(url, backend=backend, **opcoes)
+
 def salvar_diff_alterados(diferencas: dict, caminho_seletores: Path):
     """
     Salva um resumo das diferenças detectadas no processo de self-healing
     em um arquivo 'ElementosAlterados.json' na mesma pasta do JSON original.
 
+    O arquivo só é gravado quando há alterações; o 'resumo' da execução, sozinho, não o gera.
+
     Args:
         diferencas (dict): Dicionário com diferenças entre seletores antigos e novos.
         caminho_seletores (Path): Caminho para o arquivo JSON de seletores.
     """
     caminho_alterados = caminho_seletores.parent / "ElementosAlterados.json"
-    resumo = {k: v for k, v in diferencas.items() if v}
-    if resumo:
+    conteudo = {k: v for k, v in diferencas.items() if v}
+    # O 'resumo' acompanha as alterações, mas sozinho não gera o arquivo
+    if any(chave != 'resumo' for chave in conteudo):
         with caminho_alterados.open("w", encoding="utf-8") as arquivo:
-            json.dump(resumo, arquivo, ensure_ascii=False, indent=2)
+            json.dump(conteudo, arquivo, ensure_ascii=False, indent=2)
+
+class _ColetaSnapshot:
+    """
+    Coletor do extractor usado com o cache: indexa os blocos para o comparator e guarda a lista completa
+    de elementos (o `IndiceDom` mantém apenas os elementos com id, name ou class).
+    """
+
+    def __init__(self, elementos: Optional[list] = None):
+        self.indice = IndiceDom()
+        self.elementos: list = []
+        if elementos:
+            self.extend(elementos)
+
+    def extend(self, lote) -> None:
+        lote = list(lote)
+        self.elementos.extend(lote)
+        self.indice.extend(lote)
+
+def _ler_seletores(caminho_json: str, filtro: str) -> Dict[str, Any]:
+    """
+    Etapa 1: lê e normaliza o JSON de seletores e resolve o filtro de elementos.
+    """
+    caminho_json = Path(caminho_json)
+    try:
+        raw_texto = caminho_json.read_text(encoding="utf-8")
+        raw_data = json.loads(raw_texto)
+        seletores_antigos = normalizar_elementos(raw_data)
+    except Exception as e:
+        raise RuntimeError(f"Erro ao ler JSON de seletores: {e}")
+    return {
+        'caminho_json': caminho_json,
+        'raw_texto': raw_texto,
+        'seletores': seletores_antigos,
+        'atributos_filtro': resolver_filtro(filtro, seletores_antigos),
+    }
+
+def _extrair_pagina(
+    execucao: Dict[str, Any], url: str, backend: str, pool: Optional[PoolDrivers], cache: Optional[CacheSnapshots]
+) -> None:
+    """
+    Etapa 2: carrega a página e extrai elementos e HTML do mesmo snapshot (reaproveitando o cache, se houver).
+
+    Com cache, guarda também a lista completa de elementos extraídos ('elementos'), gravada no snapshot.
+    """
+    atributos_filtro = execucao['atributos_filtro']
+    snapshot_anterior = {}
+    registro_anterior = {}
+
+    def reutilizar(fonte_html: str):
+        registro = cache.obter(url)
+        registro_anterior.update(registro or {})
+        if (
+            registro
+            and registro.get('hash_html') == hash_conteudo(fonte_html)
+            and _filtro_compativel(registro.get('filtro'), atributos_filtro)
+        ):
+            snapshot_anterior.update(registro)
+            return _ColetaSnapshot(registro.get('elementos', []))
+        return None
+
+    try:
+        coletado, html_puro = _capturar_snapshot(
+            url, backend, pool, destino=_ColetaSnapshot() if cache is not None else IndiceDom(),
+            filtro=atributos_filtro, reutilizar=reutilizar if cache is not None else None
+        )
+    except Exception as e:
+        raise RuntimeError(f"Erro ao obter o DOM da página: {e}")
+    if isinstance(coletado, _ColetaSnapshot):
+        dom_atual, elementos = coletado.indice, coletado.elementos
+    else:
+        dom_atual = coletado
+        elementos = list(coletado) if cache is not None else None
+    execucao.update(
+        dom=dom_atual, elementos=elementos, html=html_puro,
+        snapshot_anterior=snapshot_anterior, registro_anterior=registro_anterior
+    )
+
+def _resultado_inicial(execucao: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monta o dicionário de resultado; 'cache' é True quando a página e os seletores não mudaram.
+    """
+    caminho_json = execucao['caminho_json']
+    resultado = {
+        "msg": "Self-healing finalizado.",
+        "log_detalhado": str(caminho_json.parent / "ElementosAlterados.json"),
+        "json_atualizado": str(caminho_json),
+        "cache": False,
+    }
+    snapshot_anterior = execucao['snapshot_anterior']
+    if snapshot_anterior and snapshot_anterior.get('hash_seletores') == hash_conteudo(execucao['raw_texto']):
+        resultado["msg"] = "Self-healing finalizado (página e seletores sem alterações desde a última execução)."
+        resultado["cache"] = True
+    return resultado
+
+def _comparar(
+    execucao: Dict[str, Any], resultado: Dict[str, Any], processos: int, memo: Optional[MemoCuras]
+) -> dict:
+    """
+    Etapa 3: separa os seletores afetados (modo incremental) e compara-os com o novo DOM.
+    """
+    seletores_antigos = execucao['seletores']
+    registro_anterior = execucao['registro_anterior']
+    dom_atual = execucao['dom']
+    elementos = execucao['elementos']
+
+    # Modo incremental: apenas os seletores afetados pelas mudanças desde o último snapshot são comparados
+    seletores_comparados, preservados = seletores_antigos, []
+    resultado["incremental"] = None
+    if (
+        registro_anterior.get('elementos') is not None
+        and registro_anterior.get('filtro') == execucao['atributos_filtro']
+    ):
+        seletores_comparados, preservados, diff = separar_seletores(
+            seletores_antigos, registro_anterior['elementos'], elementos
+        )
+        if diff is not None:
+            resultado["incremental"] = {
+                'preservados': len(preservados),
+                **{chave: len(itens) for chave, itens in diff.items()},
+            }
+
+    # O HTML vem do mesmo carregamento que gerou a lista de elementos. Com cache, o contexto de healing
+    # é montado aqui (com os valores distintos do snapshot reaproveitado) para ser gravado no snapshot.
+    html_puro = execucao['html']
+    execucao['contexto'] = None
+    if elementos is not None and html_puro and html_puro.strip():
+        html_puro = execucao['contexto'] = ContextoHealing(
+            html_puro, valores=execucao['snapshot_anterior'].get('valores')
+        )
+    diferencas = gerar_diferencas(
+        seletores_comparados, dom_atual, html_puro=html_puro, processos=processos, memo=memo,
+        reservados=elementos_preservados(preservados, dom_atual)
+    )
+    if preservados:
+        resumo = diferencas.setdefault('resumo', {'saudaveis': 0, 'curados': 0, 'mantidos': 0, 'nao_resolvidos': 0})
+        resumo['saudaveis'] += len(preservados)
+    resultado["resumo"] = diferencas.get("resumo")
+    return diferencas
+
+def _gravar_resultados(
+    execucao: Dict[str, Any], diferencas: dict, url: str, cache: Optional[CacheSnapshots]
+) -> None:
+    """
+    Etapa 4: atualiza o JSON de seletores, grava o log de alterações e o snapshot em cache.
 
-def self_heal(caminho_json: str, url: str) -> Dict[str, Any]:
+    O snapshot guarda a lista completa de elementos extraídos e os valores distintos de class/id/name
+    usados por `heal_xpath` (a árvore lxml em si é interpretada novamente a partir do HTML).
+    """
+    caminho_json = execucao['caminho_json']
+    atualizar_seletores(diferencas, caminho_json)
+    salvar_diff_alterados(diferencas, caminho_json)
+    if cache is not None:
+        contexto = execucao.get('contexto')
+        cache.gravar(url, {
+            'hash_html': hash_conteudo(execucao['html']),
+            'hash_seletores': hash_conteudo(caminho_json.read_text(encoding="utf-8")),
+            'filtro': execucao['atributos_filtro'],
+            'elementos': [dict(elem) for elem in execucao['elementos']],
+            'valores': contexto.valores if contexto is not None else None,
+        })
+
+def _medir(nome: str, funcao, *args):
+    with etapa(nome):
+        return funcao(*args)
+
+def _registrar_metricas(resultado: Dict[str, Any], metricas: Optional[Metricas], url: str) -> Dict[str, Any]:
+    """
+    Inclui as métricas coletadas no resultado (None se a coleta estava desligada) e as registra no log.
+    """
+    resultado["metricas"] = metricas.para_dict() if metricas is not None else None
+    if metricas is not None:
+        logger.info("Métricas do self-healing de %s: %s", url, json.dumps(resultado["metricas"], ensure_ascii=False))
+    return resultado
+
+def self_heal(
+    caminho_json: str, url: str, backend: str = 'selenium', pool: Optional[PoolDrivers] = None,
+    filtro: str = 'seletores', cache: Optional[CacheSnapshots] = None, processos: int = 1,
+    memo: Optional[MemoCuras] = None, metricas: Optional[Metricas] = None
+) -> Dict[str, Any]:
     """
     Executa o processo completo de self-healing:
-      - Extrai o DOM atual da URL informada
       - Carrega o JSON de seletores do usuário
-      - Compara os seletores antigos com o novo DOM
+      - Carrega a URL uma única vez e extrai os elementos e o HTML renderizado do mesmo snapshot,
+        indexando os elementos para o comparator à medida que cada bloco é extraído
+      - Com cache: se o HTML for idêntico ao da última execução, reaproveita os elementos em cache
+        e, se o arquivo de seletores também não mudou, encerra sem comparar nem reescrever nada
+      - Com cache: compara os elementos com os do último snapshot da URL e mantém os seletores cujo
+        elemento não mudou (e que não ganharam elementos concorrentes), sem passá-los pelo comparator
+      - Valida os seletores na árvore do novo DOM e compara apenas os quebrados ou ambíguos
       - Atualiza automaticamente os seletores
       - Gera e salva o log de alterações
 
     Args:
         caminho_json (str): Caminho para o arquivo JSON de seletores.
         url (str): URL da página a ser processada.
+        backend (str): Backend de extração do DOM: 'selenium' (default) ou 'lxml' (sem navegador).
+        pool (PoolDrivers, optional): Pool de drivers já iniciados; quando informado, o navegador
+            é emprestado do pool em vez de ser criado e encerrado nesta execução.
+        filtro (str): Elementos transferidos pelo extractor: 'seletores' (default; apenas os que têm
+            os atributos usados no JSON), 'relevantes' (id/name/class/data-*) ou 'nenhum' (todos).
+        cache (CacheSnapshots, optional): Cache de snapshots em disco; None (default) desativa o cache.
+        processos (int): Processos usados pelo comparator para curar os seletores quebrados (default=1).
+        memo (MemoCuras, optional): Memória persistente de curas; None (default) desativa a memória.
+        metricas (Metricas, optional): Acumulador de métricas (tempo por etapa e contadores); None (default)
+            desliga a coleta. Pode ser compartilhado entre execuções para somar as métricas.
 
     Returns:
-        Dict[str, Any]: Dicionário com mensagem de status e caminhos dos arquivos de log e JSON atualizado.
+        Dict[str, Any]: Dicionário com mensagem de status, caminhos dos arquivos de log e JSON atualizado
+            a chave 'cache' (True quando a execução foi pulada por não haver mudanças), 'metricas' (ver
+            `Metricas.para_dict`; None com a coleta desligada) e, quando houve comparação, o 'resumo' com a
+            quantidade de seletores saudáveis, curados, mantidos e não resolvidos e o 'incremental' (seletores
+            preservados e elementos adicionados/removidos/alterados desde o último snapshot; None quando
+            não havia snapshot comparável).
 
     Raises:
-        RuntimeError: Se ocorrer erro ao baixar o HTML ou ler o JSON de seletores.
+        RuntimeError: Se ocorrer erro ao obter o DOM da página ou ler o JSON de seletores.
     """
-    caminho_json = Path(caminho_json)
-    dom_atual = extrair_dom(url)
-    try:
-        html_puro = requests.get(url).text
-    except Exception as e:
-        raise RuntimeError(f"Erro ao baixar HTML da página: {e}")
+    with coletar(metricas) if metricas is not None else nullcontext():
+        execucao = _medir('ler_seletores', _ler_seletores, caminho_json, filtro)
+        _medir('extracao', _extrair_pagina, execucao, url, backend, pool, cache)
+        resultado = _resultado_inicial(execucao)
+        if not resultado["cache"]:
+            diferencas = _medir('comparacao', _comparar, execucao, resultado, processos, memo)
+            _medir('gravacao', _gravar_resultados, execucao, diferencas, url, cache)
+    return _registrar_metricas(resultado, metricas, url)
+
+def carregar_manifesto(caminho_manifesto: str) -> List[Dict[str, str]]:
+    """
+    Lê o manifesto do modo em lote: uma lista JSON de objetos com as chaves 'json' e 'url'.
+
+    Caminhos relativos dos arquivos de seletores são resolvidos a partir da pasta do manifesto.
+
+    Args:
+        caminho_manifesto (str): Caminho do arquivo de manifesto.
+
+    Returns:
+        List[Dict[str, str]]: Páginas na ordem do manifesto, com 'json' (caminho) e 'url'.
+
+    Raises:
+        ValueError: Se o manifesto não puder ser lido ou tiver formato inválido.
+    """
+    caminho_manifesto = Path(caminho_manifesto)
     try:
-        raw_data = json.loads(caminho_json.read_text(encoding="utf-8"))
-        seletores_antigos = normalizar_elementos(raw_data)
+        paginas = json.loads(caminho_manifesto.read_text(encoding="utf-8"))
     except Exception as e:
-        raise RuntimeError(f"Erro ao ler JSON de seletores: {e}")
+        raise ValueError(f"Erro ao ler o manifesto: {e}")
+    if not isinstance(paginas, list):
+        raise ValueError("Manifesto inválido: esperada uma lista de objetos com 'json' e 'url'.")
+    resultado = []
+    for posicao, pagina in enumerate(paginas):
+        if not isinstance(pagina, dict) or not pagina.get('json') or not pagina.get('url'):
+            raise ValueError(f"Manifesto inválido: item {posicao} precisa das chaves 'json' e 'url'.")
+        resultado.append({'json': str(caminho_manifesto.parent / pagina['json']), 'url': pagina['url']})
+    return resultado
 
-    # Passa o HTML puro para o gerar_diferencas
-    diferencas = gerar_diferencas(seletores_antigos, dom_atual, html_puro=html_puro)
-    atualizar_seletores(diferencas, caminho_json)
-    salvar_diff_alterados(diferencas, caminho_json)
+def self_heal_lote(
+    paginas: List[Dict[str, str]], backend: str = 'selenium', filtro: str = 'seletores',
+    cache: Optional[CacheSnapshots] = None, memo: Optional[MemoCuras] = None, paralelismo: int = 2,
+    processos: int = 1, pool: Optional[PoolDrivers] = None, metricas: Optional[Metricas] = None
+) -> Dict[str, Any]:
+    """
+    Executa o self-healing de várias páginas ao mesmo tempo, com paralelismo limitado.
+
+    Cada página passa pelo fluxo completo de `self_heal` (inclusive a gravação do seu `ElementosAlterados.json`);
+    com o backend Selenium, os navegadores de um único pool são reaproveitados entre as páginas.
+    A falha de uma página é registrada no resumo e não interrompe as demais.
+
+    Args:
+        paginas (List[Dict[str, str]]): Páginas com 'json' (arquivo de seletores) e 'url' (ver `carregar_manifesto`).
+        backend (str): Backend de extração do DOM: 'selenium' (default) ou 'lxml'.
+        filtro (str): Modo de pré-filtragem dos elementos (ver `self_heal`).
+        cache (CacheSnapshots, optional): Cache de snapshots compartilhado pelas páginas.
+        memo (MemoCuras, optional): Memória de curas compartilhada pelas páginas.
+        paralelismo (int): Páginas processadas ao mesmo tempo e tamanho do pool de navegadores (default=2).
+        processos (int): Processos do comparator em cada página (default=1).
+        pool (PoolDrivers, optional): Pool já iniciado; se omitido, um pool é criado e encerrado nesta chamada.
+        metricas (Metricas, optional): Acumulador compartilhado pelas páginas (métricas somadas do lote);
+            None (default) desliga a coleta.
+
+    Returns:
+        Dict[str, Any]: 'paginas' (na ordem recebida, cada uma com json, url, sucesso, tempo em segundos e
+            o resultado de `self_heal` ou o erro), 'sucesso', 'falhas' e 'tempo_total'.
+
+    Raises:
+        ValueError: Se `paralelismo` for menor que 1.
+    """
+    if paralelismo < 1:
+        raise ValueError("paralelismo deve ser maior que zero.")
+    pool_proprio = pool is None and backend == 'selenium'
+    if pool_proprio:
+        pool = PoolDrivers(tamanho=paralelismo)
+
+    def processar(pagina: Dict[str, str]) -> Dict[str, Any]:
+        registro = {'json': pagina['json'], 'url': pagina['url']}
+        inicio = time.perf_counter()
+        try:
+            registro['resultado'] = self_heal(
+                pagina['json'], pagina['url'], backend=backend, pool=pool, filtro=filtro, cache=cache,
+                processos=processos, memo=memo, metricas=metricas
+            )
+            registro['sucesso'] = True
+        except Exception as e:
+            registro['erro'] = str(e)
+            registro['sucesso'] = False
+        registro['tempo'] = time.perf_counter() - inicio
+        return registro
+
+    inicio = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=paralelismo) as executor:
+            resultados = list(executor.map(processar, paginas))
+    finally:
+        if pool_proprio:
+            pool.fechar()
+    sucesso = sum(1 for registro in resultados if registro['sucesso'])
     return {
-        "msg": "Self-healing finalizado.",
-        "log_detalhado": str(caminho_json.parent / "ElementosAlterados.json"),
-        "json_atualizado": str(caminho_json)
+        'paginas': resultados,
+        'sucesso': sucesso,
+        'falhas': len(resultados) - sucesso,
+        'tempo_total': time.perf_counter() - inicio,
     }
+
+async def self_heal_async(
+    caminho_json: str, url: str, backend: str = 'selenium', pool: Optional[PoolDrivers] = None,
+    filtro: str = 'seletores', cache: Optional[CacheSnapshots] = None, processos: int = 1,
+    memo: Optional[MemoCuras] = None, executor: Optional[Executor] = None, metricas: Optional[Metricas] = None
+) -> Dict[str, Any]:
+    """
+    Versão assíncrona de `self_heal`, com o mesmo resultado.
+
+    Cada etapa bloqueante (leitura do JSON, extração da página, comparação e gravação dos arquivos) roda
+    em `executor`, sem bloquear o event loop. Entre as etapas o controle volta ao loop, então várias
+    páginas reunidas com `asyncio.gather` sobrepõem a extração de uma com a comparação de outra.
+
+    Args:
+        caminho_json (str): Caminho para o arquivo JSON de seletores.
+        url (str): URL da página a ser processada.
+        backend (str): Backend de extração do DOM: 'selenium' (default) ou 'lxml'.
+        pool (PoolDrivers, optional): Pool de drivers compartilhado (recomendado com várias páginas).
+        filtro (str): Modo de pré-filtragem dos elementos (ver `self_heal`).
+        cache (CacheSnapshots, optional): Cache de snapshots em disco.
+        processos (int): Processos usados pelo comparator (default=1).
+        memo (MemoCuras, optional): Memória persistente de curas.
+        executor (Executor, optional): Executor das etapas (default: executor padrão do event loop).
+        metricas (Metricas, optional): Acumulador de métricas; a coleta acompanha cada etapa no executor.
+
+    Returns:
+        Dict[str, Any]: Mesmo dicionário de `self_heal`.
+
+    Raises:
+        RuntimeError: Se ocorrer erro ao obter o DOM da página ou ler o JSON de seletores.
+    """
+    loop = asyncio.get_running_loop()
+
+    def executar(nome: str, funcao, *args):
+        # O executor não herda o contexto da tarefa: a cópia leva junto o acumulador de métricas
+        return loop.run_in_executor(executor, contextvars.copy_context().run, _medir, nome, funcao, *args)
+
+    with coletar(metricas) if metricas is not None else nullcontext():
+        execucao = await executar('ler_seletores', _ler_seletores, caminho_json, filtro)
+        await executar('extracao', _extrair_pagina, execucao, url, backend, pool, cache)
+        resultado = _resultado_inicial(execucao)
+        if not resultado["cache"]:
+            diferencas = await executar('comparacao', _comparar, execucao, resultado, processos, memo)
+            await executar('gravacao', _gravar_resultados, execucao, diferencas, url, cache)
+    return _registrar_metricas(resultado, metricas, url)
+
+async def self_heal_lote_async(
+    paginas: List[Dict[str, str]], concorrencia: int = 4, backend: str = 'selenium',
+    pool: Optional[PoolDrivers] = None, **opcoes
+) -> List[Any]:
+    """
+    Executa `self_heal_async` em várias páginas, com no máximo `concorrencia` páginas em andamento.
+
+    Com o backend Selenium e sem `pool`, um pool de `concorrencia` navegadores é criado e encerrado nesta chamada.
+
+    Args:
+        paginas (List[Dict[str, str]]): Páginas com 'json' e 'url' (ver `carregar_manifesto`).
+        concorrencia (int): Páginas em andamento ao mesmo tempo (default=4).
+        backend (str): Backend de extração do DOM: 'selenium' (default) ou 'lxml'.
+        pool (PoolDrivers, optional): Pool de drivers compartilhado.
+        **opcoes: Demais argumentos de `self_heal_async` (filtro, cache, processos, memo, executor).
+
+    Returns:
+        List[Any]: Para cada página, na ordem recebida, o resultado de `self_heal` ou a exceção levantada.
+
+    Raises:
+        ValueError: Se `concorrencia` for menor que 1.
+    """
+    if concorrencia < 1:
+        raise ValueError("concorrencia deve ser maior que zero.")
+    pool_proprio = pool is None and backend == 'selenium'
+    if pool_proprio:
+        pool = PoolDrivers(tamanho=concorrencia)
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def processar(pagina: Dict[str, str]) -> Dict[str, Any]:
+        async with semaforo:
+            return await self_heal_async(pagina['json'], pagina['url'], backend=backend, pool=pool, **opcoes)
+
+    try:
+        return await asyncio.gather(*(processar(pagina) for pagina in paginas), return_exceptions=True)
+    finally:
+        if pool_proprio:
+            pool.fechar()
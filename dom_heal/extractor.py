@@ -2,22 +2,44 @@
 Extractor
 =========
 
-Módulo responsável por extrair todos os elementos do DOM de uma página utilizando Selenium WebDriver.
+Módulo responsável por extrair todos os elementos do DOM de uma página utilizando Selenium WebDriver
+ou, para páginas renderizadas no servidor, diretamente do HTML estático com lxml.
 Retorna uma lista de dicionários contendo os principais atributos de cada elemento, prontos para uso no mecanismo de self-healing.
 
 Principais funcionalidades:
-- Navegação e carregamento headless do DOM
+- Navegação e carregamento headless do DOM, aguardando a estabilização do DOM e da rede (sem espera fixa)
 - Extração de todos os elementos do <body> com atributos importantes (id, class, name, text, type, aria-label, placeholder, xpath, data-*)
+- Extração em lote: um único script percorre o DOM no navegador e devolve os elementos em blocos, evitando uma chamada ao WebDriver por atributo
+- Backend 'lxml' sem navegador, que monta a mesma lista de elementos a partir do HTML estático
+- Snapshot único por execução: lista de elementos e HTML renderizado obtidos do mesmo carregamento da página
+- API em streaming (`iterar_dom`): elementos entregues em blocos, com extração em segundo plano sobreposta ao consumo
+- Pré-filtragem no navegador: opcionalmente, apenas elementos com atributos úteis ao comparator (ex: id/name/class/data-*) são transferidos
+- Resolução do ChromeDriver em cache (memória e disco), permitindo execução offline após a primeira instalação
 
 Ideal para rodar como backend para engines de self-healing.
 """
 
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
 import time
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple
+import requests
+from lxml import etree, html
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from dom_heal.metricas import contar, etapa
+from dom_heal.utils import diretorio_cache
+
+logger = logging.getLogger(__name__)
 
 JS_OBTER_XPATH = """
 function absoluteXPath(el){
@@ -46,10 +68,201 @@ for (var i = 0; i < attrs.length; i++) {
 return result;
 """
 
+JS_INSTALAR_QUIESCENCIA = """
+if (!window.__domHealQuiescencia) {
+    var estado = {
+        ultimaAtividade: performance.now(),
+        pendentes: 0,
+        recursos: performance.getEntriesByType('resource').length
+    };
+    var marcar = function(){ estado.ultimaAtividade = performance.now(); };
+    // Só mudanças de estrutura (e de identidade dos elementos) contam como atividade: animações e
+    // transições alteram style/class continuamente e a página nunca ficaria ociosa
+    new MutationObserver(marcar).observe(document, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['id', 'name']
+    });
+    if (window.fetch) {
+        var fetchOriginal = window.fetch;
+        window.fetch = function(){
+            estado.pendentes++; marcar();
+            return fetchOriginal.apply(this, arguments).finally(function(){ estado.pendentes--; marcar(); });
+        };
+    }
+    var enviarOriginal = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function(){
+        estado.pendentes++; marcar();
+        this.addEventListener('loadend', function(){ estado.pendentes--; marcar(); });
+        return enviarOriginal.apply(this, arguments);
+    };
+    window.__domHealQuiescencia = estado;
+}
+return true;
+"""
+
+JS_TEMPO_OCIOSO = """
+var estado = window.__domHealQuiescencia;
+if (!estado) return null;
+var recursos = performance.getEntriesByType('resource').length;
+if (recursos !== estado.recursos) {
+    estado.recursos = recursos;
+    estado.ultimaAtividade = performance.now();
+}
+if (estado.pendentes > 0) return 0;
+return performance.now() - estado.ultimaAtividade;
+"""
+
+JS_PREPARAR_LOTE = """
+var filtro = arguments[0] || null;
+var todos = document.querySelectorAll('body *');
+function relevante(el){
+    for (var i = 0; i < filtro.length; i++) {
+        if (filtro[i] === 'data-*') {
+            for (var j = 0; j < el.attributes.length; j++)
+                if (el.attributes[j].name.startsWith('data-')) return true;
+        } else if (el.getAttribute(filtro[i])) {
+            return true;
+        }
+    }
+    return false;
+}
+window.__domHealElementos = filtro
+    ? Array.prototype.filter.call(todos, relevante)
+    : Array.prototype.slice.call(todos);
+return window.__domHealElementos.length;
+"""
+
+JS_EXTRAIR_LOTE = """
+var elementos = window.__domHealElementos;
+if (!elementos) return null;
+var inicio = arguments[0], fim = Math.min(arguments[1], elementos.length);
+var cache = new Map();
+function absoluteXPath(el){
+    if (!el || el.nodeType != 1) return '';
+    if (cache.has(el)) return cache.get(el);
+    var i = 1, sib = el.previousSibling;
+    for (; sib; sib = sib.previousSibling)
+        if (sib.nodeType == 1 && sib.nodeName == el.nodeName) i++;
+    var xpath = absoluteXPath(el.parentNode) + '/' + el.nodeName.toLowerCase() + '[' + i + ']';
+    cache.set(el, xpath);
+    return xpath;
+}
+function atributo(el, nome){
+    return el.getAttribute(nome) || '';
+}
+var lote = [];
+for (var k = inicio; k < fim; k++) {
+    var el = elementos[k];
+    var texto = (el.innerText !== undefined ? el.innerText : el.textContent) || '';
+    var info = {
+        'tag': el.tagName.toLowerCase(),
+        'id': atributo(el, 'id'),
+        'class': atributo(el, 'class'),
+        'text': texto.trim(),
+        'name': atributo(el, 'name'),
+        'type': typeof el.type === 'string' ? el.type : atributo(el, 'type'),
+        'aria_label': atributo(el, 'aria-label'),
+        'placeholder': atributo(el, 'placeholder'),
+        'xpath': absoluteXPath(el)
+    };
+    var attrs = el.attributes;
+    for (var j = 0; j < attrs.length; j++) {
+        if (attrs[j].name.startsWith('data-')) {
+            info[attrs[j].name.replace(/-/g, '_')] = attrs[j].value || '';
+        }
+    }
+    lote.push(info);
+}
+return lote;
+"""
+
+JS_LIMPAR_LOTE = """
+delete window.__domHealElementos;
+"""
+
+VARIAVEL_CHROMEDRIVER = 'DOM_HEAL_CHROMEDRIVER'
+JANELA_ESTAVEL_PADRAO = 0.5
+ARQUIVO_CACHE_DRIVER = 'chromedriver.json'
+
+FILTRO_RELEVANTES = ('id', 'name', 'class', 'data-*')
+
+# Valores de `el.type` no navegador para as tags cujo tipo não é o atributo cru (demais: o próprio atributo)
+TIPOS_INPUT = frozenset({
+    'hidden', 'text', 'search', 'tel', 'url', 'email', 'password', 'date', 'month', 'week', 'time',
+    'datetime-local', 'number', 'range', 'color', 'checkbox', 'radio', 'file', 'submit', 'image', 'reset', 'button',
+})
+TIPOS_BUTTON = frozenset({'submit', 'reset', 'button'})
+TIPOS_FIXOS = {'textarea': 'textarea', 'fieldset': 'fieldset', 'output': 'output'}
+# Texto que o navegador não inclui em `innerText` (conteúdo de script, style e template dentro do elemento;
+# script e style, por não serem renderizados, devolvem o próprio conteúdo)
+TAGS_SEM_TEXTO = ('script', 'style')
+_TEXTO_VISIVEL = etree.XPath('.//text()[not(ancestor::script or ancestor::style or ancestor::template)]')
+
+BACKENDS = ('selenium', 'lxml')
+MODOS_EXTRACAO = ('lote', 'elemento')
+TAMANHO_LOTE_PADRAO = 500
+
+def _ler_cache_driver() -> str:
+    try:
+        caminho = json.loads((diretorio_cache() / ARQUIVO_CACHE_DRIVER).read_text(encoding='utf-8'))['caminho']
+    except (OSError, ValueError, KeyError, TypeError):
+        return ''
+    return caminho if caminho and os.path.isfile(caminho) else ''
+
+def _gravar_cache_driver(caminho: str) -> None:
+    try:
+        (diretorio_cache() / ARQUIVO_CACHE_DRIVER).write_text(json.dumps({'caminho': caminho}), encoding='utf-8')
+    except OSError:
+        pass
+
+@lru_cache(maxsize=1)
+def resolver_caminho_driver() -> str:
+    """
+    Resolve o caminho do ChromeDriver, consultando a rede apenas quando não houver cache.
+
+    Ordem de resolução:
+      1. Variável de ambiente `DOM_HEAL_CHROMEDRIVER`
+      2. Caminho gravado em cache no disco por uma execução anterior
+      3. `ChromeDriverManager().install()` (requer rede; o resultado é gravado em cache)
+      4. `chromedriver` disponível no PATH (fallback offline)
+
+    O resultado fica em memória durante o processo; use `invalidar_caminho_driver` para forçar nova resolução.
+
+    Returns:
+        str: Caminho do executável do ChromeDriver.
+
+    Raises:
+        RuntimeError: Se nenhum ChromeDriver puder ser encontrado.
+    """
+    caminho = os.environ.get(VARIAVEL_CHROMEDRIVER) or _ler_cache_driver()
+    if caminho:
+        return caminho
+    try:
+        caminho = ChromeDriverManager().install()
+    except Exception as e:
+        caminho = shutil.which('chromedriver')
+        if not caminho:
+            raise RuntimeError(f"Não foi possível resolver o ChromeDriver: {e}")
+        return caminho
+    _gravar_cache_driver(caminho)
+    return caminho
+
+def invalidar_caminho_driver() -> None:
+    """
+    Descarta o caminho do ChromeDriver em cache (memória e disco), forçando nova resolução.
+    """
+    resolver_caminho_driver.cache_clear()
+    try:
+        (diretorio_cache() / ARQUIVO_CACHE_DRIVER).unlink()
+    except OSError:
+        pass
+
 def criar_driver() -> webdriver.Chrome:
     """
     Configura e retorna uma instância headless do Chrome para extração de elementos.
 
+    Caso o ChromeDriver em cache não seja compatível com o Chrome instalado (ex: após
+    atualização do navegador), o cache é invalidado e a resolução é refeita uma vez.
+
     Returns:
         webdriver.Chrome: Instância configurada para execução headless.
     """
@@ -58,38 +271,143 @@ def criar_driver() -> webdriver.Chrome:
     opcoes.add_argument('--disable-gpu')
     opcoes.add_argument('--log-level=3')
     opcoes.add_experimental_option('excludeSwitches', ['enable-logging'])
-    servico = Service(ChromeDriverManager().install())
-    return webdriver.Chrome(service=servico, options=opcoes)
+    with etapa('criar_driver'):
+        try:
+            return webdriver.Chrome(service=Service(resolver_caminho_driver()), options=opcoes)
+        except SessionNotCreatedException:
+            if os.environ.get(VARIAVEL_CHROMEDRIVER):
+                raise
+            invalidar_caminho_driver()
+            return webdriver.Chrome(service=Service(resolver_caminho_driver()), options=opcoes)
+
+def aguardar_quiescencia(
+    driver: webdriver.Chrome, janela_estavel: float = JANELA_ESTAVEL_PADRAO, tempo_max: float = 10, intervalo: float = 0.1
+) -> bool:
+    """
+    Aguarda até que o DOM e a rede fiquem estáveis por `janela_estavel` segundos.
+
+    Instala na página um MutationObserver e um contador de requisições fetch/XHR pendentes
+    (além de acompanhar novas entradas de Resource Timing). O observer considera apenas elementos
+    inseridos/removidos e mudanças de id/name, ignorando a troca contínua de style/class de animações.
+    A espera termina assim que não houver mutações nem requisições durante a janela, ou ao atingir
+    `tempo_max` (registrado em log, pois a extração segue com a página ainda ativa).
+
+    Args:
+        driver: Instância do Chrome com a página carregada.
+        janela_estavel: Tempo sem atividade, em segundos, para considerar a página estável (default=0.5).
+        tempo_max: Tempo máximo de espera em segundos (default=10).
+        intervalo: Intervalo entre verificações em segundos (default=0.1).
+
+    Returns:
+        bool: True se a página estabilizou (ou o navegador não suporta a detecção), False se o tempo máximo foi atingido.
+    """
+    if not driver.execute_script(JS_INSTALAR_QUIESCENCIA):
+        return True
+    janela_ms = janela_estavel * 1000
 
-def carregar_pagina(driver: webdriver.Chrome, url: str, tempo_max: int = 10, wait_after_load: float = 1):
+    def estavel(drv):
+        ocioso = drv.execute_script(JS_TEMPO_OCIOSO)
+        return ocioso is None or ocioso >= janela_ms
+
+    try:
+        WebDriverWait(driver, tempo_max, poll_frequency=intervalo).until(estavel)
+        return True
+    except TimeoutException:
+        logger.warning(
+            "A página não ficou estável por %.1fs em %.1fs (DOM ou rede ainda ativos); extraindo mesmo assim.",
+            janela_estavel, tempo_max
+        )
+        return False
+
+def carregar_pagina(
+    driver: webdriver.Chrome, url: str, tempo_max: int = 10, wait_after_load: float = 0,
+    janela_estavel: float = JANELA_ESTAVEL_PADRAO
+):
     """
-    Carrega a página informada e aguarda o carregamento completo do DOM.
+    Carrega a página informada e aguarda o carregamento completo e a estabilização do DOM.
+
+    Após `document.readyState == 'complete'`, a página é rolada até o fim e a função aguarda
+    o DOM e a rede ficarem ociosos por `janela_estavel` segundos (ver `aguardar_quiescencia`).
+    Todo o processo respeita `tempo_max`: páginas rápidas retornam imediatamente e SPAs lentas
+    ganham o tempo necessário dentro desse limite.
 
     Args:
         driver: Instância do Chrome.
         url: URL da página a ser carregada.
         tempo_max: Tempo máximo de espera em segundos (default=10).
-        wait_after_load: Espera adicional após o carregamento (default=1s).
+        wait_after_load: Espera fixa adicional após a estabilização (default=0s).
+        janela_estavel: Tempo sem mutações nem requisições para considerar a página estável (default=0.5s).
+    """
+    with etapa('carregar_pagina'):
+        inicio = time.monotonic()
+        driver.get(url)
+        WebDriverWait(driver, tempo_max).until(
+            lambda drv: drv.execute_script("return document.readyState") == 'complete'
+        )
+        instalado = driver.execute_script(JS_INSTALAR_QUIESCENCIA)
+        driver.execute_script('window.scrollTo(0, document.body.scrollHeight)')
+        if instalado:
+            restante = max(0.0, tempo_max - (time.monotonic() - inicio))
+            aguardar_quiescencia(driver, janela_estavel, restante)
+        if wait_after_load > 0:
+            time.sleep(wait_after_load)
+
+def xpath_filtro(filtro: Optional[Sequence[str]] = None) -> str:
+    """
+    Monta o XPath de busca dos elementos de <body>, restrito aos que possuem os atributos do filtro.
+
+    Args:
+        filtro: Nomes de atributos exigidos (basta um deles preenchido); 'data-*' aceita qualquer atributo data-.
+            None significa sem filtro.
+
+    Returns:
+        str: Expressão XPath.
+
+    Example:
+        >>> xpath_filtro(['id', 'data-*'])
+        "//body//*[@id!='' or @*[starts-with(name(), 'data-')]]"
+    """
+    if filtro is None:
+        return "//body//*"
+    condicoes = [
+        "@*[starts-with(name(), 'data-')]" if nome == 'data-*' else f"@{nome}!=''"
+        for nome in filtro
+    ]
+    return f"//body//*[{' or '.join(condicoes) or 'false()'}]"
+
+def atributos_relevantes(atributos, filtro: Optional[Sequence[str]] = None) -> bool:
     """
-    driver.get(url)
-    WebDriverWait(driver, tempo_max).until(
-        lambda drv: drv.execute_script("return document.readyState") == 'complete'
-    )
-    driver.execute_script('window.scrollTo(0, document.body.scrollHeight)')
-    if wait_after_load > 0:
-        time.sleep(wait_after_load)
+    Indica se um elemento, pelos seus atributos, passa no filtro de relevância (mesma regra do script do navegador).
+
+    Args:
+        atributos: Mapeamento nome do atributo HTML → valor.
+        filtro: Nomes de atributos exigidos; None aceita qualquer elemento.
 
-def obter_elementos(driver: webdriver.Chrome) -> list:
+    Returns:
+        bool: True se o elemento deve ser extraído.
     """
-    Retorna todos os elementos WebElements presentes em <body>.
+    if filtro is None:
+        return True
+    for nome in filtro:
+        if nome == 'data-*':
+            if any(chave.startswith('data-') for chave in atributos):
+                return True
+        elif atributos.get(nome):
+            return True
+    return False
+
+def obter_elementos(driver: webdriver.Chrome, filtro: Optional[Sequence[str]] = None) -> list:
+    """
+    Retorna os elementos WebElements presentes em <body>.
 
     Args:
         driver: Instância do Chrome.
+        filtro: Atributos exigidos (ver `xpath_filtro`); a filtragem é feita pelo próprio navegador.
 
     Returns:
         list: Lista de WebElements.
     """
-    return driver.find_elements(By.XPATH, "//body//*")
+    return driver.find_elements(By.XPATH, xpath_filtro(filtro))
 
 def montar_info_elemento(driver: webdriver.Chrome, elemento) -> dict:
     """
@@ -102,20 +420,21 @@ def montar_info_elemento(driver: webdriver.Chrome, elemento) -> dict:
     Returns:
         dict: Dados do elemento (tag, id, class, text, name, type, aria_label, placeholder, xpath e data-*).
     """
-    info = {
-        'tag':        elemento.tag_name,
-        'id':         elemento.get_attribute('id') or '',
-        'class':      elemento.get_attribute('class') or '',
-        'text':       elemento.text.strip(),
-        'name':       elemento.get_attribute('name') or '',
-        'type':       elemento.get_attribute('type') or '',
-        'aria_label': elemento.get_attribute('aria-label') or '',
-        'placeholder': elemento.get_attribute('placeholder') or '',
-        'xpath':      driver.execute_script(JS_OBTER_XPATH, elemento),
-    }
-    dados = driver.execute_script(JS_OBTER_DATA_ATTRS, elemento)
-    info.update(dados)
-    return info
+    with etapa('montar_info_elemento'):
+        info = {
+            'tag':        elemento.tag_name,
+            'id':         elemento.get_attribute('id') or '',
+            'class':      elemento.get_attribute('class') or '',
+            'text':       elemento.text.strip(),
+            'name':       elemento.get_attribute('name') or '',
+            'type':       elemento.get_attribute('type') or '',
+            'aria_label': elemento.get_attribute('aria-label') or '',
+            'placeholder': elemento.get_attribute('placeholder') or '',
+            'xpath':      driver.execute_script(JS_OBTER_XPATH, elemento),
+        }
+        dados = driver.execute_script(JS_OBTER_DATA_ATTRS, elemento)
+        info.update(dados)
+        return info
 
 def obter_xpath(driver: webdriver.Chrome, elemento) -> str:
     """
@@ -130,27 +449,439 @@ def obter_xpath(driver: webdriver.Chrome, elemento) -> str:
     """
     return driver.execute_script(JS_OBTER_XPATH, elemento)
 
-def extrair_dom(url: str, driver=None) -> list:
+def iterar_elementos_em_lote(
+    driver: webdriver.Chrome, tamanho_lote: int = TAMANHO_LOTE_PADRAO, filtro: Optional[Sequence[str]] = None
+) -> Iterator[list]:
+    """
+    Percorre os elementos de <body> com um script injetado, entregando-os em blocos de `tamanho_lote`.
+
+    Cada bloco é obtido com uma única chamada `execute_script`, que devolve os mesmos
+    dicionários gerados por `montar_info_elemento`. A divisão em blocos mantém cada
+    resposta dentro dos limites de payload do WebDriver em páginas muito grandes.
+
+    Com `filtro`, o script descarta no próprio navegador os elementos sem nenhum dos atributos
+    informados (ex: `FILTRO_RELEVANTES`), e eles nunca são transferidos pelo WebDriver.
+
+    A lista de elementos fica guardada na página entre os blocos. Se ela se perde (ex: a página navegou
+    ou recarregou no meio da extração), a extração é interrompida com erro: preparar de novo misturaria
+    no mesmo snapshot blocos já entregues de uma página com elementos de outra.
+
+    Args:
+        driver: Instância do Chrome com a página já carregada.
+        tamanho_lote: Quantidade máxima de elementos por chamada (default=500).
+        filtro: Atributos exigidos (basta um preenchido; 'data-*' aceita qualquer data-). None não filtra.
+
+    Yields:
+        list: Bloco de dicionários com atributos relevantes de cada elemento.
+
+    Raises:
+        ValueError: Se `tamanho_lote` não for positivo.
+        RuntimeError: Se a lista de elementos preparada na página se perdeu antes do fim da extração.
+    """
+    if tamanho_lote <= 0:
+        raise ValueError("tamanho_lote deve ser maior que zero.")
+    total = driver.execute_script(JS_PREPARAR_LOTE, list(filtro) if filtro is not None else None) or 0
+    try:
+        for inicio in range(0, total, tamanho_lote):
+            lote = driver.execute_script(JS_EXTRAIR_LOTE, inicio, inicio + tamanho_lote)
+            if lote is None or len(lote) != min(tamanho_lote, total - inicio):
+                raise RuntimeError(
+                    f"A página mudou durante a extração em lote (elementos {inicio} de {total}): "
+                    "a lista preparada no navegador não existe mais (navegação ou recarga)."
+                )
+            yield lote
+    finally:
+        driver.execute_script(JS_LIMPAR_LOTE)
+
+def extrair_elementos_em_lote(
+    driver: webdriver.Chrome, tamanho_lote: int = TAMANHO_LOTE_PADRAO, filtro: Optional[Sequence[str]] = None
+) -> list:
+    """
+    Extrai todos os elementos de <body> com um script injetado por bloco (ver `iterar_elementos_em_lote`).
+
+    Args:
+        driver: Instância do Chrome com a página já carregada.
+        tamanho_lote: Quantidade máxima de elementos por chamada (default=500).
+        filtro: Atributos exigidos para um elemento ser extraído (None não filtra).
+
+    Returns:
+        list: Lista de dicionários com atributos relevantes de cada elemento.
+
+    Raises:
+        ValueError: Se `tamanho_lote` não for positivo.
+    """
+    return [info for lote in iterar_elementos_em_lote(driver, tamanho_lote, filtro) for info in lote]
+
+class _FalhaProdutor:
+    def __init__(self, erro: BaseException):
+        self.erro = erro
+
+_FIM_PRODUTOR = object()
+
+def em_segundo_plano(lotes: Iterable[list], tamanho_fila: int = 2) -> Iterator[list]:
+    """
+    Consome um iterável de blocos em uma thread produtora, entregando-os por uma fila limitada.
+
+    Permite que a extração do próximo bloco ocorra enquanto o bloco atual é processado
+    (ex: indexado pelo comparator). A fila limitada mantém no máximo `tamanho_fila` blocos
+    em memória; exceções do produtor são repassadas ao consumidor.
+
+    Args:
+        lotes: Iterável (geralmente um gerador) de blocos de elementos.
+        tamanho_fila: Quantidade máxima de blocos aguardando consumo (default=2).
+
+    Yields:
+        list: Blocos na mesma ordem produzida por `lotes`.
+    """
+    fila = queue.Queue(maxsize=tamanho_fila)
+    parar = threading.Event()
+
+    def colocar(item) -> bool:
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produzir():
+        try:
+            for lote in lotes:
+                if not colocar(lote):
+                    break
+            colocar(_FIM_PRODUTOR)
+        except BaseException as e:
+            colocar(_FalhaProdutor(e))
+        finally:
+            if hasattr(lotes, 'close'):
+                lotes.close()
+
+    produtor = threading.Thread(target=produzir, name='dom-heal-extracao', daemon=True)
+    produtor.start()
+    try:
+        while True:
+            item = fila.get()
+            if item is _FIM_PRODUTOR:
+                break
+            if isinstance(item, _FalhaProdutor):
+                raise item.erro
+            yield item
+    finally:
+        parar.set()
+        produtor.join()
+
+def _em_blocos(itens: Iterable[dict], tamanho_lote: int) -> Iterator[list]:
+    if tamanho_lote <= 0:
+        raise ValueError("tamanho_lote deve ser maior que zero.")
+    bloco = []
+    for item in itens:
+        bloco.append(item)
+        if len(bloco) >= tamanho_lote:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+def baixar_html(url: str, tempo_max: int = 10) -> str:
+    """
+    Baixa o HTML estático da URL informada, sem executar JavaScript.
+
+    Args:
+        url: URL da página.
+        tempo_max: Tempo máximo de espera da requisição em segundos (default=10).
+
+    Returns:
+        str: HTML da página.
+    """
+    with etapa('baixar_html'):
+        resposta = requests.get(url, timeout=tempo_max)
+        resposta.raise_for_status()
+        return resposta.text
+
+def tipo_elemento_html(tag: str, tipo: Optional[str], multiplo: bool = False) -> str:
+    """
+    Reproduz a propriedade `type` do navegador a partir da tag e do atributo `type` (usada pelo backend Selenium).
+
+    Args:
+        tag (str): Tag do elemento (minúsculas).
+        tipo (str, optional): Valor do atributo `type`.
+        multiplo (bool): Se o elemento tem o atributo `multiple` (relevante para <select>).
+
+    Returns:
+        str: 'text' para <input> sem tipo válido, 'submit' para <button> idem, 'select-one'/'select-multiple'
+            para <select>, o tipo fixo de textarea/fieldset/output; nas demais tags, o atributo cru.
+    """
+    normalizado = (tipo or '').strip().lower()
+    if tag == 'input':
+        return normalizado if normalizado in TIPOS_INPUT else 'text'
+    if tag == 'button':
+        return normalizado if normalizado in TIPOS_BUTTON else 'submit'
+    if tag == 'select':
+        return 'select-multiple' if multiplo else 'select-one'
+    if tag in TIPOS_FIXOS:
+        return TIPOS_FIXOS[tag]
+    return tipo or ''
+
+def montar_info_elemento_html(elemento, xpath: str) -> dict:
+    """
+    Extrai os principais atributos de um elemento lxml.
+
+    Os campos seguem o backend Selenium: 'type' com os valores padrão do navegador (ver `tipo_elemento_html`)
+    e 'text' sem o conteúdo de <script>, <style> e <template>.
+
+    Args:
+        elemento: Elemento lxml.
+        xpath: XPath absoluto já calculado para o elemento.
+
+    Returns:
+        dict: Dados do elemento (tag, id, class, text, name, type, aria_label, placeholder, xpath e data-*).
+    """
+    atributos = elemento.attrib
+    texto = elemento.text_content() if elemento.tag in TAGS_SEM_TEXTO else ''.join(_TEXTO_VISIVEL(elemento))
+    info = {
+        'tag':        elemento.tag,
+        'id':         atributos.get('id') or '',
+        'class':      atributos.get('class') or '',
+        'text':       texto.strip(),
+        'name':       atributos.get('name') or '',
+        'type':       tipo_elemento_html(elemento.tag, atributos.get('type'), 'multiple' in atributos),
+        'aria_label': atributos.get('aria-label') or '',
+        'placeholder': atributos.get('placeholder') or '',
+        'xpath':      xpath,
+    }
+    for nome, valor in atributos.items():
+        if nome.startswith('data-'):
+            info[nome.replace('-', '_')] = valor or ''
+    return info
+
+def iterar_elementos_html(fonte_html: str, filtro: Optional[Sequence[str]] = None) -> Iterator[dict]:
+    """
+    Percorre os elementos de <body> de um HTML, no mesmo formato de `montar_info_elemento`.
+
+    O XPath absoluto segue a mesma convenção do script `JS_OBTER_XPATH`
+    (ex: '/html[1]/body[1]/div[2]'), contando apenas irmãos com a mesma tag.
+
+    Args:
+        fonte_html: HTML da página.
+        filtro: Atributos exigidos para um elemento ser extraído (mesma regra do backend 'selenium').
+
+    Yields:
+        dict: Dados de cada elemento, em ordem de documento.
+    """
+    if not fonte_html or not fonte_html.strip():
+        return
+    raiz = html.document_fromstring(fonte_html)
+    corpo = raiz.find('body')
+    if corpo is None:
+        return
+
+    pilha = [(corpo, '/html[1]/body[1]')]
+    while pilha:
+        pai, xpath_pai = pilha.pop()
+        contagem = {}
+        filhos = []
+        for filho in pai.iterchildren(etree.Element):
+            contagem[filho.tag] = contagem.get(filho.tag, 0) + 1
+            filhos.append((filho, f"{xpath_pai}/{filho.tag}[{contagem[filho.tag]}]"))
+        # Empilha em ordem reversa para manter a ordem de documento (pré-ordem)
+        pilha.extend(reversed(filhos))
+        if pai is not corpo and atributos_relevantes(pai.attrib, filtro):
+            yield montar_info_elemento_html(pai, xpath_pai)
+
+def montar_elementos_html(fonte_html: str, filtro: Optional[Sequence[str]] = None) -> list:
+    """
+    Monta a lista de elementos de <body> a partir de um HTML (ver `iterar_elementos_html`).
+
+    Args:
+        fonte_html: HTML da página.
+        filtro: Atributos exigidos para um elemento ser extraído (None não filtra).
+
+    Returns:
+        list: Lista de dicionários com atributos relevantes de cada elemento, em ordem de documento.
+    """
+    return list(iterar_elementos_html(fonte_html, filtro))
+
+def extrair_dom_estatico(url: str, filtro: Optional[Sequence[str]] = None) -> list:
+    """
+    Extrai o DOM da URL sem navegador, a partir do HTML estático.
+
+    Args:
+        url (str): URL da página para extração.
+        filtro: Atributos exigidos para um elemento ser extraído (None não filtra).
+
+    Returns:
+        list: Lista de dicionários com atributos relevantes de cada elemento.
+    """
+    return montar_elementos_html(baixar_html(url), filtro)
+
+def _validar_modo(modo: str) -> None:
+    if modo not in MODOS_EXTRACAO:
+        raise ValueError(f"Modo de extração inválido: {modo}. Use um de {MODOS_EXTRACAO}.")
+
+def _validar_backend(backend: str) -> None:
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de extração inválido: {backend}. Use um de {BACKENDS}.")
+
+def extrair_elementos(
+    driver: webdriver.Chrome, modo: str = 'lote', tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+    filtro: Optional[Sequence[str]] = None
+) -> list:
+    """
+    Extrai os elementos de <body> de uma página já carregada no driver.
+
+    Args:
+        driver: Instância do Chrome com a página carregada.
+        modo (str): 'lote' (um script por bloco de elementos) ou 'elemento' (uma chamada por atributo).
+        tamanho_lote (int): Quantidade de elementos por bloco no modo 'lote'.
+        filtro: Atributos exigidos para um elemento ser extraído (None não filtra).
+
+    Returns:
+        list: Lista de dicionários com atributos relevantes de cada elemento.
+
+    Raises:
+        ValueError: Se o modo de extração for desconhecido.
+    """
+    _validar_modo(modo)
+    if modo == 'lote':
+        return extrair_elementos_em_lote(driver, tamanho_lote, filtro)
+    return [montar_info_elemento(driver, el) for el in obter_elementos(driver, filtro)]
+
+def extrair_dom(
+    url: str, driver=None, modo: str = 'lote', tamanho_lote: int = TAMANHO_LOTE_PADRAO, backend: str = 'selenium',
+    filtro: Optional[Sequence[str]] = None
+) -> list:
     """
     Extrai o DOM da URL informada e retorna uma lista de dicionários de elementos.
 
     Args:
         url (str): URL da página para extração.
         driver: Instância opcional do Chrome WebDriver.
+        modo (str): 'lote' (um script por bloco de elementos) ou 'elemento' (uma chamada por atributo).
+        tamanho_lote (int): Quantidade de elementos por bloco no modo 'lote'.
+        backend (str): 'selenium' (navegador headless) ou 'lxml' (HTML estático, sem navegador).
+        filtro (Sequence[str], optional): Atributos exigidos para um elemento ser extraído,
+            ex: `FILTRO_RELEVANTES`. None (default) extrai todos os elementos.
 
     Returns:
         list: Lista de dicionários com atributos relevantes de cada elemento.
+
+    Raises:
+        ValueError: Se o backend ou o modo de extração forem desconhecidos.
+    """
+    _validar_backend(backend)
+    if backend == 'lxml':
+        return extrair_dom_estatico(url, filtro)
+    _validar_modo(modo)
+    possui_driver = driver is not None
+    drv = driver or criar_driver()
+    try:
+        carregar_pagina(drv, url)
+        return extrair_elementos(drv, modo, tamanho_lote, filtro)
+    finally:
+        if not possui_driver:
+            drv.quit()
+
+def iterar_dom(
+    url: str, driver=None, tamanho_lote: int = TAMANHO_LOTE_PADRAO, backend: str = 'selenium',
+    filtro: Optional[Sequence[str]] = None
+) -> Iterator[list]:
+    """
+    Versão em streaming de `extrair_dom`: carrega a página e entrega os elementos em blocos.
+
+    No backend 'selenium' os blocos são extraídos em segundo plano (ver `em_segundo_plano`),
+    de modo que o consumidor processa um bloco enquanto o próximo é lido do navegador.
+
+    Args:
+        url (str): URL da página para extração.
+        driver: Instância opcional do Chrome WebDriver.
+        tamanho_lote (int): Quantidade de elementos por bloco.
+        backend (str): 'selenium' ou 'lxml'.
+        filtro (Sequence[str], optional): Atributos exigidos para um elemento ser extraído.
+
+    Yields:
+        list: Blocos de dicionários com atributos relevantes de cada elemento.
+
+    Raises:
+        ValueError: Se o backend for desconhecido.
+    """
+    _validar_backend(backend)
+    if backend == 'lxml':
+        yield from _em_blocos(iterar_elementos_html(baixar_html(url), filtro), tamanho_lote)
+        return
+    possui_driver = driver is not None
+    drv = driver or criar_driver()
+    try:
+        carregar_pagina(drv, url)
+        yield from em_segundo_plano(iterar_elementos_em_lote(drv, tamanho_lote, filtro))
+    finally:
+        if not possui_driver:
+            drv.quit()
+
+def extrair_snapshot(
+    url: str, driver=None, modo: str = 'lote', tamanho_lote: int = TAMANHO_LOTE_PADRAO, backend: str = 'selenium',
+    destino=None, filtro: Optional[Sequence[str]] = None, reutilizar: Optional[Callable[[str], object]] = None
+) -> Tuple[list, str]:
+    """
+    Carrega a página uma única vez e retorna a lista de elementos junto com o HTML do mesmo carregamento.
+
+    No backend 'selenium' o HTML é o `page_source` renderizado (pós-JavaScript) da mesma sessão
+    usada na extração; no backend 'lxml' é o próprio HTML estático de onde os elementos foram montados.
+    Assim a lista de elementos e o healing de XPath enxergam exatamente o mesmo DOM.
+
+    Quando `destino` é informado (qualquer objeto com `extend`, como `IndiceDom`), os elementos
+    são entregues a ele bloco a bloco à medida que são extraídos, sem montar uma lista intermediária.
+
+    Args:
+        url (str): URL da página para extração.
+        driver: Instância opcional do Chrome WebDriver.
+        modo (str): 'lote' ou 'elemento' (apenas para o backend 'selenium').
+        tamanho_lote (int): Quantidade de elementos por bloco no modo 'lote'.
+        backend (str): 'selenium' ou 'lxml'.
+        destino (optional): Coletor dos elementos; por padrão, uma nova lista.
+        filtro (Sequence[str], optional): Atributos exigidos para um elemento ser extraído;
+            o HTML retornado é sempre o da página inteira.
+        reutilizar (Callable, optional): Função chamada com o HTML logo após o carregamento; se
+            retornar algo diferente de None (ex: elementos de um snapshot em cache), esse valor é
+            devolvido no lugar dos elementos e a extração é pulada.
+
+    Returns:
+        Tuple[list, str]: Coletor com os elementos (`destino` ou lista) e HTML da página.
+
+    Raises:
+        ValueError: Se o backend ou o modo de extração forem desconhecidos.
     """
+    _validar_backend(backend)
+    destino = [] if destino is None else destino
+    if backend == 'lxml':
+        fonte_html = baixar_html(url)
+        reaproveitado = reutilizar(fonte_html) if reutilizar else None
+        if reaproveitado is not None:
+            return reaproveitado, fonte_html
+        with etapa('extrair_elementos'):
+            for lote in _em_blocos(iterar_elementos_html(fonte_html, filtro), tamanho_lote):
+                destino.extend(lote)
+                contar('elementos_extraidos', len(lote))
+        return destino, fonte_html
+    _validar_modo(modo)
     possui_driver = driver is not None
     drv = driver or criar_driver()
     try:
         carregar_pagina(drv, url)
-        elementos = obter_elementos(drv)
-        info_list = []
-        for el in elementos:
-            info = montar_info_elemento(drv, el)
-            info_list.append(info)
-        return info_list
+        fonte_html = drv.page_source
+        reaproveitado = reutilizar(fonte_html) if reutilizar else None
+        if reaproveitado is not None:
+            return reaproveitado, fonte_html
+        with etapa('extrair_elementos'):
+            if modo == 'lote':
+                for lote in em_segundo_plano(iterar_elementos_em_lote(drv, tamanho_lote, filtro)):
+                    destino.extend(lote)
+                    contar('elementos_extraidos', len(lote))
+            else:
+                elementos = extrair_elementos(drv, modo, filtro=filtro)
+                destino.extend(elementos)
+                contar('elementos_extraidos', len(elementos))
+        return destino, fonte_html
     finally:
         if not possui_driver:
             drv.quit()
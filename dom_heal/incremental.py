@@ -0,0 +1,128 @@
+"""
+Incremental
+===========
+
+Módulo responsável por comparar os elementos extraídos na execução anterior com os da execução atual
+e separar os seletores que precisam passar novamente pelo comparator dos que podem ser mantidos.
+
+Principais funcionalidades:
+- Diff estrutural entre snapshots (elementos adicionados, removidos e alterados), usando o XPath absoluto como chave
+- Localização, no snapshot anterior, do único elemento resolvido por cada seletor id/name/class
+- Preservação dos seletores cujo elemento não mudou e que não ganharam elementos concorrentes na página,
+  fazendo o custo da execução acompanhar o tamanho da mudança, e não o tamanho da página
+- Reserva dos elementos dos seletores preservados, para que a comparação dos demais tenha o mesmo resultado
+  de uma execução completa
+
+Ideal para execuções periódicas (ex: noturnas) com cache de snapshots, em páginas que mudam pouco entre execuções.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dom_heal.comparator import classes_do_selector, detectar_tipo_selector, extrair_valor_selector
+from dom_heal.indice import IndiceDom, indexar
+
+def diff_snapshots(anteriores: Iterable[dict], atuais: Iterable[dict]) -> Optional[Dict[str, list]]:
+    """
+    Calcula o diff estrutural entre dois snapshots de elementos, usando o XPath absoluto de cada elemento como chave.
+
+    Args:
+        anteriores (Iterable[dict]): Elementos da execução anterior.
+        atuais (Iterable[dict]): Elementos da execução atual.
+
+    Returns:
+        Optional[Dict[str, list]]: 'adicionados' e 'removidos' (elementos) e 'alterados' (pares antigo/novo,
+            com o mesmo XPath e algum atributo diferente), em ordem de documento; None se algum elemento
+            não tem XPath (sem chave não é possível comparar os snapshots).
+    """
+    por_xpath = {}
+    for elem in anteriores:
+        if not elem.get('xpath'):
+            return None
+        por_xpath[elem['xpath']] = elem
+    adicionados, alterados = [], []
+    for elem in atuais:
+        xpath = elem.get('xpath')
+        if not xpath:
+            return None
+        antigo = por_xpath.pop(xpath, None)
+        if antigo is None:
+            adicionados.append(elem)
+        elif dict(antigo) != dict(elem):
+            alterados.append((antigo, elem))
+    return {'adicionados': adicionados, 'removidos': list(por_xpath.values()), 'alterados': alterados}
+
+def _posicoes(selector: str, indice: IndiceDom) -> List[int]:
+    """
+    Posições dos elementos do índice encontrados por um seletor id/name/class (vazia para XPath).
+    """
+    tipo = detectar_tipo_selector(selector)
+    if tipo == 'class':
+        listas = [indice.exatos['class'].get(classe, []) for classe in classes_do_selector(selector)]
+        if not listas or not all(listas):
+            return []
+        comuns = set(listas[0]).intersection(*listas[1:])
+        return [idx for idx in listas[0] if idx in comuns]
+    if tipo in ('id', 'name'):
+        return indice.exatos[tipo].get(extrair_valor_selector(selector, tipo), [])
+    return []
+
+def separar_seletores(
+    seletores: List[dict], anteriores: Iterable[dict], atuais: Iterable[dict]
+) -> Tuple[List[dict], List[dict], Optional[Dict[str, list]]]:
+    """
+    Separa os seletores afetados pela mudança da página dos que continuam resolvendo o mesmo elemento.
+
+    Um seletor é preservado quando, no snapshot anterior, resolvia exatamente um elemento, esse elemento
+    não foi alterado nem removido e nenhum elemento adicionado ou alterado também é encontrado pelo seletor.
+    Nesse caso ele continua resolvendo exatamente o mesmo elemento no snapshot atual. Os demais (inclusive
+    XPaths e seletores que já estavam quebrados ou ambíguos) devem passar pelo comparator.
+
+    Args:
+        seletores (List[dict]): Seletores normalizados ('nome' e 'selector').
+        anteriores (Iterable[dict]): Elementos da execução anterior.
+        atuais (Iterable[dict]): Elementos da execução atual (lista ou `IndiceDom`).
+
+    Returns:
+        Tuple[List[dict], List[dict], Optional[Dict[str, list]]]: Seletores a curar, seletores preservados
+            e o diff calculado (None se os snapshots não puderam ser comparados; nesse caso todos são curados).
+    """
+    anteriores = list(anteriores)
+    diff = diff_snapshots(anteriores, atuais)
+    if diff is None:
+        return list(seletores), [], None
+    indice_anterior = indexar(anteriores)
+    tocados = {elem['xpath'] for elem in diff['removidos']}
+    tocados.update(antigo['xpath'] for antigo, _ in diff['alterados'])
+    indice_novos = IndiceDom(diff['adicionados'] + [novo for _, novo in diff['alterados']])
+
+    a_curar, preservados = [], []
+    for elem_qa in seletores:
+        selector = elem_qa.get('selector')
+        posicoes = _posicoes(selector, indice_anterior) if selector else []
+        if (
+            len(posicoes) == 1
+            and indice_anterior.elementos[posicoes[0]].get('xpath') not in tocados
+            and not _posicoes(selector, indice_novos)
+        ):
+            preservados.append(elem_qa)
+        else:
+            a_curar.append(elem_qa)
+    return a_curar, preservados, diff
+
+def elementos_preservados(preservados: List[dict], atuais) -> Set[int]:
+    """
+    Posições, no snapshot atual, dos elementos resolvidos pelos seletores preservados.
+
+    Devem ser reservadas na comparação dos demais seletores (`gerar_diferencas(..., reservados=...)`),
+    para que nenhum seletor quebrado seja curado para um elemento que continua em uso, como em uma
+    execução completa.
+
+    Args:
+        preservados (List[dict]): Seletores preservados por `separar_seletores`.
+        atuais (Iterable[dict] | IndiceDom): Elementos da execução atual.
+
+    Returns:
+        Set[int]: Posições dos elementos no índice da execução atual.
+    """
+    indice = indexar(atuais)
+    return {idx for elem_qa in preservados for idx in _posicoes(elem_qa['selector'], indice)}
@@ -0,0 +1,261 @@
+"""
+Indice
+======
+
+Módulo responsável por indexar os elementos do novo DOM para o comparator.
+
+O índice é construído de forma incremental (bloco a bloco, via `extend`), podendo ser
+alimentado diretamente pela extração em streaming enquanto ela ainda está em andamento.
+
+Principais funcionalidades:
+- Registro de cada elemento com a mesma posição (idx) que ele teria na lista completa do DOM
+- Listas de candidatos por campo (id, name, class), contendo apenas elementos com valor preenchido
+- Índice invertido de valores exatos (id, name e cada token de class), para resolver seletores intactos em O(1)
+- Descarte dos elementos sem nenhum atributo utilizável, limitando a memória em páginas grandes
+- Representação compacta dos elementos (`ElementoDom`, com `__slots__`), compatível com a leitura como dicionário
+
+Ideal para ser passado ao `gerar_diferencas`/`fuzzy_matching_selector` no lugar da lista de elementos.
+"""
+
+import hashlib
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+CAMPOS_INDEXADOS = ('id', 'name', 'class')
+CAMPOS_ELEMENTO = ('tag', 'id', 'class', 'text', 'name', 'type', 'aria_label', 'placeholder', 'xpath')
+CAMPOS_INTERNADOS = frozenset(('tag', 'class', 'type'))
+
+_SLOTS = {campo: ('class_' if campo == 'class' else campo) for campo in CAMPOS_ELEMENTO}
+_AUSENTE = object()
+
+def _internar(valor):
+    return sys.intern(valor) if type(valor) is str else valor
+
+class ElementoDom(Mapping):
+    """
+    Registro compacto de um elemento extraído, com `__slots__` no lugar de um dicionário.
+
+    Os campos fixos (tag, id, class, text, name, type, aria_label, placeholder, xpath) ficam em
+    slots; tag, class e type são internados (strings repetidas compartilham a mesma instância)
+    e os atributos `data_*` ficam em uma tabela à parte, criada apenas quando existem.
+
+    A classe implementa `Mapping`, então `elem['id']`, `elem.get('class', '')`, `in`, iteração
+    e comparação com dicionários funcionam como antes. Campos ausentes no dicionário de origem
+    continuam ausentes na visão.
+
+    Example:
+        >>> elem = ElementoDom.de_dict({'tag': 'input', 'id': 'email', 'data_test': 'x'})
+        >>> elem.get('id'), elem['data_test'], elem.get('name', '')
+        ('email', 'x', '')
+    """
+
+    __slots__ = tuple(_SLOTS.values()) + ('dados',)
+
+    def __init__(self, **campos):
+        for campo, slot in _SLOTS.items():
+            valor = campos.pop(campo, _AUSENTE)
+            setattr(self, slot, _internar(valor) if campo in CAMPOS_INTERNADOS else valor)
+        self.dados = {sys.intern(chave): valor for chave, valor in campos.items()} or None
+
+    @classmethod
+    def de_dict(cls, elem: Mapping) -> 'ElementoDom':
+        """
+        Converte um dicionário de elemento (formato do extractor) em registro compacto.
+
+        Args:
+            elem (Mapping): Dicionário do elemento; um `ElementoDom` é devolvido sem cópia.
+
+        Returns:
+            ElementoDom: Registro compacto equivalente.
+        """
+        if isinstance(elem, ElementoDom):
+            return elem
+        return cls(**elem)
+
+    def get(self, chave, padrao=None):
+        slot = _SLOTS.get(chave)
+        if slot is not None:
+            valor = getattr(self, slot)
+            return padrao if valor is _AUSENTE else valor
+        if self.dados is None:
+            return padrao
+        return self.dados.get(chave, padrao)
+
+    def __getitem__(self, chave):
+        valor = self.get(chave, _AUSENTE)
+        if valor is _AUSENTE:
+            raise KeyError(chave)
+        return valor
+
+    def __iter__(self):
+        for campo, slot in _SLOTS.items():
+            if getattr(self, slot) is not _AUSENTE:
+                yield campo
+        if self.dados is not None:
+            yield from self.dados
+
+    def __len__(self) -> int:
+        fixos = sum(1 for slot in _SLOTS.values() if getattr(self, slot) is not _AUSENTE)
+        return fixos + (len(self.dados) if self.dados is not None else 0)
+
+    def __repr__(self) -> str:
+        return f"ElementoDom({dict(self)!r})"
+
+    def __reduce__(self):
+        # Campos ausentes usam um sentinela local ao processo: serializa pela visão de dicionário
+        return (ElementoDom.de_dict, (dict(self),))
+
+    def para_dict(self) -> dict:
+        """
+        Retorna uma cópia do elemento como dicionário comum (ex: para serialização em JSON).
+        """
+        return dict(self)
+
+def compactar_elementos(elementos: Iterable[Mapping]) -> List[ElementoDom]:
+    """
+    Converte uma lista de dicionários de elementos em registros compactos.
+
+    Args:
+        elementos (Iterable[Mapping]): Elementos no formato do extractor.
+
+    Returns:
+        List[ElementoDom]: Elementos compactos, na mesma ordem.
+    """
+    return [ElementoDom.de_dict(elem) for elem in elementos if isinstance(elem, Mapping)]
+
+class IndiceDom:
+    """
+    Índice incremental dos elementos do novo DOM.
+
+    Args:
+        elementos (Iterable[dict], optional): Elementos iniciais a indexar.
+        compacto (bool): Se True (default), os elementos mantidos são guardados como `ElementoDom`.
+
+    Attributes:
+        total (int): Quantidade de elementos recebidos (inclusive os descartados).
+        elementos (Dict[int, dict]): Elementos mantidos, por posição.
+        candidatos (Dict[str, List[Tuple[int, str]]]): Para cada campo, pares (posição, valor) em ordem de documento.
+        exatos (Dict[str, Dict[str, List[int]]]): Para cada campo, posições de cada valor exato
+            (para class, de cada token), em ordem de documento.
+    """
+
+    def __init__(self, elementos: Iterable[dict] = None, compacto: bool = True):
+        self.compacto = compacto
+        self.total = 0
+        self.elementos: Dict[int, dict] = {}
+        self.candidatos: Dict[str, List[Tuple[int, str]]] = {campo: [] for campo in CAMPOS_INDEXADOS}
+        self.exatos: Dict[str, Dict[str, List[int]]] = {campo: {} for campo in CAMPOS_INDEXADOS}
+        self._impressoes: Dict[str, str] = {}
+        if elementos is not None:
+            self.extend(elementos)
+
+    def extend(self, lote: Iterable[dict]) -> None:
+        """
+        Indexa um bloco de elementos, preservando a ordem de documento.
+
+        Itens que não são dicionários (ou `ElementoDom`) são ignorados sem ocupar posição.
+
+        Args:
+            lote (Iterable[dict]): Bloco de elementos extraídos.
+        """
+        self._impressoes.clear()
+        for elem in lote:
+            if not isinstance(elem, Mapping):
+                continue
+            idx = self.total
+            self.total += 1
+            relevante = False
+            for campo in CAMPOS_INDEXADOS:
+                valor = elem.get(campo)
+                if valor:
+                    self.candidatos[campo].append((idx, valor))
+                    exatos = self.exatos[campo]
+                    chaves = valor.split() if campo == 'class' else (valor,)
+                    for chave in chaves:
+                        posicoes = exatos.setdefault(chave, [])
+                        # Tokens repetidos no mesmo elemento não duplicam a posição
+                        if not posicoes or posicoes[-1] != idx:
+                            posicoes.append(idx)
+                    relevante = True
+            if relevante:
+                self.elementos[idx] = ElementoDom.de_dict(elem) if self.compacto else elem
+
+    def buscar_exato(self, campo: str, valores: Iterable[str], ignorar=None) -> Optional[int]:
+        """
+        Retorna a primeira posição (em ordem de documento) cujo elemento contém exatamente os valores informados.
+
+        Para 'id' e 'name' informe um único valor; para 'class', o elemento deve conter todos os tokens.
+
+        Args:
+            campo (str): Campo indexado ('id', 'name' ou 'class').
+            valores (Iterable[str]): Valores (ou tokens de classe) procurados.
+            ignorar (set, optional): Posições que não podem ser retornadas (ex: elementos já usados).
+
+        Returns:
+            Optional[int]: Posição encontrada ou None.
+        """
+        exatos = self.exatos.get(campo, {})
+        listas = []
+        for valor in set(valores):
+            posicoes = exatos.get(valor)
+            if not posicoes:
+                return None
+            listas.append(posicoes)
+        if not listas:
+            return None
+        listas.sort(key=len)
+        comuns = set(listas[1]).intersection(*listas[2:]) if len(listas) > 1 else None
+        for idx in listas[0]:
+            if (comuns is None or idx in comuns) and not (ignorar and idx in ignorar):
+                return idx
+        return None
+
+    def impressao(self, campo: str) -> str:
+        """
+        Retorna (calculando na primeira chamada) a impressão digital dos valores de um campo.
+
+        Dois índices com a mesma impressão têm os mesmos candidatos do campo, na mesma ordem (para 'class',
+        também com as mesmas tags), e portanto produzem os mesmos rankings de matching.
+
+        Args:
+            campo (str): Campo indexado ('id', 'name' ou 'class').
+
+        Returns:
+            str: Hash SHA-256 (hexadecimal) da sequência de valores.
+        """
+        if campo not in self._impressoes:
+            resumo = hashlib.sha256()
+            for idx, valor in self.candidatos[campo]:
+                if campo == 'class':
+                    resumo.update(f"{self.elementos[idx].get('tag')}\x1e".encode('utf-8'))
+                resumo.update(f"{valor}\x1f".encode('utf-8'))
+            self._impressoes[campo] = resumo.hexdigest()
+        return self._impressoes[campo]
+
+    def __len__(self) -> int:
+        # Posições indexadas (todos os elementos recebidos), inclusive as sem id, name ou class
+        return self.total
+
+    def __iter__(self) -> Iterator[dict]:
+        # Apenas os elementos mantidos (com id, name ou class): pode render menos itens que `len`
+        return iter(self.elementos.values())
+
+def indexar(dom_novo) -> IndiceDom:
+    """
+    Garante um `IndiceDom` a partir de uma lista de elementos, de um índice ou de um iterável de blocos.
+
+    Args:
+        dom_novo: `IndiceDom`, lista/tupla de elementos ou iterável (ex: gerador) de blocos de elementos.
+
+    Returns:
+        IndiceDom: Índice correspondente.
+    """
+    if isinstance(dom_novo, IndiceDom):
+        return dom_novo
+    if isinstance(dom_novo, (list, tuple)):
+        return IndiceDom(dom_novo)
+    indice = IndiceDom()
+    for lote in dom_novo:
+        indice.extend(lote)
+    return indice
@@ -0,0 +1,201 @@
+"""
+Metricas
+========
+
+Módulo responsável por medir o tempo de cada etapa do self-healing e contar o volume de trabalho
+(elementos extraídos, seletores verificados, candidatos pontuados, XPaths validados).
+
+A coleta é ativada por contexto (`coletar`): fora dele, `etapa` e `contar` não fazem nada além de
+uma consulta a uma `ContextVar`, então a instrumentação pode ficar permanentemente no código.
+
+Principais funcionalidades:
+- Tempo total e quantidade de chamadas por etapa (criar_driver, carregar_pagina, comparação etc.)
+- Contadores de volume de trabalho
+- Coleta isolada por contexto (threads e tarefas asyncio não misturam as métricas de páginas diferentes)
+- Exportação em JSON ou no formato texto do Prometheus (para o textfile collector do node_exporter)
+
+Ideal para investigar execuções lentas e acompanhar a evolução do desempenho em execuções periódicas.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+_METRICAS_ATIVAS: ContextVar = ContextVar('dom_heal_metricas', default=None)
+_SEM_COLETA = nullcontext()
+
+class Metricas:
+    """
+    Acumulador thread-safe de tempos por etapa e contadores de uma ou mais execuções.
+
+    Example:
+        >>> with coletar() as metricas:
+        ...     self_heal(caminho, url)
+        >>> metricas.para_dict()['tempos']['comparacao']['segundos']
+    """
+
+    def __init__(self):
+        self.tempos: Dict[str, float] = {}
+        self.chamadas: Dict[str, int] = {}
+        self.contadores: Dict[str, int] = {}
+        self._trava = threading.Lock()
+
+    @contextmanager
+    def etapa(self, nome: str):
+        """
+        Context manager que soma ao total da etapa o tempo decorrido (mesmo se houver exceção).
+
+        Args:
+            nome (str): Nome da etapa.
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tempo(nome, time.perf_counter() - inicio)
+
+    def registrar_tempo(self, nome: str, segundos: float) -> None:
+        """
+        Soma uma duração ao total da etapa e incrementa a quantidade de chamadas.
+
+        Args:
+            nome (str): Nome da etapa.
+            segundos (float): Duração medida.
+        """
+        with self._trava:
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + segundos
+            self.chamadas[nome] = self.chamadas.get(nome, 0) + 1
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        """
+        Incrementa um contador.
+
+        Args:
+            nome (str): Nome do contador.
+            quantidade (int): Valor a somar (default=1).
+        """
+        with self._trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def para_dict(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas como dicionário serializável.
+
+        Returns:
+            Dict[str, Any]: 'tempos' (por etapa, 'segundos' e 'chamadas') e 'contadores'.
+        """
+        with self._trava:
+            return {
+                'tempos': {
+                    nome: {'segundos': segundos, 'chamadas': self.chamadas[nome]}
+                    for nome, segundos in self.tempos.items()
+                },
+                'contadores': dict(self.contadores),
+            }
+
+    def para_json(self) -> str:
+        """
+        Retorna as métricas em JSON (mesmo conteúdo de `para_dict`).
+        """
+        return json.dumps(self.para_dict(), ensure_ascii=False, indent=2)
+
+    def para_prometheus(self, prefixo: str = 'dom_heal') -> str:
+        """
+        Retorna as métricas no formato texto de exposição do Prometheus.
+
+        Args:
+            prefixo (str): Prefixo dos nomes das métricas (default='dom_heal').
+
+        Returns:
+            str: Texto com as séries `<prefixo>_etapa_segundos_total{etapa="..."}`,
+                `<prefixo>_etapa_chamadas_total{etapa="..."}` e `<prefixo>_<contador>_total`.
+        """
+        dados = self.para_dict()
+        linhas = [
+            f"# HELP {prefixo}_etapa_segundos_total Tempo acumulado por etapa do self-healing.",
+            f"# TYPE {prefixo}_etapa_segundos_total counter",
+        ]
+        linhas += [
+            f'{prefixo}_etapa_segundos_total{{etapa="{nome}"}} {tempo["segundos"]:.6f}'
+            for nome, tempo in sorted(dados['tempos'].items())
+        ]
+        linhas += [
+            f"# HELP {prefixo}_etapa_chamadas_total Quantidade de execuções por etapa do self-healing.",
+            f"# TYPE {prefixo}_etapa_chamadas_total counter",
+        ]
+        linhas += [
+            f'{prefixo}_etapa_chamadas_total{{etapa="{nome}"}} {tempo["chamadas"]}'
+            for nome, tempo in sorted(dados['tempos'].items())
+        ]
+        for nome, valor in sorted(dados['contadores'].items()):
+            linhas += [f"# TYPE {prefixo}_{nome}_total counter", f"{prefixo}_{nome}_total {valor}"]
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho: Union[str, Path]) -> None:
+        """
+        Grava as métricas em disco de forma atômica: formato Prometheus para arquivos `.prom`, JSON nos demais.
+
+        Args:
+            caminho (str | Path): Arquivo de destino.
+        """
+        caminho = Path(caminho)
+        conteudo = self.para_prometheus() if caminho.suffix == '.prom' else self.para_json()
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporario.write_text(conteudo, encoding='utf-8')
+        os.replace(temporario, caminho)
+
+@contextmanager
+def coletar(metricas: Optional[Metricas] = None):
+    """
+    Ativa a coleta de métricas no contexto atual (thread ou tarefa asyncio) até o fim do bloco.
+
+    Args:
+        metricas (Metricas, optional): Acumulador a usar (ex: compartilhado entre várias páginas);
+            por padrão, um novo.
+
+    Yields:
+        Metricas: Acumulador ativo.
+    """
+    metricas = metricas if metricas is not None else Metricas()
+    token = _METRICAS_ATIVAS.set(metricas)
+    try:
+        yield metricas
+    finally:
+        _METRICAS_ATIVAS.reset(token)
+
+def metricas_ativas() -> Optional[Metricas]:
+    """
+    Retorna o acumulador ativo no contexto atual, ou None se a coleta está desligada.
+    """
+    return _METRICAS_ATIVAS.get()
+
+def etapa(nome: str):
+    """
+    Mede o tempo de um bloco na etapa `nome` do acumulador ativo; sem coleta ativa, não faz nada.
+
+    Args:
+        nome (str): Nome da etapa.
+
+    Returns:
+        ContextManager: Context manager de medição.
+    """
+    metricas = _METRICAS_ATIVAS.get()
+    return _SEM_COLETA if metricas is None else metricas.etapa(nome)
+
+def contar(nome: str, quantidade: int = 1) -> None:
+    """
+    Incrementa um contador do acumulador ativo; sem coleta ativa, não faz nada.
+
+    Args:
+        nome (str): Nome do contador.
+        quantidade (int): Valor a somar (default=1).
+    """
+    metricas = _METRICAS_ATIVAS.get()
+    if metricas is not None:
+        metricas.contar(nome, quantidade)
@@ -0,0 +1,231 @@
+"""
+Pool
+====
+
+Módulo responsável por manter um pool de instâncias do Chrome WebDriver já iniciadas,
+reutilizadas entre execuções de self-healing para evitar o custo de abrir um navegador a cada página.
+
+Principais funcionalidades:
+- Empréstimo e devolução de drivers com tamanho máximo configurável
+- Encerramento automático de drivers ociosos além do tempo limite (por um temporizador em segundo plano,
+  mesmo que o pool não seja mais usado)
+- Verificação de saúde antes de cada empréstimo (drivers quebrados são descartados)
+- Limpeza de estado a cada uso (cookies, localStorage e sessionStorage)
+
+Ideal para o engine e para modos em lote que processam várias páginas no mesmo processo.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from dom_heal.extractor import criar_driver
+
+JS_VERIFICAR_SAUDE = "return 1;"
+
+JS_LIMPAR_ARMAZENAMENTO = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+def driver_saudavel(driver) -> bool:
+    """
+    Verifica se o driver ainda responde a comandos.
+
+    Args:
+        driver: Instância do WebDriver.
+
+    Returns:
+        bool: True se o driver respondeu corretamente, False caso contrário.
+    """
+    try:
+        return driver.execute_script(JS_VERIFICAR_SAUDE) == 1
+    except Exception:
+        return False
+
+def limpar_estado(driver) -> None:
+    """
+    Remove cookies e armazenamento local/sessão do driver e volta para uma página em branco.
+
+    Args:
+        driver: Instância do WebDriver.
+    """
+    try:
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except Exception:
+        driver.delete_all_cookies()
+    driver.execute_script(JS_LIMPAR_ARMAZENAMENTO)
+    driver.get('about:blank')
+
+def _encerrar(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+class PoolDrivers:
+    """
+    Pool thread-safe de drivers do Chrome prontos para uso.
+
+    Args:
+        tamanho (int): Quantidade máxima de drivers abertos ao mesmo tempo (default=2).
+        tempo_ocioso (float): Segundos que um driver pode ficar parado antes de ser encerrado (default=300).
+            Um temporizador daemon encerra os ociosos expirados mesmo sem novos empréstimos.
+        fabrica (Callable, optional): Função que cria um novo driver (default=`criar_driver`).
+
+    Example:
+        >>> with PoolDrivers(tamanho=2) as pool:
+        ...     with pool.emprestar() as driver:
+        ...         extrair_snapshot(url, driver=driver)
+    """
+
+    def __init__(self, tamanho: int = 2, tempo_ocioso: float = 300.0, fabrica: Optional[Callable] = None):
+        if tamanho <= 0:
+            raise ValueError("tamanho do pool deve ser maior que zero.")
+        self.tamanho = tamanho
+        self.tempo_ocioso = tempo_ocioso
+        self.fabrica = fabrica or criar_driver
+        self._ociosos: List[Tuple[object, float]] = []
+        self._em_uso = 0
+        self._fechado = False
+        self._condicao = threading.Condition()
+        self._temporizador: Optional[threading.Timer] = None
+
+    def _remover_expirados(self) -> list:
+        limite = time.monotonic() - self.tempo_ocioso
+        expirados = [drv for drv, ultimo_uso in self._ociosos if ultimo_uso <= limite]
+        self._ociosos = [(drv, ultimo_uso) for drv, ultimo_uso in self._ociosos if ultimo_uso > limite]
+        return expirados
+
+    def _agendar_expiracao(self) -> None:
+        # Chamado com a trava: um único temporizador, disparado quando o ocioso mais antigo expira
+        if self._temporizador is not None or self._fechado or not self._ociosos or not math.isfinite(self.tempo_ocioso):
+            return
+        mais_antigo = min(ultimo_uso for _, ultimo_uso in self._ociosos)
+        espera = max(0.0, mais_antigo + self.tempo_ocioso - time.monotonic())
+        self._temporizador = threading.Timer(espera, self._expirar_ociosos)
+        self._temporizador.daemon = True
+        self._temporizador.start()
+
+    def _expirar_ociosos(self) -> None:
+        with self._condicao:
+            self._temporizador = None
+            expirados = self._remover_expirados()
+            self._agendar_expiracao()
+        for drv in expirados:
+            _encerrar(drv)
+
+    def adquirir(self, tempo_max: Optional[float] = None):
+        """
+        Obtém um driver saudável do pool, criando um novo se houver vaga.
+
+        Bloqueia enquanto todos os drivers estiverem em uso.
+
+        Args:
+            tempo_max (float, optional): Tempo máximo de espera em segundos (default: sem limite).
+
+        Returns:
+            WebDriver: Driver pronto para uso.
+
+        Raises:
+            RuntimeError: Se o pool já foi fechado.
+            TimeoutError: Se nenhum driver ficar disponível dentro de `tempo_max`.
+        """
+        while True:
+            expirados = []
+            try:
+                with self._condicao:
+                    expirados = self._remover_expirados()
+                    if not self._condicao.wait_for(self._ha_vaga, tempo_max):
+                        raise TimeoutError("Nenhum driver disponível no pool dentro do tempo limite.")
+                    if self._fechado:
+                        raise RuntimeError("Pool de drivers já foi fechado.")
+                    # LIFO: reutiliza o driver mais recente e deixa os antigos expirarem
+                    driver = self._ociosos.pop()[0] if self._ociosos else None
+                    self._em_uso += 1
+            finally:
+                for drv in expirados:
+                    _encerrar(drv)
+            if driver is None:
+                try:
+                    return self.fabrica()
+                except Exception:
+                    self._liberar_vaga()
+                    raise
+            if driver_saudavel(driver):
+                return driver
+            _encerrar(driver)
+            self._liberar_vaga()
+
+    def _ha_vaga(self) -> bool:
+        return self._fechado or bool(self._ociosos) or self._em_uso < self.tamanho
+
+    def _liberar_vaga(self) -> None:
+        with self._condicao:
+            self._em_uso -= 1
+            self._condicao.notify()
+
+    def devolver(self, driver, descartar: bool = False) -> None:
+        """
+        Devolve um driver ao pool, limpando cookies e armazenamento para o próximo uso.
+
+        Args:
+            driver: Driver obtido com `adquirir`.
+            descartar (bool): Se True, encerra o driver em vez de devolvê-lo (ex: após erro).
+        """
+        if not descartar:
+            try:
+                limpar_estado(driver)
+            except Exception:
+                descartar = True
+        with self._condicao:
+            self._em_uso -= 1
+            if not (descartar or self._fechado):
+                self._ociosos.append((driver, time.monotonic()))
+                driver = None
+                self._agendar_expiracao()
+            self._condicao.notify()
+        if driver is not None:
+            _encerrar(driver)
+
+    @contextmanager
+    def emprestar(self, tempo_max: Optional[float] = None):
+        """
+        Context manager que adquire um driver e o devolve ao final, descartando-o em caso de erro.
+
+        Args:
+            tempo_max (float, optional): Tempo máximo de espera por um driver.
+
+        Yields:
+            WebDriver: Driver pronto para uso.
+        """
+        driver = self.adquirir(tempo_max)
+        try:
+            yield driver
+        except Exception:
+            self.devolver(driver, descartar=True)
+            raise
+        self.devolver(driver)
+
+    def fechar(self) -> None:
+        """
+        Encerra todos os drivers ociosos; drivers em uso são encerrados ao serem devolvidos.
+        """
+        with self._condicao:
+            self._fechado = True
+            ociosos = [drv for drv, _ in self._ociosos]
+            self._ociosos = []
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            self._condicao.notify_all()
+        for drv in ociosos:
+            _encerrar(drv)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -6,10 +6,28 @@ Funções utilitárias para padronização dos seletores utilizados no mecanismo
 
 Inclui:
 - Normalização de entrada para listas de objetos padronizados, compatível com diferentes formatos de frameworks e usuários finais.
+- Localização do diretório de cache persistente da biblioteca.
 """
 
+import os
+from pathlib import Path
 from typing import Any, List, Dict, Union
 
+VARIAVEL_DIRETORIO_CACHE = 'DOM_HEAL_CACHE_DIR'
+
+def diretorio_cache() -> Path:
+    """
+    Retorna o diretório de cache persistente da DOM-Heal, criando-o se necessário.
+
+    Usa a variável de ambiente `DOM_HEAL_CACHE_DIR` quando definida; caso contrário, `~/.cache/dom-heal`.
+
+    Returns:
+        Path: Caminho do diretório de cache.
+    """
+    caminho = Path(os.environ.get(VARIAVEL_DIRETORIO_CACHE) or Path.home() / '.cache' / 'dom-heal')
+    caminho.mkdir(parents=True, exist_ok=True)
+    return caminho
+
 def normalizar_elementos(data: Union[list, dict]) -> List[Dict[str, str]]:
     """
     Normaliza os seletores fornecidos, aceitando tanto listas de objetos quanto dicionários
@@ -13,6 +13,7 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "rapidfuzz>=3.13.0",
+        "numpy>=1.21",
         "selenium>=4.29.0",
         "webdriver-manager>=4.0.2",
         "typer[all]>=0.9.0",
@@ -20,6 +21,9 @@ setup(
         "requests>=2.25.0",
     ],
     extras_require={
+        "css": [
+            "cssselect>=1.2.0",
+        ],
         "dev": [
             "pytest>=8.0.0",
             "python-dotenv>=1.0.0",
@@ -0,0 +1,99 @@
+"""
+Testes unitários para o módulo cache da biblioteca DOM-Heal.
+
+Cobrem o armazenamento de snapshots em disco, incluindo:
+- Gravação e leitura compactada por URL
+- Expiração por TTL, contada a partir da gravação (leituras não a prolongam)
+- Remoção dos snapshots menos usados ao exceder o tamanho máximo
+- Tolerância a arquivos corrompidos
+- Memória de curas: persistência entre instâncias, remoção LRU e consultas sem regravação
+"""
+
+import os
+import time
+
+import pytest
+from dom_heal.cache import CacheSnapshots, MemoCuras, hash_conteudo
+
+def test_hash_conteudo_texto_e_bytes():
+    assert hash_conteudo("abc") == hash_conteudo(b"abc")
+    assert hash_conteudo("abc") != hash_conteudo("abd")
+
+def test_gravar_e_obter(tmp_path):
+    cache = CacheSnapshots(tmp_path)
+    registro = {'hash_html': 'h', 'elementos': [{'tag': 'div', 'id': 'á'}]}
+    cache.gravar("http://a", registro)
+    lido = cache.obter("http://a")
+    assert lido['hash_html'] == 'h' and lido['elementos'] == registro['elementos']
+    assert cache.obter("http://b") is None
+    cache.remover("http://a")
+    assert cache.obter("http://a") is None
+
+def test_ttl_expira(tmp_path):
+    cache = CacheSnapshots(tmp_path, ttl=60)
+    cache.gravar("http://a", {'x': 1})
+    caminho = next(tmp_path.glob('*.json.gz'))
+    antigo = time.time() - 120
+    os.utime(caminho, (antigo, antigo))
+    assert cache.obter("http://a") is None
+    assert not caminho.exists()
+
+def test_leituras_nao_prolongam_ttl(tmp_path, monkeypatch):
+    import types
+    import dom_heal.cache as modulo
+    relogio = [1_000_000.0]
+    monkeypatch.setattr(modulo, 'time', types.SimpleNamespace(time=lambda: relogio[0]))
+    cache = CacheSnapshots(tmp_path, ttl=60)
+    cache.gravar("http://a", {'x': 1})
+    os.utime(cache._caminho("http://a"), (relogio[0], relogio[0]))
+    for _ in range(3):
+        relogio[0] += 20
+        assert cache.obter("http://a") == {'x': 1, 'url': "http://a", 'criado_em': 1_000_000.0}
+    relogio[0] += 20
+    assert cache.obter("http://a") is None
+    assert not cache._caminho("http://a").exists()
+
+def test_remove_menos_usados_ao_exceder_tamanho(tmp_path):
+    cache = CacheSnapshots(tmp_path, tamanho_max=10 ** 9)
+    for n, url in enumerate(["http://a", "http://b", "http://c"]):
+        cache.gravar(url, {'dados': os.urandom(2000).hex()})
+        caminho = cache._caminho(url)
+        os.utime(caminho, (1_000_000 + n, time.time() - 100 + n))
+    cache.obter("http://a")  # acesso recente: 'a' passa a ser o mais novo
+    cache.tamanho_max = sum(cache._caminho(url).stat().st_size for url in ("http://a", "http://c"))
+    cache.limpar()
+    assert cache.obter("http://a") is not None
+    assert cache.obter("http://b") is None
+    assert cache.obter("http://c") is not None
+
+def test_arquivo_corrompido(tmp_path):
+    cache = CacheSnapshots(tmp_path)
+    cache._caminho("http://a").write_bytes(b"nao e gzip")
+    assert cache.obter("http://a") is None
+
+def test_memo_curas_persiste_e_remove_menos_usados(tmp_path):
+    caminho = tmp_path / "curas.json.gz"
+    memo = MemoCuras(caminho, max_entradas=2)
+    memo.salvar()
+    assert not caminho.exists()
+    memo.gravar("a", {'score': 1.0})
+    memo.gravar("b", {'score': 0.9})
+    assert memo.obter("a") == {'score': 1.0}  # 'a' passa a ser o mais recente
+    memo.gravar("c", {'score': 0.8})
+    memo.salvar()
+    relido = MemoCuras(caminho, max_entradas=2)
+    assert len(relido) == 2
+    assert relido.obter("b") is None
+    assert relido.obter("a") == {'score': 1.0} and relido.obter("c") == {'score': 0.8}
+    caminho.write_bytes(b"nao e gzip")
+    assert len(MemoCuras(caminho)) == 0
+
+def test_memo_curas_consulta_nao_regrava_arquivo(tmp_path, monkeypatch):
+    caminho = tmp_path / "curas.json.gz"
+    memo = MemoCuras(caminho)
+    memo.gravar("a", {'score': 1.0})
+    memo.salvar()
+    relido = MemoCuras(caminho)
+    assert relido.obter("a") == {'score': 1.0}
+    monkeypatch.setattr("dom_heal.cache.gzip.open", lambda *a, **k: pytest.fail("memo regravado"))
+    relido.salvar()
@@ -53,3 +53,61 @@ def test_missing_options_rodar():
     result = runner.invoke(cli.app, ["rodar"])
     assert result.exit_code != 0
     assert "Missing option" in result.stdout
+
+def test_rodar_repassa_processos(monkeypatch):
+    recebido = {}
+    def fake_self_heal(json_path, url, **kwargs):
+        recebido.update(kwargs)
+        return {"log_detalhado": "log.json", "json_atualizado": json_path}
+    monkeypatch.setattr(cli, "self_heal", fake_self_heal)
+    result = runner.invoke(cli.app, ["rodar", "-j", "sel.json", "-u", "http://x", "--processos", "3"])
+    assert result.exit_code == 0 and "sucesso" in result.stdout
+    assert recebido["processos"] == 3 and recebido["cache"] is None
+
+def test_lote_exibe_resumo(monkeypatch, tmp_path):
+    manifesto = tmp_path / "paginas.json"
+    manifesto.write_text(json.dumps([{"json": "a.json", "url": "http://a"}, {"json": "b.json", "url": "http://b"}]))
+    recebido = {}
+    def fake_lote(paginas, **kwargs):
+        recebido.update(kwargs, paginas=paginas)
+        return {
+            "paginas": [
+                {"json": paginas[0]["json"], "url": "http://a", "sucesso": True, "tempo": 1.5},
+                {"json": paginas[1]["json"], "url": "http://b", "sucesso": False, "tempo": 0.2, "erro": "timeout"},
+            ],
+            "sucesso": 1, "falhas": 1, "tempo_total": 1.6,
+        }
+    monkeypatch.setattr(cli, "self_heal_lote", fake_lote)
+    result = runner.invoke(cli.app, ["lote", "-m", str(manifesto), "-n", "4", "-b", "lxml"])
+    assert result.exit_code == 1
+    assert recebido["paralelismo"] == 4 and recebido["backend"] == "lxml" and len(recebido["paginas"]) == 2
+    assert "http://a (1.50s)" in result.stdout and "timeout" in result.stdout
+    assert "2 páginas em 1.60s: 1 com sucesso, 1 com falha." in result.stdout
+
+def test_rodar_exporta_metricas(monkeypatch, tmp_path):
+    def fake_self_heal(json_path, url, metricas=None, **kwargs):
+        metricas.registrar_tempo("extracao", 0.5)
+        return {"log_detalhado": "log.json", "json_atualizado": json_path}
+    monkeypatch.setattr(cli, "self_heal", fake_self_heal)
+    destino = tmp_path / "dom_heal.prom"
+    result = runner.invoke(cli.app, ["rodar", "-j", "sel.json", "-u", "http://x", "--metricas", str(destino)])
+    assert result.exit_code == 0 and str(destino) in result.stdout
+    assert 'dom_heal_etapa_segundos_total{etapa="extracao"} 0.500000' in destino.read_text(encoding="utf-8")
+
+def test_lote_sucesso_e_manifesto_invalido(monkeypatch, tmp_path):
+    manifesto = tmp_path / "paginas.json"
+    manifesto.write_text(json.dumps([{"json": "a.json", "url": "http://a"}]))
+    def fake_lote(paginas, metricas=None, **kwargs):
+        metricas.registrar_tempo("extracao", 0.5)
+        return {
+            "paginas": [{"json": paginas[0]["json"], "url": "http://a", "sucesso": True, "tempo": 0.5}],
+            "sucesso": 1, "falhas": 0, "tempo_total": 0.5,
+        }
+    monkeypatch.setattr(cli, "self_heal_lote", fake_lote)
+    destino = tmp_path / "lote.json"
+    result = runner.invoke(cli.app, ["lote", "-m", str(manifesto), "--metricas", str(destino)])
+    assert result.exit_code == 0
+    assert json.loads(destino.read_text(encoding="utf-8"))["tempos"]["extracao"]["chamadas"] == 1
+    manifesto.write_text("{}")
+    result = runner.invoke(cli.app, ["lote", "-m", str(manifesto)])
+    assert result.exit_code == 1 and "Manifesto inválido" in result.stdout
@@ -13,7 +13,6 @@ Esses testes garantem a robustez das heurísticas e dos fluxos internos do compa
 """
 
 import pytest
-from rapidfuzz import fuzz
 from dom_heal.comparator import (
     formatar_selector,
     detectar_tipo_selector,
@@ -132,3 +131,299 @@ def test_aplicar_boost_each_case():
 
     boost, det = aplicar_boost('name', 'foo bar', 'bar foo', 0.5)
     assert det.get('palavras_iguais') == 0.1
+
+def test_gerar_diferencas_aceita_blocos_em_streaming():
+    depois = [
+        {'tag': 'div', 'id': '', 'class': 'layout'},
+        {'tag': 'input', 'id': 'campo-email', 'class': ''},
+        {'tag': 'button', 'id': 'btnEnviar', 'class': ''},
+    ]
+    antes = [{'nome': 'email', 'selector': '#campo_email'}, {'nome': 'enviar', 'selector': '#btn-enviar'}]
+    esperado = gerar_diferencas(antes, depois)
+    blocos = (depois[i:i + 1] for i in range(len(depois)))
+    assert gerar_diferencas(antes, blocos) == esperado
+    assert {a['novo_seletor'] for a in esperado['alterados']} == {'#campo-email', '#btnEnviar'}
+
+def test_campos_dos_seletores():
+    from dom_heal.comparator import campos_dos_seletores
+    seletores = [
+        {'nome': 'a', 'selector': '.btn'},
+        {'nome': 'b', 'selector': '#x'},
+        {'nome': 'c', 'selector': "//div[contains(@id,'x')]"},
+        {'nome': 'd', 'selector': None},
+    ]
+    assert campos_dos_seletores(seletores) == ['id', 'class']
+    assert campos_dos_seletores([]) == []
+
+def test_seletores_intactos_nao_passam_pelo_fuzzy(monkeypatch):
+    import dom_heal.comparator as cmp
+    depois = [
+        {'tag': 'input', 'id': 'email', 'name': 'email', 'class': ''},
+        {'tag': 'button', 'id': 'btnEnviar', 'class': 'btn primario'},
+    ]
+    antes = [
+        {'nome': 'email', 'selector': '#email'},
+        {'nome': 'campo', 'selector': '[name="email"]'},
+        {'nome': 'botao', 'selector': '.primario.btn'},
+    ]
+    monkeypatch.setattr(cmp, 'score_fuzzy', lambda *a: pytest.fail("seletor intacto não deve usar fuzzy"))
+    monkeypatch.setattr(cmp, 'score_class', lambda *a: pytest.fail("seletor intacto não deve usar fuzzy"))
+    assert cmp.gerar_diferencas(antes, depois) == {}
+    sel, elem, score, tipo, idx, boosts = cmp.fuzzy_matching_selector('#email', depois)
+    assert (sel, idx, tipo) == ('#email', 0, 'id') and score == pytest.approx(1.2)
+
+def test_seletor_intacto_ja_usado_cai_no_fuzzy():
+    depois = [{'tag': 'input', 'id': 'email', 'class': ''}, {'tag': 'input', 'id': 'email2', 'class': ''}]
+    sel, elem, score, tipo, idx, boosts = fuzzy_matching_selector('#email', depois, elementos_ja_usados={0})
+    assert (sel, idx) == ('#email2', 1)
+
+def test_seletor_intacto_reserva_elemento_contra_quebrado():
+    depois = [
+        {'tag': 'input', 'id': 'email', 'name': 'email', 'class': ''},
+        {'tag': 'button', 'id': 'btnEnviar', 'class': 'acao'},
+        {'tag': 'button', 'id': 'btnEnviar2', 'class': 'acao-v2'},
+    ]
+    # O quebrado vem antes no arquivo e o seu melhor candidato é o elemento do seletor intacto
+    antes = [
+        {'nome': 'quebrado', 'selector': '#btn-enviar'},
+        {'nome': 'intacto', 'selector': '#btnEnviar'},
+        {'nome': 'classe', 'selector': '.acao'},
+        {'nome': 'email', 'selector': '#email'},
+        {'nome': 'campo', 'selector': '[name="email"]'},
+    ]
+    diff = gerar_diferencas(antes, depois)
+    assert [(a['selector_antigo'], a['novo_seletor']) for a in diff['alterados']] == [('#btn-enviar', '#btnEnviar2')]
+
+def _dom_aleatorio(semente, total=300):
+    import random
+    rnd = random.Random(semente)
+    palavras = ['btn', 'campo', 'email', 'senha', 'enviar', 'login', 'menu', 'item', 'form', 'nome']
+    dom = []
+    for i in range(total):
+        valor = rnd.choice(['-', '_', '']).join(rnd.sample(palavras, rnd.randint(1, 3)))
+        dom.append({'tag': 'div', 'id': valor if rnd.random() < 0.6 else '',
+                    'name': valor.upper() if rnd.random() < 0.3 else '', 'class': '', 'xpath': f'/d[{i}]'})
+    return dom, palavras, rnd
+
+def test_gerar_diferencas_em_lote_igual_ao_serial(monkeypatch):
+    import dom_heal.comparator as cmp
+    dom, palavras, rnd = _dom_aleatorio(42)
+    antes = []
+    for n in range(80):
+        valor = ''.join(rnd.sample(palavras, 2)) + rnd.choice(['', 'x', '1'])
+        antes.append({'nome': f'e{n}', 'selector': f'#{valor}' if n % 2 else f'[name="{valor}"]'})
+    em_lote = cmp.gerar_diferencas(antes, dom)
+    monkeypatch.setattr(cmp, 'ranquear_em_lote', lambda *a, **k: {})
+    assert em_lote and em_lote == cmp.gerar_diferencas(antes, dom)
+
+def test_ranquear_em_lote_ordena_como_fuzzy():
+    from dom_heal.comparator import ranquear_em_lote
+    dom = [{'tag': 'a', 'id': 'btnEnviar'}, {'tag': 'b', 'id': 'btn-enviar2'}, {'tag': 'c', 'id': 'btnEnviar'}]
+    ranking = ranquear_em_lote('id', ['btn-enviar', 'zzz'], dom)
+    assert ranking['zzz'] == []
+    assert [c[2] for c in ranking['btn-enviar']] == [0, 2, 1]
+    sel, elem, score, tipo, idx, boosts = fuzzy_matching_selector('#btn-enviar', dom)
+    assert (sel, score, idx, boosts) == ('#btnEnviar',) + tuple(ranking['btn-enviar'][0][i] for i in (0, 2, 4))
+
+def test_pontuador_seletor_identico_as_funcoes_de_boost():
+    import random
+    from dom_heal.comparator import (
+        PontuadorSeletor, boost_prefixo, boost_sufixo, boost_um_char, boost_palavras_iguais, score_fuzzy
+    )
+    rnd = random.Random(11)
+    alfabeto = 'aAbB-_1 '
+    for _ in range(4000):
+        a = ''.join(rnd.choice(alfabeto) for _ in range(rnd.randint(0, 7)))
+        if rnd.random() < 0.5:
+            pos = rnd.randint(0, len(a))
+            b = a[:pos] + rnd.choice(['', rnd.choice(alfabeto), rnd.choice(alfabeto) * 2]) + a[pos + 1:]
+        else:
+            b = ''.join(rnd.choice(alfabeto) for _ in range(rnd.randint(0, 7)))
+        esperados = [boost_prefixo(a, b), boost_sufixo(a, b), boost_um_char(a, b), boost_palavras_iguais(a, b)]
+        score, boost_total, detalhes = PontuadorSeletor(a).pontuar(b)
+        assert boost_total == min(sum(esperados), 0.20)
+        assert score == score_fuzzy(a, b) + boost_total
+        assert detalhes == dict({k: v for k, v in zip(['prefixo', 'sufixo', 'um_char', 'palavras_iguais'], esperados)
+                                 if v > 0}, boost_total=boost_total), (a, b)
+
+def test_contexto_healing_valores_distintos_em_ordem():
+    from dom_heal.comparator import ContextoHealing
+    ctx = ContextoHealing("<body><div class='b a' id='x'></div><p class='a c' name='n'></p><span id=''></span></body>")
+    assert ctx.valores['class'] == ['b', 'a', 'c']
+    assert ctx.valores['id'] == ['x', '']
+    assert ctx.valores['name'] == ['n']
+    # Empate: vence o primeiro valor em ordem de documento
+    assert ctx.melhor_valor('class', 'z') == (None, 0)
+    assert ctx.melhor_valor('class', 'ab')[0] == 'b'
+    with pytest.raises(ValueError):
+        ContextoHealing("  ")
+
+def test_gerar_diferencas_interpreta_html_uma_vez(monkeypatch):
+    import dom_heal.comparator as cmp
+    html_puro = "<html><body><div id='campoEmail' class='form-campo'></div><input name='senhaUsuario'/></body></html>"
+    chamadas = []
+    original = cmp.html.fromstring
+    monkeypatch.setattr(cmp.html, 'fromstring', lambda *a, **k: chamadas.append(1) or original(*a, **k))
+    antes = [
+        {'nome': 'a', 'selector': "//div[contains(@id,'campo-email')]"},
+        {'nome': 'b', 'selector': "//div[contains(@class,'form-campos')]"},
+        {'nome': 'c', 'selector': "//input[contains(@name,'senha-usuario')]"},
+    ]
+    diff = cmp.gerar_diferencas(antes, [], html_puro=html_puro)
+    assert len(chamadas) == 1
+    assert [a['novo_seletor'] for a in diff['alterados']] == [
+        "//div[contains(@id, 'campoEmail')]",
+        "//div[contains(@class, 'form-campo')]",
+        "//input[contains(@name, 'senhaUsuario')]",
+    ]
+    assert heal_xpath(antes[0]['selector'], html_puro) == heal_xpath(antes[0]['selector'], cmp.ContextoHealing(html_puro))
+
+def test_gerar_diferencas_em_processos_igual_ao_serial():
+    dom, palavras, rnd = _dom_aleatorio(8, total=250)
+    for i, elem in enumerate(dom):
+        elem['class'] = ' '.join(rnd.sample(palavras, 2)) if i % 3 == 0 else ''
+    antes = []
+    for n in range(60):
+        valor = ''.join(rnd.sample(palavras, 2)) + rnd.choice(['', 'x'])
+        antes.append({'nome': f'e{n}', 'selector': ['#', '.', '[name="'][n % 3] + valor + ('"]' if n % 3 == 2 else '')})
+    serial = gerar_diferencas(antes, dom)
+    assert serial and serial == gerar_diferencas(antes, dom, processos=2)
+
+def test_ranquear_classes_igual_ao_laco_de_score_class():
+    import random
+    from dom_heal.comparator import ranquear_classes, LIMIARES_POR_CAMPO
+    rnd = random.Random(21)
+    tokens = ['flex', 'gap-2', 'p-4', 'text-sm', 'btn', 'btn-primary', 'Btn', 'items-center', 'w-full', 'mt-2']
+    dom = [{'tag': 'div', 'class': ' '.join(rnd.sample(tokens, rnd.randint(0, 5)))} for _ in range(300)]
+    selectors = ['.btn-primario', '.gap2.text-md', '.wfull', '.zzz', '.']
+    rankings = ranquear_classes(selectors, dom)
+    for selector in selectors:
+        antigas = {c for c in selector.strip('.').split('.') if c}
+        esperado = []
+        for idx, elem in enumerate(dom):
+            if elem['class']:
+                score = score_class(antigas, set(elem['class'].split()))
+                if score >= LIMIARES_POR_CAMPO['class']:
+                    esperado.append((score, idx))
+        esperado.sort(key=lambda c: (-c[0], c[1]))
+        assert [(c[0], c[2]) for c in rankings[selector]] == esperado
+    assert rankings['.btn-primario']
+
+def test_ranquear_com_limite_mantem_os_melhores():
+    from dom_heal.comparator import ranquear_em_lote, ranquear_classes
+    dom, palavras, rnd = _dom_aleatorio(8)
+    for i, elem in enumerate(dom):
+        elem['class'] = ' '.join(rnd.sample(palavras, rnd.randint(0, 3)))
+    valores = [''.join(rnd.sample(palavras, 2)) for _ in range(20)]
+    completo, limitado = ranquear_em_lote('id', valores, dom), ranquear_em_lote('id', valores, dom, limite=3)
+    assert any(len(ranking) > 3 for ranking in completo.values())
+    assert all(limitado[v] == completo[v][:3] for v in valores)
+    classes = ['.btn.menu', '.emial', '.form-item']
+    completo, limitado = ranquear_classes(classes, dom), ranquear_classes(classes, dom, limite=2)
+    assert all(limitado[c] == completo[c][:2] for c in classes)
+
+def test_fuzzy_selector_corte_crescente_igual_a_ordenacao_completa():
+    from dom_heal.comparator import PontuadorSeletor, LIMIARES_POR_CAMPO
+    dom, palavras, rnd = _dom_aleatorio(13)
+    for n in range(60):
+        tipo = 'id' if n % 2 else 'name'
+        valor = ''.join(rnd.sample(palavras, 2)) + rnd.choice(['', 'x'])
+        usados = set(rnd.sample(range(len(dom)), 20))
+        pontuador = PontuadorSeletor(valor)
+        esperado = []
+        for idx, elem in enumerate(dom):
+            if elem[tipo] and idx not in usados:
+                score, boost, detalhes = pontuador.pontuar(elem[tipo])
+                if score >= LIMIARES_POR_CAMPO[tipo]:
+                    esperado.append((score, boost, idx, detalhes))
+        esperado.sort(key=lambda c: (c[0], c[1]), reverse=True)
+        selector = f'#{valor}' if tipo == 'id' else f'[name="{valor}"]'
+        _, _, score, _, idx, detalhes = fuzzy_matching_selector(selector, dom, elementos_ja_usados=usados)
+        if esperado:
+            assert (score, idx, detalhes) == (esperado[0][0], esperado[0][2], esperado[0][3])
+        else:
+            assert idx is None
+
+def test_gerar_diferencas_valida_seletores_na_arvore_antes_do_matcher(monkeypatch):
+    import dom_heal.comparator as cmp
+    html_puro = (
+        "<html><body><input id='email' name='email'/><span class='btn'></span>"
+        "<button class='btn primario'></button><button id='btnEnviar'></button><a class='link'></a></body></html>"
+    )
+    depois = [
+        {'tag': 'input', 'id': 'email', 'name': 'email', 'class': ''},
+        {'tag': 'span', 'id': '', 'class': 'btn'},
+        {'tag': 'button', 'id': '', 'class': 'btn primario'},
+        {'tag': 'button', 'id': 'btnEnviar', 'class': ''},
+        {'tag': 'a', 'id': '', 'class': 'link'},
+    ]
+    antes = [
+        {'nome': 'email', 'selector': '#email'},
+        {'nome': 'campo', 'selector': '[name="email"]'},
+        {'nome': 'botao', 'selector': 'button.primario'},
+        {'nome': 'xpath', 'selector': "//a[contains(@class,'link')]"},
+        {'nome': 'ambiguo', 'selector': '.btn'},
+        {'nome': 'enviar', 'selector': '#btn-enviar'},
+        {'nome': 'sumiu', 'selector': '#zzzzzz'},
+    ]
+    assert cmp.seletores_saudaveis([el['selector'] for el in antes], html_puro) == {
+        '#email', '[name="email"]', 'button.primario', "//a[contains(@class,'link')]"
+    }
+    verificados = []
+    original = cmp.fuzzy_matching_selector
+    monkeypatch.setattr(cmp, 'fuzzy_matching_selector', lambda sel, *a, **k: verificados.append(sel) or original(sel, *a, **k))
+    diff = cmp.gerar_diferencas(antes, depois, html_puro=html_puro)
+    assert verificados == ['.btn', '#btn-enviar', '#zzzzzz']
+    assert [a['novo_seletor'] for a in diff['alterados']] == ['#btnEnviar']
+    assert diff['resumo'] == {'saudaveis': 4, 'curados': 1, 'mantidos': 1, 'nao_resolvidos': 1}
+    assert 'resumo' not in cmp.gerar_diferencas([antes[0], antes[5]], depois)
+
+def test_contexto_healing_conta_elementos_de_css_e_xpath():
+    from dom_heal.comparator import ContextoHealing
+    ctx = ContextoHealing("<body><p id='a' class='x'></p><p class='x y'></p></body>")
+    assert ctx.contar_elementos('#a') == 1
+    assert ctx.contar_elementos('.x') == 2
+    assert ctx.contar_elementos('//p[@id]') == 1
+    assert ctx.contar_elementos('//p/@class') == 0
+    assert ctx.contar_elementos('//p[') == 0
+
+def test_gerar_diferencas_com_memo_reaproveita_curas(tmp_path, monkeypatch):
+    import dom_heal.comparator as cmp
+    from dom_heal.cache import MemoCuras
+    dom, palavras, rnd = _dom_aleatorio(17)
+    for elem in dom:
+        elem['class'] = ' '.join(rnd.sample(palavras, rnd.randint(0, 2)))
+    antes = []
+    for n in range(40):
+        valor = ''.join(rnd.sample(palavras, 2)) + rnd.choice(['', 'x'])
+        antes.append({'nome': f'e{n}', 'selector': [f'#{valor}', f'[name="{valor}"]', f'.{valor}'][n % 3]})
+    esperado, esperado_parcial = cmp.gerar_diferencas(antes, dom), cmp.gerar_diferencas(antes[:30], dom)
+    caminho = tmp_path / 'curas.json.gz'
+    assert cmp.gerar_diferencas(antes, dom, memo=MemoCuras(caminho)) == esperado
+    # Segunda execução: nenhuma pontuação, tudo vem do memo (inclusive em outro "arquivo" de seletores)
+    monkeypatch.setattr(cmp, 'ranquear_em_lote', lambda *a, **k: pytest.fail("ranking deveria vir do memo"))
+    monkeypatch.setattr(cmp, 'ranquear_classes', lambda *a, **k: pytest.fail("ranking deveria vir do memo"))
+    assert esperado and cmp.gerar_diferencas(antes, dom, memo=MemoCuras(caminho)) == esperado
+    assert cmp.gerar_diferencas(antes[:30], dom, memo=MemoCuras(caminho)) == esperado_parcial
+    # Valores do campo mudaram: a impressão digital muda e o memo não é usado
+    dom[0] = dict(dom[0], id='novoValor')
+    with pytest.raises(pytest.fail.Exception):
+        cmp.gerar_diferencas(antes, dom, memo=MemoCuras(caminho))
+
+def test_gerar_diferencas_reserva_elementos_dos_seletores_saudaveis():
+    from dom_heal.extractor import montar_elementos_html
+    html_puro = (
+        "<html><body><button id='btnEnviar'>Enviar</button><button id='btnEnviar2'>Enviar</button>"
+        "<a class='menu-principal'>Menu</a><a class='menu-principal2'>Menu</a></body></html>"
+    )
+    antes = [
+        {'nome': 'quebrado', 'selector': '#btn-enviar'},
+        {'nome': 'botao', 'selector': '#btnEnviar'},
+        {'nome': 'classe_quebrada', 'selector': '.menu-principa'},
+        {'nome': 'menu', 'selector': "//a[@class='menu-principal']"},
+    ]
+    diff = gerar_diferencas(antes, montar_elementos_html(html_puro), html_puro=html_puro)
+    assert [(a['selector_antigo'], a['novo_seletor']) for a in diff['alterados']] == [
+        ('#btn-enviar', '#btnEnviar2'), ('.menu-principa', 'a.menu-principal2')
+    ]
+    assert diff['resumo'] == {'saudaveis': 2, 'curados': 2, 'mantidos': 0, 'nao_resolvidos': 0}
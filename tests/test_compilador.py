@@ -0,0 +1,59 @@
+"""
+Testes unitários para o módulo compilador da biblioteca DOM-Heal.
+
+Cobrem a compilação com cache de expressões XPath e seletores CSS, incluindo:
+- Tradução direta de seletores id, name e classe (com e sem tag)
+- Literais XPath com aspas
+- Reuso de objetos compilados e contadores de acertos/falhas
+- Erros para expressões e seletores inválidos
+"""
+
+import pytest
+from lxml import etree, html
+
+from dom_heal import compilador
+from dom_heal.compilador import (
+    avaliar_css, avaliar_xpath, compilar_xpath, css_para_xpath, estatisticas_cache, limpar_cache, literal_xpath
+)
+
+DOM = html.fromstring(
+    "<html><body><div id='a' class='btn  primario'><input name='email'/></div>"
+    "<span class='btn-x'></span><p id=\"o'k\"></p></body></html>"
+)
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    limpar_cache()
+    yield
+    limpar_cache()
+
+def test_css_simples_sem_cssselect(monkeypatch):
+    monkeypatch.setattr(compilador, 'HTMLTranslator', None)
+    assert [e.tag for e in avaliar_css('#a', DOM)] == ['div']
+    assert [e.tag for e in avaliar_css('[name="email"]', DOM)] == ['input']
+    assert [e.tag for e in avaliar_css('.btn.primario', DOM)] == ['div']
+    assert [e.tag for e in avaliar_css('div.btn', DOM)] == ['div']
+    assert avaliar_css('span.btn', DOM) == []
+    assert [e.tag for e in avaliar_css("#o'k", DOM)] == ['p']
+    with pytest.raises(ValueError):
+        css_para_xpath('div > span')
+
+def test_literal_xpath_com_aspas():
+    assert literal_xpath('a') == "'a'"
+    assert literal_xpath("a'b") == '"a\'b"'
+    expr = literal_xpath('a\'b"c')
+    assert etree.XPath(f"string({expr})")(DOM) == 'a\'b"c'
+
+def test_cache_reutiliza_compilacao_e_conta():
+    primeiro = compilar_xpath('//div')
+    assert compilar_xpath('//div') is primeiro
+    avaliar_xpath('//p', DOM)
+    avaliar_css('#a', DOM)
+    avaliar_css('#a', DOM)
+    stats = estatisticas_cache()
+    assert stats['xpath']['acertos'] == 2 and stats['xpath']['falhas'] == 3
+    assert stats['css'] == {'acertos': 1, 'falhas': 1, 'tamanho': 1, 'maximo': compilador.TAMANHO_CACHE_CSS}
+
+def test_xpath_invalido():
+    with pytest.raises(etree.XPathSyntaxError):
+        compilar_xpath('//div[')
@@ -3,8 +3,8 @@ Testes unitários para o módulo engine da biblioteca DOM-Heal.
 
 Cobrem o fluxo completo da função `self_heal` incluindo:
 - Geração de JSON com seletores antigos
-- Chamada e integração de funções internas: extrair_dom, gerar_diferencas, atualizar_seletores
-- Mock de requisição HTTP (`requests.get`) para evitar conexões reais
+- Chamada e integração de funções internas: extrair_snapshot, gerar_diferencas, atualizar_seletores
+- Mock da extração do snapshot da página para evitar navegador e conexões reais
 - Verificação dos caminhos retornados no dicionário de resultado
 """
 
@@ -14,14 +14,8 @@ from pathlib import Path
 
 import dom_heal.engine as eng
 
-class DummyResponse:
-    def __init__(self, text, as_json=None):
-        self.text = text
-        self._json = as_json
-    def json(self):
-        if self._json is not None:
-            return self._json
-        raise ValueError("No JSON")
+def snapshot(elementos=None, html="<html></html>"):
+    return lambda url, **kwargs: (elementos or [], html)
 
 def test_gravar_json_cria_arquivo(tmp_path):
     data = {"x": 1}
@@ -32,20 +26,30 @@ def test_gravar_json_cria_arquivo(tmp_path):
     assert json.loads(out.read_text()) == data
 
 
+def test_salvar_diff_alterados_ignora_resumo_sem_alteracoes(tmp_path):
+    caminho = tmp_path / "sel.json"
+    resumo = {"saudaveis": 2, "curados": 0, "mantidos": 0, "nao_resolvidos": 0}
+    eng.salvar_diff_alterados({"resumo": resumo}, caminho)
+    assert not (tmp_path / "ElementosAlterados.json").exists()
+    alterados = [{"nome": "btn", "selector_antigo": "#a", "novo_seletor": "#b", "score": 0.9}]
+    eng.salvar_diff_alterados({"alterados": alterados, "resumo": resumo}, caminho)
+    gravado = json.loads((tmp_path / "ElementosAlterados.json").read_text(encoding="utf-8"))
+    assert gravado == {"alterados": alterados, "resumo": resumo}
+
 def test_self_heal_download_fail(tmp_path, monkeypatch):
     caminho = tmp_path / "seletores.json"
     caminho.write_text(json.dumps([{"nome":"x","selector":"#x"}]), encoding="utf-8")
-    monkeypatch.setattr(eng, "extrair_dom", lambda url: [])
-    monkeypatch.setattr("requests.get", lambda url: (_ for _ in ()).throw(Exception("fail")))
+    def falha(url, **kwargs):
+        raise Exception("fail")
+    monkeypatch.setattr(eng, "extrair_snapshot", falha)
     with pytest.raises(RuntimeError) as ei:
         eng.self_heal(str(caminho), "http://x")
-    assert "Erro ao baixar HTML" in str(ei.value)
+    assert "Erro ao obter o DOM" in str(ei.value)
 
 def test_self_heal_json_fail(tmp_path, monkeypatch):
     caminho = tmp_path / "invalido.json"
     caminho.write_text("not valid json", encoding="utf-8")
-    monkeypatch.setattr(eng, "extrair_dom", lambda url: [])
-    monkeypatch.setattr("requests.get", lambda url: DummyResponse("<html></html>"))
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot())
     with pytest.raises(RuntimeError) as ei:
         eng.self_heal(str(caminho), "http://ok")
     assert "Erro ao ler JSON" in str(ei.value)
@@ -53,10 +57,9 @@ def test_self_heal_json_fail(tmp_path, monkeypatch):
 def test_self_heal_success(tmp_path, monkeypatch):
     caminho = tmp_path / "ok.json"
     caminho.write_text(json.dumps([{"nome":"btn","selector":"#a"}]), encoding="utf-8")
-    monkeypatch.setattr(eng, "extrair_dom", lambda url: [{"tag":"div"}])
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot([{"tag":"div"}]))
     monkeypatch.setattr(eng, "gerar_diferencas", lambda *a, **k: {"alterados":[{"nome":"btn"}]})
     monkeypatch.setattr(eng, "atualizar_seletores", lambda *a, **k: None)
-    monkeypatch.setattr("requests.get", lambda url: DummyResponse("<html></html>"))
     result = eng.self_heal(str(caminho), "http://ok")
     assert "finalizado" in result["msg"]
     assert result["json_atualizado"].endswith(".json")
@@ -64,11 +67,346 @@ def test_self_heal_success(tmp_path, monkeypatch):
 def test_self_heal_sem_alteracoes(tmp_path, monkeypatch):
     caminho = tmp_path / "nochange.json"
     caminho.write_text(json.dumps([{"nome":"btn","selector":"#a"}]), encoding="utf-8")
-    monkeypatch.setattr(eng, "extrair_dom", lambda url: [])
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot())
     monkeypatch.setattr(eng, "gerar_diferencas", lambda *a, **k: {})
     monkeypatch.setattr(eng, "atualizar_seletores", lambda *a, **k: None)
-    monkeypatch.setattr("requests.get", lambda url: DummyResponse("<html></html>"))
     result = eng.self_heal(str(caminho), "http://ok")
     assert "Self-healing finalizado" in result["msg"]
     assert result["json_atualizado"].endswith(".json")
 
+def test_self_heal_usa_html_do_mesmo_snapshot(tmp_path, monkeypatch):
+    caminho = tmp_path / "snap.json"
+    caminho.write_text(json.dumps({"btn": "#a"}), encoding="utf-8")
+    recebido = {}
+    def gerar(antes, depois, html_puro=None, **kwargs):
+        recebido.update(depois=depois, html=html_puro)
+        return {}
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot([{"tag": "div", "id": "a"}], "<html><body>renderizado</body></html>"))
+    monkeypatch.setattr(eng, "gerar_diferencas", gerar)
+    monkeypatch.setattr("requests.get", lambda *a, **k: pytest.fail("não deve baixar a página novamente"))
+    eng.self_heal(str(caminho), "http://ok")
+    assert recebido["html"] == "<html><body>renderizado</body></html>"
+    assert recebido["depois"] == [{"tag": "div", "id": "a"}]
+
+def test_self_heal_empresta_driver_do_pool(tmp_path, monkeypatch):
+    caminho = tmp_path / "pool.json"
+    caminho.write_text(json.dumps({"btn": "#a"}), encoding="utf-8")
+    drivers = []
+    def extrair(url, driver=None, **kwargs):
+        drivers.append(driver)
+        return [], "<html></html>"
+    class FakePool:
+        def __init__(self):
+            self.emprestimos = 0
+        def emprestar(self):
+            from contextlib import contextmanager
+            @contextmanager
+            def ctx():
+                self.emprestimos += 1
+                yield "driver-aquecido"
+            return ctx()
+    pool = FakePool()
+    monkeypatch.setattr(eng, "extrair_snapshot", extrair)
+    eng.self_heal(str(caminho), "http://ok", pool=pool)
+    assert pool.emprestimos == 1 and drivers == ["driver-aquecido"]
+
+def test_resolver_filtro():
+    seletores = [{"nome": "a", "selector": "#a"}, {"nome": "b", "selector": "[name='b']"}]
+    assert eng.resolver_filtro("seletores", seletores) == ["id", "name"]
+    assert eng.resolver_filtro("relevantes", seletores) == ["id", "name", "class", "data-*"]
+    assert eng.resolver_filtro("nenhum", seletores) is None
+    with pytest.raises(ValueError):
+        eng.resolver_filtro("outro", seletores)
+
+def test_self_heal_filtra_pelos_seletores(tmp_path, monkeypatch):
+    caminho = tmp_path / "filtro.json"
+    caminho.write_text(json.dumps({"btn": "#a", "menu": ".menu"}), encoding="utf-8")
+    recebido = {}
+    def extrair(url, **kwargs):
+        recebido.update(kwargs)
+        return [], "<html></html>"
+    monkeypatch.setattr(eng, "extrair_snapshot", extrair)
+    eng.self_heal(str(caminho), "http://ok")
+    assert recebido["filtro"] == ["id", "class"]
+
+def snapshot_com_reuso(html, elementos, extracoes):
+    def extrair(url, reutilizar=None, **kwargs):
+        if reutilizar is not None:
+            reaproveitado = reutilizar(html)
+            if reaproveitado is not None:
+                return reaproveitado, html
+        extracoes.append(url)
+        return list(elementos), html
+    return extrair
+
+def test_self_heal_cache_pula_execucao_sem_mudancas(tmp_path, monkeypatch):
+    from dom_heal.cache import CacheSnapshots
+    caminho = tmp_path / "sel.json"
+    caminho.write_text(json.dumps({"btn": "#btn-enviar"}), encoding="utf-8")
+    cache = CacheSnapshots(tmp_path / "cache")
+    extracoes, comparacoes = [], []
+    elementos = [{"tag": "button", "id": "btnEnviar", "class": ""}]
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso("<html>v1</html>", elementos, extracoes))
+    gerar_original = eng.gerar_diferencas
+    def gerar(*a, **k):
+        comparacoes.append(1)
+        return gerar_original(*a, **k)
+    monkeypatch.setattr(eng, "gerar_diferencas", gerar)
+
+    primeiro = eng.self_heal(str(caminho), "http://ok", cache=cache)
+    assert primeiro["cache"] is False
+    assert json.loads(caminho.read_text(encoding="utf-8"))["btn"] == "#btnEnviar"
+
+    segundo = eng.self_heal(str(caminho), "http://ok", cache=cache)
+    assert segundo["cache"] is True
+    assert extracoes == ["http://ok"] and comparacoes == [1]
+
+def test_self_heal_cache_reaproveita_elementos_se_seletores_mudaram(tmp_path, monkeypatch):
+    from dom_heal.cache import CacheSnapshots
+    caminho = tmp_path / "sel.json"
+    caminho.write_text(json.dumps({"btn": "#btnEnviar"}), encoding="utf-8")
+    cache = CacheSnapshots(tmp_path / "cache")
+    extracoes = []
+    elementos = [{"tag": "button", "id": "btnEnviar", "class": ""}, {"tag": "input", "id": "campoEmail", "class": ""}]
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso("<html>v1</html>", elementos, extracoes))
+    eng.self_heal(str(caminho), "http://ok", cache=cache)
+    caminho.write_text(json.dumps({"btn": "#btnEnviar", "email": "#campo-email"}), encoding="utf-8")
+    resultado = eng.self_heal(str(caminho), "http://ok", cache=cache)
+    assert resultado["cache"] is False
+    assert extracoes == ["http://ok"]
+    assert json.loads(caminho.read_text(encoding="utf-8"))["email"] == "#campoEmail"
+
+def test_self_heal_cache_html_diferente_extrai_novamente(tmp_path, monkeypatch):
+    from dom_heal.cache import CacheSnapshots
+    caminho = tmp_path / "sel.json"
+    caminho.write_text(json.dumps({"btn": "#btn"}), encoding="utf-8")
+    cache = CacheSnapshots(tmp_path / "cache")
+    extracoes = []
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso("<html>v1</html>", [], extracoes))
+    eng.self_heal(str(caminho), "http://ok", cache=cache)
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso("<html>v2</html>", [], extracoes))
+    assert eng.self_heal(str(caminho), "http://ok", cache=cache)["cache"] is False
+    assert extracoes == ["http://ok", "http://ok"]
+
+def test_self_heal_cache_guarda_elementos_completos_e_valores(tmp_path, monkeypatch):
+    from dom_heal.cache import CacheSnapshots
+    caminho = tmp_path / "sel.json"
+    caminho.write_text(json.dumps({"btn": "#btnEnviar"}), encoding="utf-8")
+    cache = CacheSnapshots(tmp_path / "cache")
+    elementos = [
+        {"tag": "div", "id": "", "class": "", "xpath": "/html[1]/body[1]/div[1]"},
+        {"tag": "button", "id": "btnEnviar", "class": "", "xpath": "/html[1]/body[1]/button[1]"},
+    ]
+    html = "<html><body><div></div><button id='btnEnviar'></button></body></html>"
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso(html, elementos, []))
+    eng.self_heal(str(caminho), "http://ok", cache=cache)
+    registro = cache.obter("http://ok")
+    assert registro["elementos"] == elementos
+    assert registro["valores"] == {"class": [], "id": ["btnEnviar"], "name": []}
+
+    recebidos = []
+    contexto_original = eng.ContextoHealing
+    def contexto(html_puro, valores=None):
+        recebidos.append(valores)
+        return contexto_original(html_puro, valores=valores)
+    monkeypatch.setattr(eng, "ContextoHealing", contexto)
+    caminho.write_text(json.dumps({"btn": "//button[contains(@id,'btnEnviaX')]"}), encoding="utf-8")
+    eng.self_heal(str(caminho), "http://ok", cache=cache)
+    assert recebidos == [registro["valores"]]
+    assert json.loads(caminho.read_text(encoding="utf-8"))["btn"] == "//button[contains(@id, 'btnEnviar')]"
+
+def test_filtro_compativel():
+    assert eng._filtro_compativel(None, ["id"])
+    assert eng._filtro_compativel(["id", "class"], ["id"])
+    assert not eng._filtro_compativel(["id"], ["id", "name"])
+    assert not eng._filtro_compativel(["id"], None)
+
+def test_self_heal_incremental_compara_apenas_seletores_afetados(tmp_path, monkeypatch):
+    from dom_heal.cache import CacheSnapshots
+    caminho = tmp_path / "sel.json"
+    caminho.write_text(json.dumps({"email": "#email", "btn": "#btnEnviar"}), encoding="utf-8")
+    cache = CacheSnapshots(tmp_path / "cache")
+    v1 = [
+        {"tag": "input", "id": "email", "class": "", "xpath": "/html/body/input[1]"},
+        {"tag": "button", "id": "btnEnviar", "class": "", "xpath": "/html/body/button[1]"},
+    ]
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso("<html>v1</html>", v1, []))
+    assert eng.self_heal(str(caminho), "http://ok", cache=cache)["incremental"] is None
+
+    v2 = [dict(v1[0]), dict(v1[1], id="btn-enviar")]
+    html_v2 = "<html><body><input id='email'/><button id='btn-enviar'></button></body></html>"
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso(html_v2, v2, []))
+    comparados = []
+    gerar_original = eng.gerar_diferencas
+    monkeypatch.setattr(eng, "gerar_diferencas", lambda antes, *a, **k: comparados.extend(antes) or gerar_original(antes, *a, **k))
+    resultado = eng.self_heal(str(caminho), "http://ok", cache=cache)
+    assert [s["nome"] for s in comparados] == ["btn"]
+    assert resultado["incremental"] == {"preservados": 1, "adicionados": 0, "removidos": 0, "alterados": 1}
+    assert resultado["resumo"] == {"saudaveis": 1, "curados": 1, "mantidos": 0, "nao_resolvidos": 0}
+    assert json.loads(caminho.read_text(encoding="utf-8")) == {"email": "#email", "btn": "#btn-enviar"}
+
+def test_self_heal_incremental_reserva_elementos_preservados(tmp_path, monkeypatch):
+    from dom_heal.cache import CacheSnapshots
+    seletores = {"btn": "#btnEnviar", "antigo": "#btnEnviarOld"}
+    v1 = [
+        {"tag": "button", "id": "btnEnviar", "class": "", "xpath": "/html/body/button[1]"},
+        {"tag": "button", "id": "btnEnviarOld", "class": "", "xpath": "/html/body/button[2]"},
+    ]
+    # O elemento do seletor quebrado muda; o seu melhor candidato passa a ser o do seletor preservado
+    v2 = [dict(v1[0]), dict(v1[1], id="rodape")]
+    html_v2 = "<html><body><button id='btnEnviar'></button><button id='rodape'></button></body></html>"
+
+    completo = tmp_path / "completo" / "sel.json"
+    completo.parent.mkdir()
+    completo.write_text(json.dumps(seletores), encoding="utf-8")
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot(v2, html_v2))
+    esperado = eng.self_heal(str(completo), "http://ok")
+
+    caminho = tmp_path / "sel.json"
+    caminho.write_text(json.dumps(seletores), encoding="utf-8")
+    cache = CacheSnapshots(tmp_path / "cache")
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso("<html>v1</html>", v1, []))
+    eng.self_heal(str(caminho), "http://ok", cache=cache)
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot_com_reuso(html_v2, v2, []))
+    resultado = eng.self_heal(str(caminho), "http://ok", cache=cache)
+
+    assert resultado["incremental"]["preservados"] == 1
+    assert resultado["resumo"] == esperado["resumo"] == {"saudaveis": 1, "curados": 0, "mantidos": 0, "nao_resolvidos": 1}
+    assert json.loads(caminho.read_text(encoding="utf-8")) == json.loads(completo.read_text(encoding="utf-8")) == seletores
+
+def test_carregar_manifesto(tmp_path):
+    manifesto = tmp_path / "paginas.json"
+    manifesto.write_text(json.dumps([{"json": "a/sel.json", "url": "http://a"}]), encoding="utf-8")
+    assert eng.carregar_manifesto(str(manifesto)) == [{"json": str(tmp_path / "a" / "sel.json"), "url": "http://a"}]
+    manifesto.write_text(json.dumps([{"json": "sel.json"}]), encoding="utf-8")
+    with pytest.raises(ValueError):
+        eng.carregar_manifesto(str(manifesto))
+    with pytest.raises(ValueError):
+        eng.carregar_manifesto(str(tmp_path / "nao_existe.json"))
+
+def test_self_heal_lote_paralelo_limitado_e_falhas_isoladas(monkeypatch):
+    import threading
+    import time as tempo
+    ativos, maximo, trava = [0], [0], threading.Lock()
+    recebidos = []
+    def fake_self_heal(caminho, url, **kwargs):
+        recebidos.append(kwargs)
+        with trava:
+            ativos[0] += 1
+            maximo[0] = max(maximo[0], ativos[0])
+        tempo.sleep(0.02)
+        with trava:
+            ativos[0] -= 1
+        if url == "http://falha":
+            raise RuntimeError("Erro ao obter o DOM da página")
+        return {"msg": "ok"}
+    monkeypatch.setattr(eng, "self_heal", fake_self_heal)
+    paginas = [{"json": f"s{n}.json", "url": "http://falha" if n == 2 else f"http://p{n}"} for n in range(6)]
+    resumo = eng.self_heal_lote(paginas, backend="lxml", paralelismo=2)
+    assert [p["url"] for p in resumo["paginas"]] == [p["url"] for p in paginas]
+    assert (resumo["sucesso"], resumo["falhas"]) == (5, 1)
+    assert "Erro ao obter o DOM" in resumo["paginas"][2]["erro"]
+    assert all(p["tempo"] > 0 for p in resumo["paginas"])
+    assert maximo[0] == 2
+    assert all(k["pool"] is None and k["backend"] == "lxml" for k in recebidos)
+
+def test_self_heal_lote_compartilha_pool_de_navegadores(monkeypatch):
+    pools = []
+    monkeypatch.setattr(eng, "self_heal", lambda caminho, url, **kwargs: pools.append(kwargs["pool"]) or {})
+    fechados = []
+    class PoolFalso:
+        def __init__(self, tamanho):
+            self.tamanho = tamanho
+        def fechar(self):
+            fechados.append(self)
+    monkeypatch.setattr(eng, "PoolDrivers", PoolFalso)
+    eng.self_heal_lote([{"json": "a.json", "url": "http://a"}, {"json": "b.json", "url": "http://b"}], paralelismo=3)
+    assert pools[0] is pools[1] and pools[0].tamanho == 3 and fechados == [pools[0]]
+
+def test_self_heal_lote_soma_metricas_das_paginas(tmp_path, monkeypatch):
+    from dom_heal.metricas import Metricas
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot([{"tag": "button", "id": "btnEnviar", "class": ""}]))
+    paginas = []
+    for nome in ("a", "b"):
+        caminho = tmp_path / f"{nome}.json"
+        caminho.write_text(json.dumps({"btn": "#btn-enviar"}), encoding="utf-8")
+        paginas.append({"json": str(caminho), "url": f"http://{nome}"})
+    metricas = Metricas()
+    resumo = eng.self_heal_lote(paginas, backend="lxml", metricas=metricas)
+    assert resumo["sucesso"] == 2
+    assert metricas.para_dict()["tempos"]["comparacao"]["chamadas"] == 2
+
+def test_self_heal_async_igual_ao_sincrono(tmp_path, monkeypatch):
+    import asyncio
+    elementos = [{"tag": "button", "id": "btnEnviar", "class": ""}]
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot(elementos))
+    sincrono, assincrono = tmp_path / "s.json", tmp_path / "a" / "a.json"
+    assincrono.parent.mkdir()
+    for caminho in (sincrono, assincrono):
+        caminho.write_text(json.dumps({"btn": "#btn-enviar"}), encoding="utf-8")
+    esperado = eng.self_heal(str(sincrono), "http://ok", backend="lxml")
+    resultado = asyncio.run(eng.self_heal_async(str(assincrono), "http://ok", backend="lxml"))
+    assert {k: v for k, v in resultado.items() if k not in ("log_detalhado", "json_atualizado")} == \
+        {k: v for k, v in esperado.items() if k not in ("log_detalhado", "json_atualizado")}
+    assert json.loads(assincrono.read_text(encoding="utf-8")) == {"btn": "#btnEnviar"}
+
+def test_self_heal_lote_async_nao_bloqueia_o_loop(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+    import time as tempo
+    ativos, maximo, trava = [0], [0], threading.Lock()
+    def extrair_lento(url, **kwargs):
+        with trava:
+            ativos[0] += 1
+            maximo[0] = max(maximo[0], ativos[0])
+        tempo.sleep(0.05)
+        with trava:
+            ativos[0] -= 1
+        if url == "http://falha":
+            raise Exception("timeout")
+        return [{"tag": "button", "id": "btnEnviar", "class": ""}], "<html></html>"
+    monkeypatch.setattr(eng, "extrair_snapshot", extrair_lento)
+    paginas = []
+    for n in range(5):
+        caminho = tmp_path / f"p{n}" / "sel.json"
+        caminho.parent.mkdir()
+        caminho.write_text(json.dumps({"btn": "#btn-enviar"}), encoding="utf-8")
+        paginas.append({"json": str(caminho), "url": "http://falha" if n == 3 else f"http://p{n}"})
+
+    async def principal():
+        batidas = []
+        async def relogio():
+            while True:
+                batidas.append(1)
+                await asyncio.sleep(0.005)
+        tarefa = asyncio.ensure_future(relogio())
+        resultados = await eng.self_heal_lote_async(paginas, concorrencia=2, backend="lxml")
+        tarefa.cancel()
+        return resultados, batidas
+
+    resultados, batidas = asyncio.run(principal())
+    assert len(batidas) > 5 and maximo[0] == 2
+    assert isinstance(resultados[3], RuntimeError) and "timeout" in str(resultados[3])
+    assert all(r["msg"].startswith("Self-healing") for n, r in enumerate(resultados) if n != 3)
+    assert json.loads((tmp_path / "p0" / "sel.json").read_text(encoding="utf-8")) == {"btn": "#btnEnviar"}
+
+def test_self_heal_com_metricas(tmp_path, monkeypatch, caplog):
+    import asyncio
+    import logging
+    from dom_heal.metricas import Metricas
+    html = "<html><body><button id='btnEnviar'></button></body></html>"
+    monkeypatch.setattr(eng, "extrair_snapshot", snapshot([{"tag": "button", "id": "btnEnviar", "class": ""}], html))
+    caminho = tmp_path / "sel.json"
+    caminho.write_text(json.dumps({"btn": "#btn-enviar", "x": "//button[contains(@id,'btnEnviar')]"}), encoding="utf-8")
+    with caplog.at_level(logging.INFO, logger="dom_heal.engine"):
+        resultado = eng.self_heal(str(caminho), "http://ok", metricas=Metricas())
+    tempos, contadores = resultado["metricas"]["tempos"], resultado["metricas"]["contadores"]
+    assert {"ler_seletores", "extracao", "comparacao", "gravacao", "interpretar_html", "validar_seletores",
+            "ranquear_candidatos", "fuzzy_matching_selector"} <= set(tempos)
+    assert contadores["seletores_verificados"] == 2 and contadores["candidatos_pontuados"] >= 1
+    assert "Métricas do self-healing de http://ok" in caplog.text
+    assert eng.self_heal(str(caminho), "http://ok")["metricas"] is None
+
+    caminho.write_text(json.dumps({"btn": "#btn-enviar"}), encoding="utf-8")
+    resultado = asyncio.run(eng.self_heal_async(str(caminho), "http://ok", metricas=Metricas()))
+    assert {"extracao", "comparacao", "validar_seletores"} <= set(resultado["metricas"]["tempos"])
@@ -43,6 +43,20 @@ class DummyDriver:
             return self.xpath_values.get(args[0], "/dummy")
         if script == extractor.JS_OBTER_DATA_ATTRS:
             return self.data_attrs.get(args[0], {})
+        if script == extractor.JS_PREPARAR_LOTE:
+            self.scripts_lote = getattr(self, 'scripts_lote', 0) + 1
+            filtro = args[0] if args else None
+            self._selecionados = [el for el in self._elements if extractor.atributos_relevantes(el._attrs, filtro)]
+            return len(self._selecionados)
+        if script == extractor.JS_EXTRAIR_LOTE:
+            self.scripts_lote += 1
+            inicio, fim = args
+            # Como no navegador: sem a lista preparada (ex: após navegar), o script devolve null
+            if getattr(self, '_selecionados', None) is None:
+                return None
+            return [extractor.montar_info_elemento(self, el) for el in self._selecionados[inicio:fim]]
+        if script == extractor.JS_LIMPAR_LOTE:
+            self._selecionados = None
         return None
 
     def find_elements(self, by, query):
@@ -121,6 +135,40 @@ def test_extrair_dom_with_driver():
     assert first['data_test'] == 'v1'
     assert dummy.quit_called is False
 
+def test_extrair_dom_modo_elemento_igual_ao_lote():
+    elems = [
+        DummyElement('input', {'id': 'e', 'name': 'n', 'type': 'text'}, text=' x '),
+        DummyElement('div', {'class': 'a b'}),
+        DummyElement('p', {'aria-label': 'lbl'}, text='p'),
+    ]
+    data_attrs = {elems[1]: {'data_role': 'r'}}
+    por_elemento = extractor.extrair_dom("http://x", driver=DummyDriver(elems, data_attrs=data_attrs), modo='elemento')
+    em_lote = extractor.extrair_dom("http://x", driver=DummyDriver(elems, data_attrs=data_attrs), modo='lote')
+    assert em_lote == por_elemento
+
+def test_extrair_elementos_em_lote_divide_em_blocos():
+    elems = [DummyElement('span', {'id': f'i{n}'}) for n in range(5)]
+    driver = DummyDriver(elems)
+    result = extractor.extrair_elementos_em_lote(driver, tamanho_lote=2)
+    assert [e['id'] for e in result] == ['i0', 'i1', 'i2', 'i3', 'i4']
+    # Uma preparação + três blocos (2 + 2 + 1)
+    assert driver.scripts_lote == 4
+
+def test_extrair_elementos_em_lote_pagina_navegou_entre_blocos():
+    elems = [DummyElement('span', {'id': f'i{n}'}) for n in range(5)]
+    driver = DummyDriver(elems)
+    blocos = extractor.iterar_elementos_em_lote(driver, tamanho_lote=2)
+    assert [e['id'] for e in next(blocos)] == ['i0', 'i1']
+    driver._selecionados = None  # a navegação descarta o estado da página
+    with pytest.raises(RuntimeError, match="mudou durante a extração"):
+        next(blocos)
+
+def test_extrair_dom_modo_invalido():
+    with pytest.raises(ValueError):
+        extractor.extrair_dom("http://x", driver=DummyDriver([]), modo='outro')
+    with pytest.raises(ValueError):
+        extractor.extrair_elementos_em_lote(DummyDriver([]), tamanho_lote=0)
+
 def test_extrair_dom_without_driver(monkeypatch):
     class FakeDriver(DummyDriver):
         def __init__(self):
@@ -132,3 +180,250 @@ def test_extrair_dom_without_driver(monkeypatch):
     result = extractor.extrair_dom("http://y")
     assert result == []
     assert fake.quit_called is True
+
+HTML_ESTATICO = """
+<html><head><title>t</title></head><body>
+  <div id='d1' class='a b' data-test-id='x'>Olá <span>um</span><!-- comentário --><span name='s2'>dois</span></div>
+  <input id='email' name='email' type='email' placeholder='Seu e-mail' aria-label='E-mail'>
+</body></html>
+"""
+
+def test_montar_elementos_html_mesmo_formato():
+    result = extractor.montar_elementos_html(HTML_ESTATICO)
+    assert [e['xpath'] for e in result] == [
+        '/html[1]/body[1]/div[1]',
+        '/html[1]/body[1]/div[1]/span[1]',
+        '/html[1]/body[1]/div[1]/span[2]',
+        '/html[1]/body[1]/input[1]',
+    ]
+    div, _, span2, entrada = result
+    assert div['id'] == 'd1' and div['class'] == 'a b' and div['data_test_id'] == 'x'
+    assert div['text'] == 'Olá umdois'
+    assert span2['name'] == 's2'
+    assert entrada['type'] == 'email'
+    assert entrada['placeholder'] == 'Seu e-mail'
+    assert entrada['aria_label'] == 'E-mail'
+    chaves = {'tag', 'id', 'class', 'text', 'name', 'type', 'aria_label', 'placeholder', 'xpath'}
+    assert all(chaves <= set(e) for e in result)
+
+def test_montar_elementos_html_paridade_com_selenium():
+    import re
+    fonte = (
+        "<body><div id='d'>a<script>x = 1</script><style>.a{}</style> b<button>Ok</button>"
+        "<input><input type='CHECKBOX'><input type='foo'><button type='reset'></button>"
+        "<select multiple></select><select></select><textarea></textarea></div></body>"
+    )
+    result = extractor.montar_elementos_html(fonte)
+    campos_selenium = set(re.findall(r"'(\w+)':", extractor.JS_EXTRAIR_LOTE))
+    assert all(set(e) == campos_selenium for e in result)
+    div, script, style = result[:3]
+    assert div['text'] == 'a bOk' and script['text'] == 'x = 1' and style['type'] == ''
+    assert [e['type'] for e in result[3:]] == [
+        'submit', 'text', 'checkbox', 'text', 'reset', 'select-multiple', 'select-one', 'textarea'
+    ]
+
+def test_montar_elementos_html_vazio():
+    assert extractor.montar_elementos_html('') == []
+
+def test_extrair_dom_backend_lxml(monkeypatch):
+    monkeypatch.setattr(extractor, 'baixar_html', lambda url: HTML_ESTATICO)
+    monkeypatch.setattr(extractor, 'criar_driver', lambda: pytest.fail("lxml não deve iniciar o navegador"))
+    result = extractor.extrair_dom("http://z", backend='lxml')
+    assert len(result) == 4
+
+def test_extrair_dom_backend_invalido():
+    with pytest.raises(ValueError):
+        extractor.extrair_dom("http://z", backend='outro')
+
+def test_extrair_snapshot_selenium_mesma_sessao():
+    elems = [DummyElement('div', {'id': 'a'})]
+    dummy = DummyDriver(elems)
+    dummy.page_source = "<html><body><div id='a'></div></body></html>"
+    elementos, fonte = extractor.extrair_snapshot("http://s", driver=dummy)
+    assert dummy.last_url == "http://s"
+    assert [e['id'] for e in elementos] == ['a']
+    assert fonte == dummy.page_source
+    assert dummy.quit_called is False
+
+def test_extrair_snapshot_lxml_baixa_uma_vez(monkeypatch):
+    chamadas = []
+    def baixar(url):
+        chamadas.append(url)
+        return HTML_ESTATICO
+    monkeypatch.setattr(extractor, 'baixar_html', baixar)
+    elementos, fonte = extractor.extrair_snapshot("http://z", backend='lxml')
+    assert chamadas == ["http://z"]
+    assert fonte == HTML_ESTATICO and len(elementos) == 4
+
+def test_extrair_snapshot_reutilizar_pula_extracao(monkeypatch):
+    dummy = DummyDriver([DummyElement('div', {'id': 'a'})])
+    dummy.page_source = "<html></html>"
+    recebidos = []
+    def reutilizar(fonte):
+        recebidos.append(fonte)
+        return ['cache']
+    monkeypatch.setattr(extractor, 'extrair_elementos', lambda *a, **k: pytest.fail("não deve extrair"))
+    resultado, fonte = extractor.extrair_snapshot("http://s", driver=dummy, reutilizar=reutilizar)
+    assert resultado == ['cache'] and recebidos == [fonte]
+
+@pytest.fixture
+def cache_driver(tmp_path, monkeypatch):
+    monkeypatch.setenv('DOM_HEAL_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv(extractor.VARIAVEL_CHROMEDRIVER, raising=False)
+    extractor.resolver_caminho_driver.cache_clear()
+    yield tmp_path
+    extractor.resolver_caminho_driver.cache_clear()
+
+def test_resolver_caminho_driver_grava_e_reusa_cache(cache_driver, monkeypatch):
+    executavel = cache_driver / 'chromedriver'
+    executavel.write_text('')
+    instalacoes = []
+    class FakeManager:
+        def install(self):
+            instalacoes.append(1)
+            return str(executavel)
+    monkeypatch.setattr(extractor, 'ChromeDriverManager', FakeManager)
+    assert extractor.resolver_caminho_driver() == str(executavel)
+    extractor.resolver_caminho_driver.cache_clear()
+    # Segunda resolução (ex: novo processo) usa o cache em disco, sem rede
+    assert extractor.resolver_caminho_driver() == str(executavel)
+    assert instalacoes == [1]
+
+def test_resolver_caminho_driver_offline(cache_driver, monkeypatch):
+    class SemRede:
+        def install(self):
+            raise ConnectionError("offline")
+    monkeypatch.setattr(extractor, 'ChromeDriverManager', SemRede)
+    monkeypatch.setattr(extractor.shutil, 'which', lambda nome: '/usr/bin/chromedriver')
+    assert extractor.resolver_caminho_driver() == '/usr/bin/chromedriver'
+    extractor.resolver_caminho_driver.cache_clear()
+    monkeypatch.setattr(extractor.shutil, 'which', lambda nome: None)
+    with pytest.raises(RuntimeError):
+        extractor.resolver_caminho_driver()
+
+def test_resolver_caminho_driver_variavel_ambiente(cache_driver, monkeypatch):
+    monkeypatch.setenv(extractor.VARIAVEL_CHROMEDRIVER, '/opt/chromedriver')
+    assert extractor.resolver_caminho_driver() == '/opt/chromedriver'
+
+class QuiescenciaDriver:
+    """Simula uma página cujo DOM fica ocioso após algumas verificações."""
+    def __init__(self, ociosos, suporta=True):
+        self.ociosos = list(ociosos)
+        self.suporta = suporta
+        self.verificacoes = 0
+
+    def get(self, url):
+        self.last_url = url
+
+    def execute_script(self, script, *args):
+        if script == "return document.readyState":
+            return 'complete'
+        if script == extractor.JS_INSTALAR_QUIESCENCIA:
+            return True if self.suporta else None
+        if script == extractor.JS_TEMPO_OCIOSO:
+            self.verificacoes += 1
+            return self.ociosos.pop(0) if self.ociosos else 10_000
+        return None
+
+def test_aguardar_quiescencia_retorna_quando_estavel():
+    driver = QuiescenciaDriver([0, 120, 600])
+    assert extractor.aguardar_quiescencia(driver, janela_estavel=0.5, tempo_max=5, intervalo=0.001)
+    assert driver.verificacoes == 3
+
+def test_aguardar_quiescencia_respeita_tempo_max(caplog):
+    driver = QuiescenciaDriver([0] * 10_000)
+    with caplog.at_level('WARNING', logger='dom_heal.extractor'):
+        assert extractor.aguardar_quiescencia(driver, janela_estavel=0.5, tempo_max=0.05, intervalo=0.001) is False
+    assert "não ficou estável" in caplog.text
+
+def test_quiescencia_ignora_animacoes_de_style_e_class():
+    # Apenas elementos inseridos/removidos e mudanças de id/name reiniciam a janela de estabilidade
+    assert "attributeFilter: ['id', 'name']" in extractor.JS_INSTALAR_QUIESCENCIA
+    assert "characterData" not in extractor.JS_INSTALAR_QUIESCENCIA
+
+def test_aguardar_quiescencia_sem_suporte():
+    driver = QuiescenciaDriver([], suporta=False)
+    assert extractor.aguardar_quiescencia(driver)
+    assert driver.verificacoes == 0
+
+def test_carregar_pagina_sem_espera_fixa(monkeypatch):
+    driver = QuiescenciaDriver([900])
+    monkeypatch.setattr(extractor.time, 'sleep', lambda s: pytest.fail("não deve haver espera fixa"))
+    extractor.carregar_pagina(driver, "http://rapida", tempo_max=5)
+    assert driver.last_url == "http://rapida"
+    assert driver.verificacoes == 1
+
+def test_em_segundo_plano_preserva_ordem_e_propaga_erro():
+    assert list(extractor.em_segundo_plano(iter([[1], [2], [3]]), tamanho_fila=1)) == [[1], [2], [3]]
+    def falha():
+        yield [1]
+        raise RuntimeError("driver caiu")
+    consumidos = []
+    with pytest.raises(RuntimeError):
+        for lote in extractor.em_segundo_plano(falha()):
+            consumidos.append(lote)
+    assert consumidos == [[1]]
+
+def test_em_segundo_plano_interrompido_fecha_produtor():
+    fechado = []
+    def gerador():
+        try:
+            for n in range(100):
+                yield [n]
+        finally:
+            fechado.append(True)
+    for lote in extractor.em_segundo_plano(gerador(), tamanho_fila=1):
+        break
+    assert fechado == [True]
+
+def test_iterar_dom_entrega_blocos():
+    elems = [DummyElement('li', {'id': f'i{n}'}) for n in range(5)]
+    dummy = DummyDriver(elems)
+    blocos = list(extractor.iterar_dom("http://x", driver=dummy, tamanho_lote=2))
+    assert [len(b) for b in blocos] == [2, 2, 1]
+    assert [e['id'] for b in blocos for e in b] == [f'i{n}' for n in range(5)]
+
+def test_iterar_dom_lxml(monkeypatch):
+    monkeypatch.setattr(extractor, 'baixar_html', lambda url: HTML_ESTATICO)
+    blocos = list(extractor.iterar_dom("http://z", tamanho_lote=3, backend='lxml'))
+    assert [len(b) for b in blocos] == [3, 1]
+
+def test_extrair_snapshot_com_destino():
+    from dom_heal.indice import IndiceDom
+    elems = [DummyElement('div', {'id': 'a'}), DummyElement('div', {})]
+    dummy = DummyDriver(elems)
+    dummy.page_source = "<html></html>"
+    indice, fonte = extractor.extrair_snapshot("http://s", driver=dummy, destino=IndiceDom(), tamanho_lote=1)
+    assert isinstance(indice, IndiceDom)
+    assert len(indice) == 2 and indice.candidatos['id'] == [(0, 'a')]
+
+def test_xpath_filtro():
+    assert extractor.xpath_filtro() == "//body//*"
+    assert extractor.xpath_filtro(['id', 'class']) == "//body//*[@id!='' or @class!='']"
+    assert extractor.xpath_filtro(['data-*']) == "//body//*[@*[starts-with(name(), 'data-')]]"
+    assert extractor.xpath_filtro([]) == "//body//*[false()]"
+
+def test_xpath_filtro_equivale_a_regra_em_python():
+    from lxml import html as lh
+    doc = lh.document_fromstring(HTML_ESTATICO)
+    for filtro in (['id'], ['name'], ['class', 'data-*'], list(extractor.FILTRO_RELEVANTES)):
+        por_xpath = doc.xpath(extractor.xpath_filtro(filtro))
+        por_regra = [el for el in doc.find('body').iterdescendants() if isinstance(el.tag, str)
+                     and extractor.atributos_relevantes(el.attrib, filtro)]
+        assert por_xpath == por_regra
+
+def test_extrair_dom_lote_com_filtro_no_navegador():
+    elems = [
+        DummyElement('div', {}),
+        DummyElement('input', {'id': 'email'}),
+        DummyElement('span', {'class': ''}),
+        DummyElement('li', {'data-test': 'x'}),
+    ]
+    dummy = DummyDriver(elems, data_attrs={elems[3]: {'data_test': 'x'}})
+    result = extractor.extrair_dom("http://x", driver=dummy, filtro=extractor.FILTRO_RELEVANTES)
+    assert [e['tag'] for e in result] == ['input', 'li']
+
+def test_montar_elementos_html_com_filtro():
+    result = extractor.montar_elementos_html(HTML_ESTATICO, filtro=['name'])
+    assert [e['name'] for e in result] == ['s2', 'email']
+    assert result[0]['xpath'] == '/html[1]/body[1]/div[1]/span[2]'
@@ -0,0 +1,55 @@
+"""
+Testes unitários para o módulo incremental da biblioteca DOM-Heal.
+
+Cobrem o modo incremental de healing, incluindo:
+- Diff estrutural entre snapshots (adicionados, removidos e alterados por XPath absoluto)
+- Preservação apenas dos seletores cujo elemento não mudou e que continuam únicos
+- Snapshots sem XPath (todos os seletores voltam para o comparator)
+"""
+
+from dom_heal.incremental import diff_snapshots, separar_seletores
+
+ANTERIORES = [
+    {'tag': 'input', 'id': 'email', 'class': 'campo', 'xpath': '/html/body/input[1]'},
+    {'tag': 'input', 'id': 'senha', 'class': 'campo', 'xpath': '/html/body/input[2]'},
+    {'tag': 'button', 'id': 'btn-enviar', 'class': 'btn primario', 'xpath': '/html/body/button[1]'},
+    {'tag': 'a', 'id': 'ajuda', 'class': 'link', 'xpath': '/html/body/a[1]'},
+    {'tag': 'span', 'id': 'rodape', 'class': 'texto', 'xpath': '/html/body/span[1]'},
+]
+
+def _atuais():
+    atuais = [dict(elem) for elem in ANTERIORES]
+    atuais[2]['id'] = 'btnEnviar'
+    del atuais[4]
+    atuais.append({'tag': 'a', 'id': 'ajuda2', 'class': 'link', 'xpath': '/html/body/a[2]'})
+    return atuais
+
+def test_diff_snapshots():
+    diff = diff_snapshots(ANTERIORES, _atuais())
+    assert [elem['id'] for elem in diff['adicionados']] == ['ajuda2']
+    assert [elem['id'] for elem in diff['removidos']] == ['rodape']
+    assert [(antigo['id'], novo['id']) for antigo, novo in diff['alterados']] == [('btn-enviar', 'btnEnviar')]
+    assert diff_snapshots(ANTERIORES, ANTERIORES) == {'adicionados': [], 'removidos': [], 'alterados': []}
+    assert diff_snapshots(ANTERIORES, [{'tag': 'div', 'id': 'x'}]) is None
+
+def test_separar_seletores_preserva_apenas_os_intocados():
+    seletores = [
+        {'nome': 'email', 'selector': '#email'},
+        {'nome': 'enviar', 'selector': '#btn-enviar'},
+        {'nome': 'botao', 'selector': '.primario.btn'},
+        {'nome': 'rodape', 'selector': '#rodape'},
+        {'nome': 'link', 'selector': '.link'},
+        {'nome': 'campo', 'selector': '.campo'},
+        {'nome': 'quebrado', 'selector': '#nao-existe'},
+        {'nome': 'xpath', 'selector': "//input[contains(@id,'senha')]"},
+    ]
+    a_curar, preservados, diff = separar_seletores(seletores, ANTERIORES, _atuais())
+    assert [s['nome'] for s in preservados] == ['email']
+    # Elemento alterado, removido, concorrente novo, ambíguo, já quebrado e XPath voltam para o comparator
+    assert [s['nome'] for s in a_curar] == ['enviar', 'botao', 'rodape', 'link', 'campo', 'quebrado', 'xpath']
+    assert len(diff['alterados']) == 1
+
+def test_separar_seletores_sem_xpath_compara_todos():
+    seletores = [{'nome': 'email', 'selector': '#email'}]
+    sem_xpath = [{'tag': 'input', 'id': 'email'}]
+    assert separar_seletores(seletores, sem_xpath, sem_xpath) == (seletores, [], None)
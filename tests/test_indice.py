@@ -0,0 +1,93 @@
+"""
+Testes unitários para o módulo indice da biblioteca DOM-Heal.
+
+Cobrem a indexação incremental dos elementos do novo DOM, incluindo:
+- Preservação das posições (idx) equivalentes à lista completa de elementos
+- Listas de candidatos por campo apenas com valores preenchidos
+- Descarte de elementos sem atributos utilizáveis e de itens inválidos
+- Construção a partir de lista, índice existente ou iterável de blocos
+"""
+
+from dom_heal.indice import IndiceDom, indexar
+
+ELEMENTOS = [
+    {'tag': 'div', 'id': '', 'class': '', 'name': ''},
+    {'tag': 'input', 'id': 'email', 'class': 'campo', 'name': 'email'},
+    'lixo',
+    {'tag': 'span', 'id': None, 'class': 'rotulo'},
+    {'tag': 'p'},
+]
+
+def test_extend_incremental_preserva_posicoes():
+    indice = IndiceDom()
+    indice.extend(ELEMENTOS[:2])
+    indice.extend(ELEMENTOS[2:])
+    assert len(indice) == 4
+    assert indice.candidatos['id'] == [(1, 'email')]
+    assert indice.candidatos['class'] == [(1, 'campo'), (2, 'rotulo')]
+    assert indice.candidatos['name'] == [(1, 'email')]
+    # Elementos sem id/name/class não ficam em memória
+    assert set(indice.elementos) == {1, 2}
+
+def test_indexar_aceita_lista_indice_e_blocos():
+    por_lista = indexar(ELEMENTOS)
+    assert indexar(por_lista) is por_lista
+    por_blocos = indexar(iter([ELEMENTOS[:3], ELEMENTOS[3:]]))
+    assert por_blocos.candidatos == por_lista.candidatos
+    assert list(por_blocos) == [ELEMENTOS[1], ELEMENTOS[3]]
+
+def test_elemento_dom_visao_de_dicionario():
+    from dom_heal.indice import ElementoDom
+    origem = {'tag': 'input', 'id': 'email', 'class': 'a b', 'text': '', 'name': 'email',
+              'type': 'email', 'aria_label': '', 'placeholder': 'x', 'xpath': '/html[1]/body[1]/input[1]',
+              'data_test_id': 't1'}
+    elem = ElementoDom.de_dict(origem)
+    assert elem == origem and dict(elem) == origem
+    assert elem['class'] == 'a b' and elem.get('data_test_id') == 't1'
+    assert elem.get('data_outro', '') == '' and 'data_outro' not in elem
+    assert len(elem) == len(origem)
+    assert not hasattr(elem, '__dict__')
+    assert ElementoDom.de_dict(elem) is elem
+    parcial = ElementoDom.de_dict({'tag': 'div', 'class': None})
+    assert dict(parcial) == {'tag': 'div', 'class': None}
+    assert parcial.get('id', '') == '' and parcial.dados is None
+
+def test_elemento_dom_interna_tag_e_classe():
+    from dom_heal.indice import ElementoDom
+    a = ElementoDom.de_dict({'tag': ''.join(['d', 'iv']), 'class': ' '.join(['flex', 'gap-2'])})
+    b = ElementoDom.de_dict({'tag': ''.join(['di', 'v']), 'class': ' '.join(['flex', 'gap-2'])})
+    assert a['tag'] is b['tag'] and a['class'] is b['class']
+
+def test_indice_compacto_e_gerar_diferencas_direto():
+    from dom_heal.indice import ElementoDom, compactar_elementos
+    from dom_heal.comparator import gerar_diferencas
+    indice = IndiceDom(ELEMENTOS)
+    assert all(isinstance(e, ElementoDom) for e in indice)
+    assert type(IndiceDom(ELEMENTOS, compacto=False).elementos[1]) is dict
+    depois = [{'tag': 'input', 'id': 'campo-email', 'class': ''}, {'tag': 'div', 'id': '', 'class': 'x'}]
+    antes = [{'nome': 'email', 'selector': '#campo_email'}]
+    assert gerar_diferencas(antes, compactar_elementos(depois)) == gerar_diferencas(antes, depois)
+
+def test_buscar_exato_por_valor_e_tokens_de_classe():
+    elementos = [
+        {'tag': 'button', 'id': 'enviar', 'class': 'btn btn primario'},
+        {'tag': 'a', 'id': 'voltar', 'class': 'btn'},
+        {'tag': 'button', 'id': 'enviar', 'class': 'primario btn'},
+    ]
+    indice = IndiceDom(elementos)
+    assert indice.exatos['class']['btn'] == [0, 1, 2]
+    assert indice.buscar_exato('id', ['enviar']) == 0
+    assert indice.buscar_exato('id', ['enviar'], ignorar={0}) == 2
+    assert indice.buscar_exato('id', ['Enviar']) is None
+    assert indice.buscar_exato('class', ['primario', 'btn'], ignorar={0}) == 2
+    assert indice.buscar_exato('class', ['btn', 'inexistente']) is None
+    assert indice.buscar_exato('class', []) is None
+
+def test_elemento_dom_serializavel_entre_processos():
+    import pickle
+    from dom_heal.indice import ElementoDom
+    elem = ElementoDom.de_dict({'tag': 'div', 'id': 'a', 'data_x': '1'})
+    copia = pickle.loads(pickle.dumps(elem))
+    assert copia == elem and 'name' not in copia and copia.get('name', '') == ''
+    indice = pickle.loads(pickle.dumps(IndiceDom(ELEMENTOS)))
+    assert indice.candidatos == IndiceDom(ELEMENTOS).candidatos
@@ -0,0 +1,54 @@
+"""
+Testes unitários para o módulo metricas da biblioteca DOM-Heal.
+
+Cobrem a coleta de métricas de execução, incluindo:
+- Tempo acumulado e quantidade de chamadas por etapa, inclusive com exceções
+- Coleta desligada fora de `coletar` e isolada entre threads
+- Exportação em JSON e no formato texto do Prometheus
+"""
+
+import json
+import threading
+import pytest
+from dom_heal.metricas import Metricas, coletar, contar, etapa, metricas_ativas
+
+def test_sem_coleta_ativa_nao_registra_nada():
+    assert metricas_ativas() is None
+    with etapa('qualquer'):
+        contar('itens', 3)
+    assert metricas_ativas() is None
+
+def test_coleta_tempos_chamadas_e_contadores():
+    with coletar() as metricas:
+        for _ in range(2):
+            with etapa('comparacao'):
+                contar('candidatos_pontuados', 10)
+        with pytest.raises(ValueError):
+            with etapa('extracao'):
+                raise ValueError("falha")
+    assert metricas_ativas() is None
+    dados = metricas.para_dict()
+    assert dados['tempos']['comparacao']['chamadas'] == 2 and dados['tempos']['comparacao']['segundos'] >= 0
+    assert dados['tempos']['extracao']['chamadas'] == 1
+    assert dados['contadores'] == {'candidatos_pontuados': 20}
+
+def test_coleta_isolada_por_thread():
+    with coletar() as metricas:
+        outra = threading.Thread(target=lambda: contar('na_thread'))
+        outra.start()
+        outra.join()
+        contar('na_principal')
+    assert metricas.contadores == {'na_principal': 1}
+
+def test_exportar_json_e_prometheus(tmp_path):
+    metricas = Metricas()
+    metricas.registrar_tempo('carregar_pagina', 1.5)
+    metricas.contar('elementos_extraidos', 42)
+    metricas.exportar(tmp_path / 'metricas.json')
+    assert json.loads((tmp_path / 'metricas.json').read_text(encoding='utf-8')) == metricas.para_dict()
+    metricas.exportar(tmp_path / 'dom_heal.prom')
+    texto = (tmp_path / 'dom_heal.prom').read_text(encoding='utf-8')
+    assert 'dom_heal_etapa_segundos_total{etapa="carregar_pagina"} 1.500000' in texto
+    assert 'dom_heal_etapa_chamadas_total{etapa="carregar_pagina"} 1' in texto
+    assert 'dom_heal_elementos_extraidos_total 42' in texto
+    assert list(tmp_path.glob('*.tmp')) == []
@@ -0,0 +1,132 @@
+"""
+Testes unitários para o módulo pool da biblioteca DOM-Heal.
+
+Cobrem o ciclo de vida do pool de drivers, incluindo:
+- Reaproveitamento de drivers já iniciados entre empréstimos
+- Limite de tamanho e espera por vaga (com tempo máximo)
+- Descarte de drivers ociosos expirados (inclusive sem novos empréstimos) ou que falham na verificação de saúde
+- Limpeza de cookies e armazenamento a cada devolução
+- Uso de drivers falsos (FakeDriver) para simular o navegador sem dependências reais
+"""
+
+import pytest
+from dom_heal import pool as pl
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.saudavel = True
+        self.cookies_limpos = 0
+        self.scripts = []
+        self.urls = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == pl.JS_VERIFICAR_SAUDE:
+            if not self.saudavel:
+                raise RuntimeError("sessão perdida")
+            return 1
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Network.clearBrowserCookies':
+            self.cookies_limpos += 1
+        return {}
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+def fabrica_contada():
+    criados = []
+    def fabrica():
+        drv = FakeDriver()
+        criados.append(drv)
+        return drv
+    return fabrica, criados
+
+def test_reaproveita_driver_aquecido():
+    fabrica, criados = fabrica_contada()
+    pool = pl.PoolDrivers(tamanho=2, fabrica=fabrica)
+    with pool.emprestar() as d1:
+        pass
+    with pool.emprestar() as d2:
+        pass
+    assert d1 is d2
+    assert len(criados) == 1
+
+def test_devolucao_limpa_estado():
+    fabrica, criados = fabrica_contada()
+    pool = pl.PoolDrivers(tamanho=1, fabrica=fabrica)
+    with pool.emprestar() as drv:
+        pass
+    assert drv.cookies_limpos == 1
+    assert pl.JS_LIMPAR_ARMAZENAMENTO in drv.scripts
+    assert drv.urls[-1] == 'about:blank'
+
+def test_limite_de_tamanho_e_timeout():
+    fabrica, criados = fabrica_contada()
+    pool = pl.PoolDrivers(tamanho=1, fabrica=fabrica)
+    drv = pool.adquirir()
+    with pytest.raises(TimeoutError):
+        pool.adquirir(tempo_max=0.01)
+    pool.devolver(drv)
+    assert pool.adquirir(tempo_max=0.01) is drv
+
+def test_driver_nao_saudavel_e_substituido():
+    fabrica, criados = fabrica_contada()
+    pool = pl.PoolDrivers(tamanho=1, fabrica=fabrica)
+    with pool.emprestar() as d1:
+        pass
+    d1.saudavel = False
+    with pool.emprestar() as d2:
+        pass
+    assert d2 is not d1
+    assert d1.quit_called
+
+def test_ocioso_expirado_e_encerrado():
+    fabrica, criados = fabrica_contada()
+    pool = pl.PoolDrivers(tamanho=1, tempo_ocioso=0, fabrica=fabrica)
+    with pool.emprestar() as d1:
+        pass
+    with pool.emprestar() as d2:
+        pass
+    assert d1.quit_called and d2 is not d1
+
+def test_ocioso_encerrado_sem_novos_emprestimos():
+    import time
+    fabrica, criados = fabrica_contada()
+    pool = pl.PoolDrivers(tamanho=2, tempo_ocioso=0.05, fabrica=fabrica)
+    with pool.emprestar():
+        pass
+    prazo = time.monotonic() + 2
+    while not criados[0].quit_called and time.monotonic() < prazo:
+        time.sleep(0.01)
+    assert criados[0].quit_called
+    assert pool._ociosos == [] and pool._temporizador is None
+    pool.fechar()
+
+def test_erro_durante_uso_descarta_driver():
+    fabrica, criados = fabrica_contada()
+    pool = pl.PoolDrivers(tamanho=1, fabrica=fabrica)
+    with pytest.raises(ValueError):
+        with pool.emprestar():
+            raise ValueError("falha na extração")
+    assert criados[0].quit_called
+    with pool.emprestar() as drv:
+        assert drv is not criados[0]
+
+def test_fechar_encerra_ociosos_e_bloqueia_novos():
+    fabrica, criados = fabrica_contada()
+    with pl.PoolDrivers(tamanho=2, fabrica=fabrica) as pool:
+        with pool.emprestar():
+            pass
+    assert criados[0].quit_called
+    with pytest.raises(RuntimeError):
+        pool.adquirir()
+
+def test_tamanho_invalido():
+    with pytest.raises(ValueError):
+        pl.PoolDrivers(tamanho=0)
@@ -46,3 +46,10 @@ def test_normalizar_invalidos_levanta_valueerror(invalid):
         normalizar_elementos(invalid)
     assert "Formato de dados de seletores inválido" in str(exc.value)
 
+
+def test_diretorio_cache_respeita_variavel(tmp_path, monkeypatch):
+    from dom_heal.utils import diretorio_cache
+    destino = tmp_path / "cache" / "dom-heal"
+    monkeypatch.setenv("DOM_HEAL_CACHE_DIR", str(destino))
+    assert diretorio_cache() == destino
+    assert destino.is_dir()